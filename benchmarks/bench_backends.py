@@ -0,0 +1,59 @@
+"""
+Compares PDF backends on the same PDF: parse time, and how closely each
+backend's text and char positions agree with pdfplumber's.
+
+Usage:
+    python -m benchmarks.bench_backends --pdf book.pdf
+    python -m benchmarks.bench_backends --repeat 60   # Synthetic book from the sample PDF
+"""
+import argparse
+import difflib
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_parser import SAMPLE_PDF, build_synthetic_book
+from src.parser import pdf_parser
+from src.parser.backends import BACKENDS
+from src.parser.pdf_parser import PDFParser
+
+def run(pdf_path: Path, backend: str):
+    start = time.perf_counter()
+    result = PDFParser(pdf_path, backend, backend=backend, use_parse_cache=False, use_ocr_cache=False).parse()
+    return result, time.perf_counter() - start
+
+def agreement(reference, result):
+    """(text similarity, share of pages with the same char count, mean |top| difference in points)."""
+    ref_text = "\n".join(p["text"] for p in reference["pages"])
+    text = "\n".join(p["text"] for p in result["pages"])
+    similarity = difflib.SequenceMatcher(None, ref_text, text, autojunk=False).ratio()
+    same_count = 0
+    offsets = []
+    for ref_page, page in zip(reference["layout"], result["layout"]):
+        if len(ref_page["chars"]) == len(page["chars"]):
+            same_count += 1
+            offsets.extend(abs(a["top"] - b["top"]) for a, b in zip(ref_page["chars"], page["chars"]))
+    pages = len(reference["layout"]) or 1
+    return similarity, same_count / pages, sum(offsets) / len(offsets) if offsets else 0.0
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=40, help="Copies of the sample PDF when --pdf is not given")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf or build_synthetic_book(SAMPLE_PDF, args.repeat, Path(tmp) / "book.pdf")
+        pdf_parser.PARSED_DIR = Path(tmp) / "parsed"
+        results = {name: run(pdf_path, name) for name in BACKENDS}
+
+    reference, reference_time = results["pdfplumber"]
+    pages = len(reference["pages"])
+    print(f"{pages} pages")
+    for name, (result, elapsed) in results.items():
+        similarity, same_count, top_offset = agreement(reference, result)
+        print(f"{name:<11} {elapsed:6.2f}s ({pages / elapsed:6.1f} pages/s, {reference_time / elapsed:4.1f}x)  "
+              f"text {similarity:.1%}, char counts {same_count:.0%}, mean top offset {top_offset:.2f}pt")
+
+if __name__ == "__main__":
+    main()
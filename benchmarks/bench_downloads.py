@@ -0,0 +1,77 @@
+"""
+Compares sequential `download_pdf` against the concurrent download engine
+using a local stub HTTP server with artificial latency.
+
+Usage:
+    python -m benchmarks.bench_downloads --files 20 --latency 0.2
+"""
+import argparse
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from src.scraper import fetch_pdfs
+from src.scraper.async_fetch import AsyncDownloader, fetch_all
+from src.scraper.manifest import DownloadManifest
+from src.scraper.session import connection_stats
+from src.scraper.ratelimit import HostRateLimiter, set_rate_limiter
+
+def make_handler(payload: bytes, latency: float):
+    class StubHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # Keep-alive, so connection reuse shows up in the pool stats
+
+        def do_GET(self):
+            time.sleep(latency)
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, *args):
+            pass
+    return StubHandler
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=20)
+    parser.add_argument("--size-kb", type=int, default=512)
+    parser.add_argument("--latency", type=float, default=0.2, help="Server delay per request (s)")
+    parser.add_argument("--rate", type=float, default=1000.0, help="Per-host requests/s allowed by the rate limiter")
+    parser.add_argument("--per-host", type=int, default=4)
+    args = parser.parse_args()
+
+    payload = b"%PDF-1.4\n" + b"x" * (args.size_kb * 1024)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(payload, args.latency))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    set_rate_limiter(HostRateLimiter(rate=args.rate, burst=args.per_host, max_rate=args.rate))
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    total_mb = args.files * len(payload) / 1e6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = DownloadManifest(Path(tmp) / "download_manifest.json")
+        start = time.perf_counter()
+        for i in range(args.files):
+            fetch_pdfs.download_pdf(f"{base}/seq{i:02d}.pdf", Path(tmp) / "seq" / f"{i:02d}.pdf", manifest=manifest)
+        sequential = time.perf_counter() - start
+
+        downloader = AsyncDownloader(max_per_host=args.per_host, manifest=manifest)
+        jobs = [(f"{base}/con{i:02d}.pdf", Path(tmp) / "con" / f"{i:02d}.pdf") for i in range(args.files)]
+        start = time.perf_counter()
+        first_result = None
+        for _ in fetch_all(jobs, downloader=downloader):
+            first_result = first_result or time.perf_counter() - start
+        concurrent = time.perf_counter() - start
+        downloader.close()
+
+    server.shutdown()
+    print(f"{args.files} files, {total_mb:.1f} MB, {args.latency:.2f}s server latency")
+    print(f"sequential: {sequential:.2f}s ({total_mb / sequential:.1f} MB/s)")
+    print(f"concurrent: {concurrent:.2f}s ({total_mb / concurrent:.1f} MB/s), first result after {first_result:.2f}s")
+    print(f"speedup:    {sequential / concurrent:.1f}x")
+    for host, counts in connection_stats().items():
+        print(f"pool {host}: {counts['requests']} requests over {counts['connections']} connections")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Compares font-size heading detection with the original pure-Python line
+grouping and statistics against the NumPy line builder, on a synthetic
+layout, both from char dicts and from a columnar LayoutStore. Checks that
+lines and thresholds agree.
+
+Usage:
+    python -m benchmarks.bench_headings --chars 1000000
+"""
+import argparse
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from src.extractor.headings import HeadingExtractor
+from src.extractor.lines import build_lines, columns_from_chars, font_stats
+from src.parser.layout_store import LayoutStore, LayoutWriter
+
+CHARS_PER_LINE = 60
+LINES_PER_PAGE = 40
+
+def build_layout(total_chars: int, seed: int = 0):
+    """Pages of body lines (10pt) with an occasional 18pt heading, tops jittered by up to 1pt."""
+    rng = random.Random(seed)
+    layout = []
+    page_num = 0
+    while total_chars > 0:
+        page_num += 1
+        chars = []
+        for line in range(LINES_PER_PAGE):
+            size = 18.0 if line == 0 and page_num % 10 == 1 else 10.0
+            top = 40.0 + line * 18
+            for i in range(min(CHARS_PER_LINE, total_chars - len(chars))):
+                chars.append({"text": rng.choice("abcdefgh "), "size": size, "x0": 50.0 + i * 6,
+                              "top": top + rng.random(), "doctop": top, "x1": 56.0 + i * 6, "bottom": top + size})
+        rng.shuffle(chars)
+        layout.append({"page_num": page_num, "chars": chars})
+        total_chars -= len(chars)
+    return layout
+
+def legacy_lines(chars):
+    """The original HeadingExtractor._group_chars_into_lines (sorts `chars` in place)."""
+    chars.sort(key=lambda c: (c['top'], c['x0']))
+    lines, current, current_top = [], [], -1
+    for char in chars:
+        if current_top == -1 or abs(char['top'] - current_top) <= 3:
+            if current_top == -1:
+                current_top = char['top']
+            current.append(char)
+        else:
+            lines.append(current)
+            current, current_top = [char], char['top']
+    if current:
+        lines.append(current)
+    return [("".join(c['text'] for c in line), sum(c['size'] for c in line) / len(line), line[0]['top'])
+            for line in lines]
+
+def legacy_threshold(layout):
+    sizes = [size for page in layout for _, size, _ in legacy_lines(page["chars"])]
+    return statistics.mean(sizes) + statistics.stdev(sizes), sizes
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    layout = build_layout(args.chars)
+    print(f"{sum(len(p['chars']) for p in layout)} chars on {len(layout)} pages")
+
+    numpy_headings, numpy_time = timed(lambda: HeadingExtractor([], layout).detect_by_fontsize())
+    new_lines = [build_lines(columns_from_chars(p["chars"])) for p in layout]
+    mean, std = font_stats(np.concatenate([lines["size"] for lines in new_lines]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "layout.bin"
+        with LayoutWriter(path) as writer:
+            for page in layout:
+                writer.write(page["page_num"], page["chars"])
+        with LayoutStore(path) as store:
+            store_headings, store_time = timed(lambda: HeadingExtractor([], store).detect_by_fontsize())
+
+    # Last: the original implementation reorders the chars it is given
+    (threshold, legacy_sizes), legacy_time = timed(lambda: legacy_threshold(layout))
+    same_lines = [line[0] for page in layout for line in legacy_lines(page["chars"])] == \
+        [text for lines in new_lines for text in lines["text"]]
+
+    print(f"legacy:        {legacy_time:.2f}s")
+    print(f"numpy (dicts): {numpy_time:.2f}s  ({legacy_time / numpy_time:.1f}x)")
+    print(f"numpy (store): {store_time:.2f}s  ({legacy_time / store_time:.1f}x)")
+    print(f"lines identical: {same_lines}, {len(legacy_sizes)} lines; "
+          f"threshold legacy {threshold:.6f} vs numpy {mean + std:.6f}")
+    print(f"headings: {len(numpy_headings)} (store: {len(store_headings)})")
+
+if __name__ == "__main__":
+    main()
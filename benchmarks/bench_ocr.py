@@ -0,0 +1,64 @@
+"""
+Compares fixed-DPI and adaptive-DPI OCR on the same scanned PDF and reports
+time, pages per DPI and how much of the text agrees. The OCR cache is
+disabled so both runs do the full work.
+
+Usage:
+    python -m benchmarks.bench_ocr --pdf scanned_book.pdf
+    python -m benchmarks.bench_ocr --repeat 5   # Rasterised copy of the sample PDF
+"""
+import argparse
+import difflib
+import tempfile
+import time
+from pathlib import Path
+
+import pypdfium2 as pdfium
+
+from src.parser import pdf_parser
+from src.parser.ocr import is_tesseract_available
+from src.parser.pdf_parser import PDFParser, ocr_time_saved
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+def build_scanned_book(source: Path, repeat: int, target: Path, dpi: int = 200) -> Path:
+    """Renders `source` to images and saves `repeat` copies as an image-only PDF."""
+    src = pdfium.PdfDocument(str(source))
+    images = [src[i].render(scale=dpi / 72).to_pil().convert("RGB") for i in range(len(src))] * repeat
+    images[0].save(target, save_all=True, append_images=images[1:], resolution=dpi)
+    return target
+
+def run(pdf_path: Path, book_id: str, adaptive: bool):
+    start = time.perf_counter()
+    parser = PDFParser(pdf_path, book_id, use_ocr_cache=False, adaptive_ocr=adaptive)
+    result = parser.parse()
+    return result, parser.stats.get("ocr", {}), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=3, help="Copies of the sample PDF when --pdf is not given")
+    args = parser.parse_args()
+
+    if not is_tesseract_available():
+        print("Tesseract is not installed; nothing to benchmark.")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf or build_scanned_book(SAMPLE_PDF, args.repeat, Path(tmp) / "scanned.pdf")
+        pdf_parser.PARSED_DIR = Path(tmp) / "parsed"
+        fixed, fixed_stats, fixed_time = run(pdf_path, "fixed", adaptive=False)
+        adaptive, adaptive_stats, adaptive_time = run(pdf_path, "adaptive", adaptive=True)
+
+    fixed_text = "\n".join(p["text"] for p in fixed["pages"])
+    adaptive_text = "\n".join(p["text"] for p in adaptive["pages"])
+    agreement = difflib.SequenceMatcher(None, fixed_text, adaptive_text, autojunk=False).ratio()
+    print(f"{fixed_stats.get('pages', 0)} scanned pages")
+    print(f"fixed:    {fixed_time:.2f}s  pages per DPI {fixed_stats.get('by_dpi')}")
+    print(f"adaptive: {adaptive_time:.2f}s  pages per DPI {adaptive_stats.get('by_dpi')}, "
+          f"{adaptive_stats.get('escalated', 0)} re-rendered")
+    print(f"estimated saving: {ocr_time_saved(adaptive_stats):.2f}s, measured: {fixed_time - adaptive_time:.2f}s")
+    print(f"text agreement: {agreement:.1%}")
+
+if __name__ == "__main__":
+    main()
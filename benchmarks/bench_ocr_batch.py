@@ -0,0 +1,54 @@
+"""
+Measures OCR pages per second with one Tesseract process per page (the
+default) against batched runs that send several pages to one process, on
+the same scanned PDF. The OCR cache is disabled so every run does the full
+work; text agreement with the per-page run is reported for each batch size.
+
+Usage:
+    python -m benchmarks.bench_ocr_batch --pdf scanned_book.pdf --batch-sizes 4 16
+    python -m benchmarks.bench_ocr_batch --repeat 5   # Rasterised copy of the sample PDF
+"""
+import argparse
+import difflib
+import tempfile
+import time
+from pathlib import Path
+
+from src.parser import pdf_parser
+from src.parser.ocr import is_tesseract_available
+from src.parser.pdf_parser import PDFParser
+from benchmarks.bench_ocr import SAMPLE_PDF, build_scanned_book
+
+def run(pdf_path: Path, book_id: str, batch_size: int):
+    start = time.perf_counter()
+    parser = PDFParser(pdf_path, book_id, use_ocr_cache=False, use_parse_cache=False, ocr_batch_size=batch_size)
+    result = parser.parse()
+    return result, parser.stats.get("ocr", {}).get("pages", 0), time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=3, help="Copies of the sample PDF when --pdf is not given")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[4, 16])
+    args = parser.parse_args()
+
+    if not is_tesseract_available():
+        print("Tesseract is not installed; nothing to benchmark.")
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf or build_scanned_book(SAMPLE_PDF, args.repeat, Path(tmp) / "scanned.pdf")
+        pdf_parser.PARSED_DIR = Path(tmp) / "parsed"
+        baseline, pages, baseline_time = run(pdf_path, "per_page", batch_size=0)
+        baseline_text = "\n".join(p["text"] for p in baseline["pages"])
+        print(f"{pages} scanned pages")
+        print(f"per page:    {baseline_time:.2f}s  {pages / baseline_time:.2f} pages/s")
+        for batch_size in args.batch_sizes:
+            result, _, elapsed = run(pdf_path, f"batch_{batch_size}", batch_size=batch_size)
+            text = "\n".join(p["text"] for p in result["pages"])
+            agreement = difflib.SequenceMatcher(None, baseline_text, text, autojunk=False).ratio()
+            print(f"batch of {batch_size:<3} {elapsed:.2f}s  {pages / elapsed:.2f} pages/s  "
+                  f"({baseline_time / elapsed:.2f}x, text agreement {agreement:.1%})")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compares serial and page-parallel PDFParser runs on the same PDF and checks
+that both produce identical pages and layout.
+
+Usage:
+    python -m benchmarks.bench_parser --pdf book.pdf --workers 4
+    python -m benchmarks.bench_parser --repeat 60   # Synthetic book from the sample PDF
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import pypdfium2 as pdfium
+
+from src.parser import pdf_parser
+from src.parser.pdf_parser import PDFParser, default_workers
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+def build_synthetic_book(source: Path, repeat: int, target: Path) -> Path:
+    """Concatenates `repeat` copies of `source` into one PDF."""
+    book = pdfium.PdfDocument.new()
+    src = pdfium.PdfDocument(str(source))
+    for _ in range(repeat):
+        book.import_pages(src)
+    book.save(str(target))
+    return target
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pdf", type=Path, default=None)
+    parser.add_argument("--repeat", type=int, default=40, help="Copies of the sample PDF when --pdf is not given")
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument("--chunk-size", type=int, default=pdf_parser.PARSE_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf_path = args.pdf or build_synthetic_book(SAMPLE_PDF, args.repeat, Path(tmp) / "book.pdf")
+        pdf_parser.PARSED_DIR = Path(tmp) / "parsed"
+
+        start = time.perf_counter()
+        serial = PDFParser(pdf_path, "serial").parse()
+        serial_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        parallel = PDFParser(pdf_path, "parallel", workers=args.workers, chunk_size=args.chunk_size).parse()
+        parallel_time = time.perf_counter() - start
+
+    pages = len(serial["pages"])
+    print(f"{pages} pages, {args.workers} workers, chunk size {args.chunk_size}")
+    print(f"serial:   {serial_time:.2f}s ({pages / serial_time:.1f} pages/s)")
+    print(f"parallel: {parallel_time:.2f}s ({pages / parallel_time:.1f} pages/s)")
+    print(f"speedup:  {serial_time / parallel_time:.1f}x")
+    print(f"identical output: {serial == parallel}")
+
+if __name__ == "__main__":
+    main()
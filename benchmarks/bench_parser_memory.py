@@ -0,0 +1,57 @@
+"""
+Measures peak RSS of PDFParser.parse() and the streaming iter_pages() on
+synthetic books of growing length. Each run happens in a fresh process so
+its peak is measured on its own.
+
+Usage:
+    python -m benchmarks.bench_parser_memory --repeats 10 40 160
+"""
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks.bench_parser import SAMPLE_PDF, build_synthetic_book
+
+CHILD = """
+import resource, sys
+from pathlib import Path
+from src.parser import pdf_parser
+pdf_parser.PARSED_DIR = Path(sys.argv[2])
+parser = pdf_parser.PDFParser(Path(sys.argv[1]), "book", use_ocr_cache=False)
+if sys.argv[3] == "stream":
+    for _ in parser.iter_pages():
+        pass
+else:
+    parser.parse()
+print(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def peak_rss_mb(pdf_path: Path, out_dir: Path, mode: str) -> float:
+    result = subprocess.run([sys.executable, "-c", CHILD, str(pdf_path), str(out_dir), mode],
+                            capture_output=True, text=True, check=True)
+    return int(result.stdout.split()[-1]) / 1024  # ru_maxrss is in KiB on Linux
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeats", type=int, nargs="+", default=[10, 40, 160],
+                        help="Copies of the sample PDF per synthetic book")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for repeat in args.repeats:
+            pdf_path = build_synthetic_book(SAMPLE_PDF, repeat, Path(tmp) / f"book{repeat}.pdf")
+            collected = peak_rss_mb(pdf_path, Path(tmp) / "parsed", "collect")
+            streamed = peak_rss_mb(pdf_path, Path(tmp) / "parsed", "stream")
+            pages = len(json.loads((Path(tmp) / "parsed" / "book" / "pages.json").read_text()))
+            rows.append((pages, collected, streamed))
+
+    print(f"{'pages':>6} {'parse() MB':>11} {'iter_pages() MB':>16}")
+    for pages, collected, streamed in rows:
+        print(f"{pages:>6} {collected:>11.1f} {streamed:>16.1f}")
+
+if __name__ == "__main__":
+    main()
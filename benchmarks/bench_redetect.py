@@ -0,0 +1,77 @@
+"""
+Compares re-running font-size heading detection on a parsed segment from
+its char-level layout (layout.json, then the columnar layout.bin) against
+the saved line index (lines.npz), on a synthetic layout. Checks that the
+headings agree.
+
+Usage:
+    python -m benchmarks.bench_redetect --chars 1000000
+"""
+import argparse
+import json
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_headings import build_layout
+from src.extractor.document import DocumentModel, LINES_FILENAME
+from src.extractor.headings import HeadingExtractor
+from src.parser.layout_store import LayoutStore, LayoutWriter, LAYOUT_FILENAME
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+def from_layout_json(parsed_dir: Path):
+    with open(parsed_dir / "pages.json", "r", encoding="utf-8") as f:
+        pages = json.load(f)
+    with open(parsed_dir / "layout.json", "r", encoding="utf-8") as f:
+        layout = json.load(f)
+    return HeadingExtractor(pages, layout).detect_by_fontsize()
+
+def from_layout_store(parsed_dir: Path):
+    with open(parsed_dir / "pages.json", "r", encoding="utf-8") as f:
+        pages = json.load(f)
+    with LayoutStore(parsed_dir / LAYOUT_FILENAME) as store:
+        return HeadingExtractor(pages, store).detect_by_fontsize()
+
+def from_line_index(parsed_dir: Path):
+    document = DocumentModel.from_parsed(parsed_dir)
+    return HeadingExtractor(document.pages, None, document=document).detect_by_fontsize()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chars", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    layout = build_layout(args.chars)
+    pages = [{"page_num": page["page_num"], "text": ""} for page in layout]
+    print(f"{sum(len(p['chars']) for p in layout)} chars on {len(layout)} pages")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        parsed_dir = Path(tmp)
+        with open(parsed_dir / "pages.json", "w", encoding="utf-8") as f:
+            json.dump(pages, f)
+        with open(parsed_dir / "layout.json", "w", encoding="utf-8") as f:
+            json.dump(layout, f)
+        with LayoutWriter(parsed_dir / LAYOUT_FILENAME) as writer:
+            for page in layout:
+                writer.write(page["page_num"], page["chars"])
+        del layout
+
+        json_headings, json_time = timed(lambda: from_layout_json(parsed_dir))
+        store_headings, store_time = timed(lambda: from_layout_store(parsed_dir))
+        # The first run builds and saves the index, as the pipeline does after parsing
+        _, build_time = timed(lambda: from_line_index(parsed_dir))
+        index_headings, index_time = timed(lambda: from_line_index(parsed_dir))
+        index_size = (parsed_dir / LINES_FILENAME).stat().st_size
+
+    print(f"layout.json:  {json_time:.2f}s")
+    print(f"layout.bin:   {store_time:.2f}s  ({json_time / store_time:.1f}x)")
+    print(f"index build:  {build_time:.2f}s")
+    print(f"line index:   {index_time:.3f}s  ({json_time / index_time:.1f}x), {index_size / 1e6:.1f} MB")
+    print(f"headings: {len(index_headings)}, identical: {json_headings == store_headings == index_headings}")
+
+if __name__ == "__main__":
+    main()
@@ -7,6 +7,11 @@ from .scraper.config import OUTPUT_DIR
 
 logger = logging.getLogger(__name__)
 
+# start_page/end_page are the chapter's pages as detected (printed for ToC chapters);
+# the printed_* and pdf_* columns give both numberings, empty where unknown.
+CSV_FIELDS = ["book_id", "board", "class", "subject", "chapter_no", "chapter_name", "start_page", "end_page",
+              "printed_start_page", "printed_end_page", "pdf_start_page", "pdf_end_page"]
+
 class DataExporter:
     def __init__(self, book_id: str, output_dir: Path = OUTPUT_DIR):
         self.book_id = book_id
@@ -34,24 +39,12 @@ class DataExporter:
         """
         filepath = self.output_dir / f"{self.book_id}.csv"
         
-        fieldnames = ["book_id", "board", "class", "subject", "chapter_no", "chapter_name", "start_page", "end_page"]
-        
         with open(filepath, "w", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             writer.writeheader()
             
             for ch in chapters:
-                row = {
-                    "book_id": self.book_id,
-                    "board": metadata.get("board", ""),
-                    "class": metadata.get("class", ""),
-                    "subject": metadata.get("subject", ""),
-                    "chapter_no": ch.get("chapter_no"),
-                    "chapter_name": ch.get("chapter_name"),
-                    "start_page": ch.get("start_page"),
-                    "end_page": ch.get("end_page")
-                }
-                writer.writerow(row)
+                writer.writerow(self._csv_row(metadata, ch))
         logger.info(f"Exported CSV to {filepath}")
 
     def append_to_master_csv(self, metadata: Dict, chapters: List[Dict]):
@@ -60,28 +53,48 @@ class DataExporter:
         """
         filepath = self.output_dir / "all_books.csv"
         file_exists = filepath.exists()
-        
-        fieldnames = ["book_id", "board", "class", "subject", "chapter_no", "chapter_name", "start_page", "end_page"]
+        if file_exists:
+            self._upgrade_csv_header(filepath)
         
         with open(filepath, "a", newline="", encoding="utf-8") as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
             if not file_exists:
                 writer.writeheader()
             
             for ch in chapters:
-                row = {
-                    "book_id": self.book_id,
-                    "board": metadata.get("board", ""),
-                    "class": metadata.get("class", ""),
-                    "subject": metadata.get("subject", ""),
-                    "chapter_no": ch.get("chapter_no"),
-                    "chapter_name": ch.get("chapter_name"),
-                    "start_page": ch.get("start_page"),
-                    "end_page": ch.get("end_page")
-                }
-                writer.writerow(row)
+                writer.writerow(self._csv_row(metadata, ch))
         logger.info(f"Appended to master CSV: {filepath}")
 
+    def _csv_row(self, metadata: Dict, ch: Dict) -> Dict:
+        return {
+            "book_id": self.book_id,
+            "board": metadata.get("board", ""),
+            "class": metadata.get("class", ""),
+            "subject": metadata.get("subject", ""),
+            "chapter_no": ch.get("chapter_no"),
+            "chapter_name": ch.get("chapter_name"),
+            "start_page": ch.get("start_page"),
+            "end_page": ch.get("end_page"),
+            "printed_start_page": ch.get("printed_start_page"),
+            "printed_end_page": ch.get("printed_end_page"),
+            "pdf_start_page": ch.get("pdf_start_page"),
+            "pdf_end_page": ch.get("pdf_end_page"),
+        }
+
+    @staticmethod
+    def _upgrade_csv_header(filepath: Path):
+        """Rewrites a master CSV written with older columns so appended rows line up."""
+        with open(filepath, "r", newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames == CSV_FIELDS:
+                return
+            rows = list(reader)
+        with open(filepath, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=CSV_FIELDS, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        logger.info(f"Added the page range columns to {filepath}")
+
     def append_to_master_json(self, metadata: Dict, chapters: List[Dict]):
         """
         Appends to master JSON dataset (all_books.json).
@@ -0,0 +1,131 @@
+import logging
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Optional, Union
+
+from .document import DocumentModel
+from .headings import HeadingExtractor
+from .merger import ChapterMerger
+from .outline import OutlineExtractor
+from .toc import ToCExtractor
+from ..parser.folios import PageNumberIndex
+
+logger = logging.getLogger(__name__)
+
+CASCADE_MIN_COVERAGE = 0.5  # Share of the pages that must lie between the first chapter start and the end
+CASCADE_MIN_CHAPTERS = 2  # Fewer starts than this is a stray match, not a chapter list
+CASCADE_MIN_CHAPTER_PAGES = 2  # Pages between consecutive starts; 1-page "chapters" are running headers
+CASCADE_MIN_MAPPED = 0.5  # Share of ToC entries the page index must map for its numbering to be trusted
+
+class ChapterCascade:
+    """
+    Runs chapter-detection strategies cheapest first and stops at the first
+    result that passes `is_consistent`:
+
+    1. outline: PDF bookmarks, no page text needed (only with `pdf_source`);
+    2. toc: dot-leader lines on the contents pages;
+    3. regex: "Chapter N"-style lines in the page text;
+    4. headings: the regex headings plus the char-level font size pass.
+
+    If nothing passes, the results gathered so far are merged the way the
+    pipeline always has: ToC chapters when there are any, else headings.
+    `stats` records the strategies run, their time and the one accepted, as
+    counters that can be summed over books with `merge_stats`.
+
+    Usage:
+        cascade = ChapterCascade(pages, layout, document=document, pdf_source=pdf_path)
+        chapters = cascade.run()
+    """
+    def __init__(self, pages_data: List[Dict], layout_data, document: Optional[DocumentModel] = None,
+                 pdf_source: Optional[Union[Path, BinaryIO]] = None, board: Optional[str] = None,
+                 page_index: Optional[PageNumberIndex] = None):
+        self.pages = pages_data
+        self.document = document or DocumentModel(pages_data, layout_data)
+        self.headings = HeadingExtractor(pages_data, layout_data, document=self.document, board=board)
+        self.pdf_source = pdf_source
+        self.total_pages = len(pages_data)
+        self.page_index = page_index
+        self.stats = new_cascade_stats()
+
+    def run(self) -> List[Dict]:
+        """Chapters (see ChapterMerger.merge) from the cheapest consistent strategy."""
+        toc_chapters: List[Dict] = []
+        if self.pdf_source is not None:
+            toc_chapters = self._timed("outline", OutlineExtractor(self.pdf_source).extract)
+            if self._accept("outline", toc_chapters, "start_page"):
+                return self._merge(toc_chapters, [])
+
+        text_toc = self._timed("toc", ToCExtractor(self.pages, document=self.document).extract)
+        toc_chapters = toc_chapters or text_toc
+        if self._accept("toc", text_toc, "start_page", printed=True):
+            return self._merge(text_toc, [])
+
+        regex = self._timed("regex", self.headings.detect_by_regex)
+        if self._accept("regex", regex, "page_num"):
+            return self._merge([], regex)
+
+        headings = self._timed("headings", self.headings.detect_by_fontsize) + regex
+        if self._accept("headings", headings, "page_num"):
+            return self._merge([], headings)
+
+        logger.info("No strategy gave a consistent chapter list, merging what was found.")
+        return self._merge(toc_chapters, headings)
+
+    def _merge(self, toc_chapters: List[Dict], heading_chapters: List[Dict]) -> List[Dict]:
+        return ChapterMerger(toc_chapters, heading_chapters, self.total_pages, page_index=self.page_index).merge()
+
+    def _timed(self, name: str, strategy) -> List[Dict]:
+        start = time.perf_counter()
+        result = strategy()
+        elapsed = time.perf_counter() - start
+        self.stats["ran"][name] = self.stats["ran"].get(name, 0) + 1
+        self.stats["seconds"][name] = self.stats["seconds"].get(name, 0.0) + elapsed
+        logger.info(f"Chapter strategy {name}: {len(result)} candidates in {elapsed * 1000:.1f} ms")
+        return result
+
+    def _accept(self, name: str, candidates: List[Dict], page_key: str, printed: bool = False) -> bool:
+        pages = [c[page_key] for c in candidates]
+        if page_key == "page_num":
+            # Headings are deduplicated per page by the merger
+            pages = sorted(set(pages))
+        if printed and self.page_index:
+            pages = self._printed_to_pdf(pages)
+            if pages is None:
+                return False
+        if not is_consistent(pages, self.total_pages):
+            return False
+        self.stats["accepted"][name] = self.stats["accepted"].get(name, 0) + 1
+        logger.info(f"Accepted {len(pages)} chapters from strategy {name}")
+        return True
+
+    def _printed_to_pdf(self, printed_pages: List[int]) -> Optional[List[int]]:
+        """
+        Maps ToC page numbers to PDF pages through a non-empty page index
+        (without one they are taken as PDF pages). Entries the index does not
+        cover, e.g. an appendix past the last numbered page, are left out of
+        the check; if fewer than CASCADE_MIN_MAPPED of them map, the ToC does
+        not follow the book's numbering and None is returned.
+        """
+        mapped = [self.page_index.to_pdf(page) for page in printed_pages]
+        pages = [page for page in mapped if page is not None]
+        if len(pages) < CASCADE_MIN_MAPPED * len(mapped):
+            return None
+        return pages
+
+def is_consistent(start_pages: List[int], total_pages: int) -> bool:
+    """
+    True if there are at least CASCADE_MIN_CHAPTERS chapter start pages,
+    at least CASCADE_MIN_CHAPTER_PAGES apart, all inside the document, and
+    together covering at least CASCADE_MIN_COVERAGE of it (front matter
+    before the first chapter is allowed, a fragment is not).
+    """
+    if len(start_pages) < CASCADE_MIN_CHAPTERS or not total_pages:
+        return False
+    if any(later - earlier < CASCADE_MIN_CHAPTER_PAGES for earlier, later in zip(start_pages, start_pages[1:])):
+        return False
+    if start_pages[0] < 1 or start_pages[-1] > total_pages:
+        return False
+    return (total_pages - start_pages[0] + 1) / total_pages >= CASCADE_MIN_COVERAGE
+
+def new_cascade_stats() -> Dict:
+    return {"ran": {}, "seconds": {}, "accepted": {}}
@@ -0,0 +1,232 @@
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from .lines import build_lines, columns_from_chars, columns_from_store, size_histogram
+from ..parser.layout_store import LayoutStore, StoredPage, LAYOUT_FILENAME
+
+logger = logging.getLogger(__name__)
+
+DOCUMENT_VERSION = 2  # Bump whenever the line table changes shape or meaning
+LINES_FILENAME = "lines.npz"
+
+class DocumentModel:
+    """
+    Text and line geometry for one parsed segment, derived once and shared
+    by HeadingExtractor, ToCExtractor and MetadataExtractor.
+
+    Everything is built lazily on first use:
+    - `text_lines`: each page's text split into stripped lines;
+    - `lower_texts`: each page's text, lowercased;
+    - `lines`: a book-wide line table from the layout (see `build_lines`),
+      with a `page_num` column; `page_lines(page_num)` slices it per page;
+    - `histograms`: book-level font-size histograms of those lines (see
+      `size_histogram`).
+
+    With `cache_dir`, the line table and histograms are saved there as
+    LINES_FILENAME, the segment's line index, and reused while the parsed
+    files they were built from are unchanged. Without `layout_data`, the
+    layout is only read from `cache_dir` if that index has to be rebuilt,
+    so `from_parsed` can re-run heading detection without it.
+
+    Usage:
+        document = DocumentModel(pages, layout, cache_dir=parser.output_dir)
+        HeadingExtractor(pages, layout, document=document)
+    """
+    def __init__(self, pages_data: List[Dict], layout_data=None, cache_dir: Optional[Path] = None):
+        self.pages = pages_data
+        self.layout = layout_data
+        self.cache_dir = cache_dir
+        self._text_lines: Optional[List[List[str]]] = None
+        self._lower_texts: Optional[List[str]] = None
+        self._lines: Optional[Dict[str, Any]] = None
+        self._histograms: Optional[Dict[str, np.ndarray]] = None
+        self._page_slices: Dict[int, slice] = {}
+
+    @classmethod
+    def from_parsed(cls, parsed_dir: Path) -> "DocumentModel":
+        """The document of a segment saved by PDFParser, reading only pages.json and the line index."""
+        with open(parsed_dir / "pages.json", "r", encoding="utf-8") as f:
+            pages_data = json.load(f)
+        return cls(pages_data, cache_dir=parsed_dir)
+
+    @property
+    def text_lines(self) -> List[List[str]]:
+        if self._text_lines is None:
+            self._text_lines = [[line.strip() for line in page.get('text', '').split('\n')]
+                                if page.get('text') else [] for page in self.pages]
+        return self._text_lines
+
+    @property
+    def lower_texts(self) -> List[str]:
+        if self._lower_texts is None:
+            self._lower_texts = [page.get('text', '').lower() for page in self.pages]
+        return self._lower_texts
+
+    @property
+    def lines(self) -> Dict[str, Any]:
+        """Book-wide line columns: page_num, text, fontname, bold, chars, size, top and x0, in page order."""
+        return self.ensure_line_index()
+
+    def ensure_line_index(self) -> Dict[str, Any]:
+        """
+        Loads the saved line index, or builds and saves it, along with the
+        per-page slices and size histograms. Returns the line columns.
+        """
+        if self._lines is None:
+            self._lines = self._load_lines()
+            if self._lines is None:
+                self._lines = self._build_lines()
+                self._histograms = size_histogram(self._lines["size"], self._lines["chars"])
+                self._save_lines()
+            bounds = np.flatnonzero(np.diff(self._lines["page_num"])) + 1
+            starts = [0] + bounds.tolist()
+            ends = bounds.tolist() + [len(self._lines["page_num"])]
+            self._page_slices = {int(self._lines["page_num"][start]): slice(start, end)
+                                 for start, end in zip(starts, ends) if end > start}
+        return self._lines
+
+    @property
+    def histograms(self) -> Dict[str, np.ndarray]:
+        """Line sizes binned over the whole book: bin `size`, and the `lines` and `chars` in each bin."""
+        if self._histograms is None:
+            lines = self.ensure_line_index()
+            if self._histograms is None:
+                self._histograms = size_histogram(lines["size"], lines["chars"])
+        return self._histograms
+
+    @property
+    def body_size(self) -> float:
+        """The font size bin holding the most chars (0 without any lines)."""
+        histograms = self.histograms
+        if not len(histograms["chars"]):
+            return 0.0
+        return float(histograms["size"][np.argmax(histograms["chars"])])
+
+    def page_nums(self) -> List[int]:
+        """Pages that have at least one layout line, in order."""
+        self.ensure_line_index()
+        return list(self._page_slices)
+
+    def page_lines(self, page_num: int) -> Dict[str, Any]:
+        """The line columns of one page (empty if it has no chars)."""
+        lines = self.ensure_line_index()
+        part = self._page_slices.get(page_num, slice(0, 0))
+        return {name: column[part] for name, column in lines.items()}
+
+    def _page_columns(self):
+        if self.layout is None:
+            if self.cache_dir is not None and (self.cache_dir / LAYOUT_FILENAME).exists():
+                logger.info(f"Reading {self.cache_dir / LAYOUT_FILENAME} to build the line index")
+                with LayoutStore(self.cache_dir / LAYOUT_FILENAME) as store:
+                    yield from _layout_columns(store)
+            return
+        yield from _layout_columns(self.layout)
+
+    def _build_lines(self) -> Dict[str, Any]:
+        parts = []
+        for page_num, columns in self._page_columns():
+            lines = build_lines(columns)
+            if lines["text"]:
+                lines["page_num"] = np.full(len(lines["text"]), page_num, dtype=np.int32)
+                parts.append(lines)
+        if not parts:
+            empty = build_lines({"top": np.empty(0)})
+            empty["page_num"] = np.empty(0, dtype=np.int32)
+            parts = [empty]
+        lines = {name: np.concatenate([p[name] for p in parts]) for name in _NUMERIC_COLUMNS}
+        lines["text"] = [text for p in parts for text in p["text"]]
+        lines["fontname"] = [font for p in parts for font in p["fontname"]]
+        return lines
+
+    def _source_key(self) -> Optional[np.ndarray]:
+        """Version plus size and mtime of the parsed files the lines come from."""
+        key = [DOCUMENT_VERSION]
+        for name in ("pages.json", LAYOUT_FILENAME):
+            try:
+                stat = os.stat(self.cache_dir / name)
+            except OSError:
+                return None
+            key += [stat.st_size, stat.st_mtime_ns]
+        return np.array(key, dtype=np.int64)
+
+    def _load_lines(self) -> Optional[Dict[str, Any]]:
+        if self.cache_dir is None or not (self.cache_dir / LINES_FILENAME).exists():
+            return None
+        key = self._source_key()
+        if key is None:
+            return None
+        try:
+            with np.load(self.cache_dir / LINES_FILENAME) as saved:
+                if not np.array_equal(saved["key"], key):
+                    return None
+                lines = {name: saved[name] for name in _NUMERIC_COLUMNS}
+                lines["text"] = _unpack_strings(saved["text"], saved["text_offsets"])
+                lines["fontname"] = _unpack_strings(saved["fontname"], saved["fontname_offsets"])
+                self._histograms = {name: saved["hist_" + name] for name in ("size", "lines", "chars")}
+        except (OSError, KeyError, ValueError) as e:
+            logger.warning(f"Could not read {self.cache_dir / LINES_FILENAME}, rebuilding lines: {e}")
+            return None
+        logger.info(f"Loaded {len(lines['text'])} lines from {self.cache_dir / LINES_FILENAME}")
+        return lines
+
+    def _save_lines(self):
+        if self.cache_dir is None:
+            return
+        key = self._source_key()
+        if key is None:
+            return
+        path = self.cache_dir / LINES_FILENAME
+        tmp_path = path.with_name(path.name + ".tmp")
+        text, text_offsets = _pack_strings(self._lines["text"])
+        fontname, fontname_offsets = _pack_strings(self._lines["fontname"])
+        numeric = {name: self._lines[name] for name in _NUMERIC_COLUMNS}
+        histograms = {"hist_" + name: values for name, values in self._histograms.items()}
+        with open(tmp_path, "wb") as f:
+            np.savez(f, key=key, text=text, text_offsets=text_offsets, fontname=fontname,
+                     fontname_offsets=fontname_offsets, **numeric, **histograms)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {path}")
+
+_NUMERIC_COLUMNS = ("page_num", "bold", "chars", "size", "top", "x0")
+
+def _layout_columns(layout):
+    """
+    (page_num, char columns) for each page of a LayoutStore, or of a list of
+    {"page_num", "chars"} entries. StoredPage entries (a cached parse) are
+    read from their columns without building char dicts.
+    """
+    if hasattr(layout, "columns"):  # LayoutStore
+        texts = np.array(layout.texts, dtype=object)
+        fontnames = np.array(layout.fontnames, dtype=object)
+        for i, page_num in enumerate(layout.page_nums()):
+            yield page_num, columns_from_store(layout.columns(i), texts, fontnames)
+        return
+    tables = {}
+    for page_layout in layout:
+        if isinstance(page_layout, StoredPage):
+            if not len(page_layout.columns["size"]):
+                continue
+            # Every page of a store shares its tables; convert them once
+            key = id(page_layout.texts)
+            if key not in tables:
+                tables[key] = (np.array(page_layout.texts, dtype=object),
+                               np.array(page_layout.fontnames, dtype=object))
+            yield page_layout.page_num, columns_from_store(page_layout.columns, *tables[key])
+        elif page_layout['chars']:
+            yield page_layout['page_num'], columns_from_chars(page_layout['chars'])
+
+def _pack_strings(values: List[str]):
+    """UTF-8 bytes of all `values` plus the end offset of each, so no pickling is needed."""
+    encoded = [value.encode("utf-8") for value in values]
+    offsets = np.cumsum([len(value) for value in encoded], dtype=np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    blob = data.tobytes()
+    bounds = [0] + offsets.tolist()
+    return [blob[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
@@ -0,0 +1,111 @@
+import logging
+import math
+import re
+from collections import Counter
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+LINE_TOLERANCE = 3  # Points a char's top may drift from the first char of its line
+SIZE_BIN_WIDTH = 0.5  # Points per font-size histogram bin
+
+# Weight markers in PostScript font names ("ABCDEF+Times-Bold", "NotoSans-SemiBold")
+_BOLD_FONT = re.compile(r"bold|black|heavy|demi", re.IGNORECASE)
+
+def columns_from_chars(chars: Sequence[Dict]) -> Dict[str, np.ndarray]:
+    """
+    Char dicts as top, x0 and size float64 columns plus `text` and
+    `fontname` object columns. `chars` is left untouched.
+    """
+    count = len(chars)
+    return {
+        "top": np.fromiter((c['top'] for c in chars), dtype=np.float64, count=count),
+        "x0": np.fromiter((c['x0'] for c in chars), dtype=np.float64, count=count),
+        "size": np.fromiter((c['size'] for c in chars), dtype=np.float64, count=count),
+        "text": np.array([c['text'] for c in chars], dtype=object),
+        "fontname": np.array([c.get('fontname', "") for c in chars], dtype=object),
+    }
+
+def columns_from_store(columns: Dict, texts: np.ndarray, fontnames: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Wraps one page of LayoutStore.columns without copying the numeric
+    columns. `texts` and `fontnames` are the store's tables as object arrays.
+    """
+    return {
+        "top": np.frombuffer(columns["top"], dtype=np.float64),
+        "x0": np.frombuffer(columns["x0"], dtype=np.float64),
+        "size": np.frombuffer(columns["size"], dtype=np.float64),
+        "text": texts[np.frombuffer(columns["text_id"], dtype=np.uint32)],
+        "fontname": fontnames[np.frombuffer(columns["font_id"], dtype=np.uint32)],
+    }
+
+def build_lines(columns: Dict[str, np.ndarray], tolerance: float = LINE_TOLERANCE) -> Dict[str, Any]:
+    """
+    Groups chars into lines: chars are ordered by (top, x0) and a line takes
+    every following char whose top is within `tolerance` of the line's first
+    char.
+
+    Returns:
+        Line columns in top-down order: `text` and `fontname` (the font of
+        most of the line's chars, ties going to the first) lists, `bold`
+        (fontname has a weight marker) and `chars` (char count) arrays, and
+        `size` (average), `top` and `x0` (leftmost) float64 arrays.
+    """
+    top = columns["top"]
+    if not len(top):
+        return {"text": [], "fontname": [], "bold": np.empty(0, dtype=bool), "chars": np.empty(0, dtype=np.int32),
+                "size": np.empty(0), "top": np.empty(0), "x0": np.empty(0)}
+    order = np.lexsort((columns["x0"], top))  # Stable, so ties keep their input order
+    top = top[order]
+    # Each line ends at the first char more than `tolerance` below its first char
+    starts = [0]
+    while True:
+        end = int(np.searchsorted(top, top[starts[-1]] + tolerance, side="right"))
+        if end >= len(top):
+            break
+        starts.append(end)
+    starts = np.asarray(starts)
+    counts = np.diff(np.append(starts, len(top)))
+    sizes = np.add.reduceat(columns["size"][order], starts) / counts
+    text = columns["text"][order]
+    bounds = np.append(starts, len(top)).tolist()
+    if "fontname" in columns:
+        fonts = columns["fontname"][order]
+        fontnames = [Counter(fonts[start:end]).most_common(1)[0][0] for start, end in zip(bounds, bounds[1:])]
+    else:
+        fontnames = [""] * len(starts)
+    return {
+        "text": ["".join(text[start:end]) for start, end in zip(bounds, bounds[1:])],
+        "fontname": fontnames,
+        "bold": np.array([bool(_BOLD_FONT.search(font)) for font in fontnames], dtype=bool),
+        "chars": counts.astype(np.int32),
+        "size": sizes,
+        "top": top[starts],
+        "x0": np.minimum.reduceat(columns["x0"][order], starts),
+    }
+
+def font_stats(sizes: np.ndarray) -> Tuple[float, float]:
+    """Mean and sample standard deviation of line sizes (0 for fewer than two lines)."""
+    count = len(sizes)
+    mean = math.fsum(sizes) / count
+    if count < 2:
+        return mean, 0.0
+    deviations = sizes - mean
+    return mean, math.sqrt(math.fsum(deviations * deviations) / (count - 1))
+
+def size_histogram(sizes: np.ndarray, weights: np.ndarray, bin_width: float = SIZE_BIN_WIDTH) -> Dict[str, np.ndarray]:
+    """
+    Line sizes rounded to `bin_width`: the `size` of each non-empty bin
+    (ascending), the number of `lines` in it and the `chars` they hold
+    (`weights`, one per line).
+    """
+    if not len(sizes):
+        return {"size": np.empty(0), "lines": np.empty(0, dtype=np.int64), "chars": np.empty(0, dtype=np.int64)}
+    bins, inverse = np.unique(np.round(sizes / bin_width), return_inverse=True)
+    return {
+        "size": bins * bin_width,
+        "lines": np.bincount(inverse, minlength=len(bins)).astype(np.int64),
+        "chars": np.bincount(inverse, weights=weights, minlength=len(bins)).astype(np.int64),
+    }
@@ -1,13 +1,26 @@
 import logging
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
+
+from ..parser.folios import PageNumberIndex
 
 logger = logging.getLogger(__name__)
 
 class ChapterMerger:
-    def __init__(self, toc_chapters: List[Dict], heading_chapters: List[Dict], total_pages: int):
+    def __init__(self, toc_chapters: List[Dict], heading_chapters: List[Dict], total_pages: int,
+                 page_index: Optional[PageNumberIndex] = None):
+        """
+        Args:
+            toc_chapters: Chapters from the ToC (printed start pages) or the
+                outline (PDF start pages).
+            heading_chapters: Headings found on PDF pages.
+            total_pages: Pages in the PDF.
+            page_index: Printed/PDF page mapping from the parser, used to
+                give every chapter both page ranges.
+        """
         self.toc_chapters = toc_chapters
         self.heading_chapters = heading_chapters
         self.total_pages = total_pages
+        self.page_index = page_index
 
     def merge(self) -> List[Dict]:
         """
@@ -32,6 +45,7 @@ class ChapterMerger:
             final_chapters = sorted(page_map.values(), key=lambda x: x['page_num'])
 
         # 2. Post-process: Add end_page and format
+        starts = [self._pdf_and_printed(ch) for ch in final_chapters]
         processed = []
         for i, ch in enumerate(final_chapters):
             start = ch.get('start_page') or ch.get('page_num')
@@ -51,7 +65,36 @@ class ChapterMerger:
                 "chapter_name": ch.get('chapter_name') or ch.get('text') or f"Chapter {i+1}",
                 "start_page": start,
                 "end_page": end,
-                "source_strategy": ch.get('type', 'unknown')
+                "source_strategy": ch.get('type', 'unknown'),
+                **self._page_ranges(ch, end, starts[i], starts[i + 1][0] if i + 1 < len(starts) else None)
             })
             
         return processed
+
+    def _pdf_and_printed(self, ch: Dict) -> Tuple[Optional[int], Optional[int]]:
+        """(PDF page, printed page) a chapter starts on; either may be None if unknown."""
+        start = ch.get('start_page') or ch.get('page_num')
+        if ch.get('type') == 'toc':
+            # ToC entries carry the number printed on the page
+            return (self.page_index.to_pdf(start) if self.page_index else None), start
+        printed = self.page_index.to_printed(start) if self.page_index else None
+        if printed is None and str(ch.get('page_label', '')).isdigit():
+            printed = int(ch['page_label'])
+        return start, printed
+
+    def _page_ranges(self, ch: Dict, end: int, start: Tuple[Optional[int], Optional[int]],
+                     next_pdf_start: Optional[int]) -> Dict:
+        """Printed and PDF start/end pages of a chapter (None where they cannot be mapped)."""
+        pdf_start, printed_start = start
+        pdf_end = None
+        if pdf_start is not None:
+            pdf_end = max(pdf_start, next_pdf_start - 1 if next_pdf_start is not None else self.total_pages)
+        printed_end = self.page_index.to_printed(pdf_end) if self.page_index and pdf_end else None
+        if printed_end is None and ch.get('type') == 'toc':
+            printed_end = end
+        return {
+            "printed_start_page": printed_start,
+            "printed_end_page": printed_end,
+            "pdf_start_page": pdf_start,
+            "pdf_end_page": pdf_end,
+        }
@@ -1,14 +1,17 @@
 import re
 import logging
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional
+
+from .document import DocumentModel
 
 logger = logging.getLogger(__name__)
 
 class MetadataExtractor:
-    def __init__(self, file_path: Path, pages_data: List[Dict]):
+    def __init__(self, file_path: Path, pages_data: List[Dict], document: Optional[DocumentModel] = None):
         self.file_path = file_path
         self.pages = pages_data
+        self.document = document or DocumentModel(pages_data)
 
     def extract(self) -> Dict[str, str]:
         """
@@ -54,7 +57,8 @@ class MetadataExtractor:
             # Try to extract title if it looks like a filename
             if metadata["title"] == "Unknown" or metadata["title"] == self.file_path.stem:
                 # Heuristic: First line of first page might be title if it's short
-                first_line = self.pages[0].get('text', '').split('\n')[0].strip()
+                first_lines = self.document.text_lines[0]
+                first_line = first_lines[0] if first_lines else ""
                 if 3 < len(first_line) < 50:
                      metadata["title"] = first_line.title()
 
@@ -0,0 +1,54 @@
+import logging
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Union
+
+from ..parser.backends import PdfiumDocument
+
+logger = logging.getLogger(__name__)
+
+class OutlineExtractor:
+    def __init__(self, source: Union[Path, BinaryIO]):
+        self.source = source
+
+    def extract(self) -> List[Dict]:
+        """
+        Strategy C (outline): chapters from the PDF's bookmarks.
+
+        Reads the outline and page-label trees through PDFium without
+        extracting any page text. Chapters are the bookmarks on the shallowest
+        outline level with more than one entry, so a single top-level entry
+        for the book title is skipped. `start_page` is the 1-based PDF page
+        the bookmark points to and `page_label` the label printed for it.
+        Returns [] if the PDF has no usable outline.
+        """
+        logger.info("Running Strategy C: Outline Extraction")
+        try:
+            with PdfiumDocument(self.source) as doc:
+                entries = [item for item in doc.outline() if item["title"] and item["page_index"] is not None]
+                level = _chapter_level(entries)
+                chapters = [{
+                    "chapter_name": item["title"],
+                    "start_page": item["page_index"] + 1,
+                    "page_label": doc.page_label(item["page_index"]) or str(item["page_index"] + 1),
+                    "type": "outline",
+                    "confidence": 0.95
+                } for item in entries if item["level"] == level]
+        except Exception as e:
+            logger.warning(f"Could not read the outline of {self.source}: {e}")
+            return []
+
+        if not chapters:
+            logger.info("No outline found.")
+            return []
+        chapters.sort(key=lambda ch: ch["start_page"])
+        logger.info(f"Outline: {len(chapters)} chapters at level {level}")
+        return chapters
+
+def _chapter_level(entries: List[Dict]):
+    """The shallowest outline level with at least two entries (or the shallowest level present)."""
+    counts: Dict[int, int] = {}
+    for item in entries:
+        counts[item["level"]] = counts.get(item["level"], 0) + 1
+    if not counts:
+        return None
+    return next((level for level in sorted(counts) if counts[level] > 1), min(counts))
@@ -0,0 +1,83 @@
+import logging
+import re
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+ANY = "*"
+
+class PatternRegistry:
+    """
+    Heading patterns ("Chapter 5", "अध्याय 5", ...) by name, each tagged with
+    the languages and boards it applies to (ANY for all).
+
+    `matcher` compiles the patterns selected for a board and set of
+    languages into one HeadingMatcher, so adding a script adds a branch to
+    a single regex instead of another pass over every line.
+
+    Usage:
+        HEADING_PATTERNS.register("chapter_bn", r"অধ্যায়\\s*\\d+", languages=("bn",))
+        matcher = HEADING_PATTERNS.matcher(board="CBSE", languages=("en", "bn"))
+    """
+    def __init__(self):
+        self._patterns: Dict[str, Tuple[str, Tuple[str, ...], Tuple[str, ...]]] = {}
+
+    def register(self, name: str, pattern: str, languages: Sequence[str] = (ANY,), boards: Sequence[str] = (ANY,)):
+        """Adds or replaces a pattern. It is matched at the start of a stripped line, case-insensitively."""
+        if not name.isidentifier():
+            raise ValueError(f"Pattern name {name!r} must be a valid identifier")
+        self._patterns[name] = (pattern, tuple(languages), tuple(boards))
+
+    def pattern(self, name: str) -> str:
+        return self._patterns[name][0]
+
+    def names(self, board: Optional[str] = None, languages: Optional[Sequence[str]] = None) -> List[str]:
+        """Patterns for `board` and `languages` in registration order; None selects all."""
+        selected = []
+        for name, (_, pattern_languages, pattern_boards) in self._patterns.items():
+            if board is not None and ANY not in pattern_boards and board not in pattern_boards:
+                continue
+            if languages is not None and ANY not in pattern_languages and not set(languages) & set(pattern_languages):
+                continue
+            selected.append(name)
+        return selected
+
+    def matcher(self, board: Optional[str] = None, languages: Optional[Sequence[str]] = None) -> "HeadingMatcher":
+        names = tuple(self.names(board, languages))
+        return _compile(tuple((name, self._patterns[name][0]) for name in names))
+
+class HeadingMatcher:
+    """
+    All selected patterns as one MULTILINE regex with a named group per
+    pattern, scanned over a page's text in a single pass. Lines containing
+    ".." (ToC entries such as "Chapter 1 ... 5") are skipped. `\\s` in the
+    patterns is narrowed to `[^\\S\\n]` so matches never run across lines.
+    """
+    def __init__(self, patterns: Tuple[Tuple[str, str], ...]):
+        self.names = [name for name, _ in patterns]
+        branches = "|".join(f"(?P<{name}>{_single_line(pattern)})" for name, pattern in patterns)
+        # Leading whitespace is skipped like str.strip(); the lookahead rejects ToC lines.
+        self.regex = re.compile(rf"^[^\S\n]*(?![^\n]*\.\.)(?:{branches or '(?!)'})[^\n]*",
+                                re.MULTILINE | re.IGNORECASE)
+
+    def scan(self, text: str) -> Iterator[Tuple[str, str]]:
+        """Yields (stripped line, pattern name) for each heading line in `text`, in order."""
+        for match in self.regex.finditer(text):
+            yield match.group(0).strip(), match.lastgroup
+
+@lru_cache(maxsize=32)
+def _compile(patterns: Tuple[Tuple[str, str], ...]) -> HeadingMatcher:
+    return HeadingMatcher(patterns)
+
+def _single_line(pattern: str) -> str:
+    return pattern.replace(r"\s", r"[^\S\n]")
+
+HEADING_PATTERNS = PatternRegistry()
+HEADING_PATTERNS.register("chapter", r"Chapter\s*\d+", languages=("en",))
+HEADING_PATTERNS.register("chapter_upper", r"CHAPTER\s+\d+", languages=("en",))
+HEADING_PATTERNS.register("unit", r"Unit\s*\d+", languages=("en",))
+HEADING_PATTERNS.register("lesson", r"Lesson\s*\d+", languages=("en",))
+HEADING_PATTERNS.register("adhyay_hi", r"अध्याय\s*\d+", languages=("hi",))
+HEADING_PATTERNS.register("paadam_ta", r"பாடம்\s*\d+", languages=("ta",))
+HEADING_PATTERNS.register("adhyaya_kn", r"ಅಧ್ಯಾಯ\s*\d+", languages=("kn",))
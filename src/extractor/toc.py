@@ -1,17 +1,38 @@
 import re
 import logging
-from typing import List, Dict
+from pathlib import Path
+from typing import BinaryIO, List, Dict, Optional, Union
+
+from .document import DocumentModel
+from .outline import OutlineExtractor
 
 logger = logging.getLogger(__name__)
 
 class ToCExtractor:
-    def __init__(self, pages_data: List[Dict]):
+    def __init__(self, pages_data: List[Dict], document: Optional[DocumentModel] = None,
+                 pdf_source: Optional[Union[Path, BinaryIO]] = None):
+        """
+        Args:
+            pages_data: Page records from the parser (pages.json).
+            document: DocumentModel shared with the other extractors.
+            pdf_source: The PDF (path or stream). If given, its outline is
+                tried first and the contents pages are only scanned when it
+                has none.
+        """
         self.pages = pages_data
+        self.document = document or DocumentModel(pages_data)
+        self.pdf_source = pdf_source
 
     def extract(self) -> List[Dict]:
         """
         Strategy C: Extract chapters from Table of Contents.
+        Uses the PDF outline when there is one (see OutlineExtractor).
         """
+        if self.pdf_source is not None:
+            chapters = OutlineExtractor(self.pdf_source).extract()
+            if chapters:
+                return chapters
+        
         logger.info("Running Strategy C: ToC Extraction")
         toc_pages = self._find_toc_pages()
         if not toc_pages:
@@ -25,13 +46,11 @@ class ToCExtractor:
         # Matches: "Chapter 1 ... 5", "Chapter 1 . . . 5", "Chapter 1       5"
         pattern = r"^(.*?)(?:(?:\. ?){2,}|\s{2,})(\d+)$"
         
-        for page in toc_pages:
-            text = page.get('text', '')
-            logger.info(f"Scanning ToC page {page.get('page_num')} content: {text[:50]}...")
-            lines = text.split('\n')
+        for i in toc_pages:
+            page = self.pages[i]
+            logger.info(f"Scanning ToC page {page.get('page_num')} content: {page.get('text', '')[:50]}...")
             
-            for line in lines:
-                line = line.strip()
+            for line in self.document.text_lines[i]:
                 match = re.match(pattern, line)
                 if match:
                     title = match.group(1).strip()
@@ -51,18 +70,17 @@ class ToCExtractor:
                     
         return chapters
 
-    def _find_toc_pages(self) -> List[Dict]:
+    def _find_toc_pages(self) -> List[int]:
         """
         Identifies pages that are likely part of the Table of Contents.
-        Checks first 15 pages for keywords.
+        Checks first 15 pages for keywords. Returns their indexes in `pages`.
         """
         candidates = []
         keywords = ["content", "contents", "table of contents", "index", "visay suchi"]
         
         # Only check first 15 pages
-        for i, page in enumerate(self.pages[:15]):
-            text = page.get('text', '').lower()
+        for i, text in enumerate(self.document.lower_texts[:15]):
             if any(k in text for k in keywords):
-                candidates.append(page)
+                candidates.append(i)
                 
         return candidates
@@ -0,0 +1,261 @@
+import abc
+import ctypes
+import io
+import logging
+from collections import namedtuple
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Union
+
+import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
+
+logger = logging.getLogger(__name__)
+
+PageImage = namedtuple("PageImage", ["original"])
+
+class PDFBackend(abc.ABC):
+    """
+    Opens PDFs for PDFParser.
+
+    `open` returns a context manager whose `pages` is a sequence of page
+    objects offering the subset of pdfplumber's Page API the parser uses:
+    `width`, `height`, `initial_doctop`, `extract_text()`, `chars` and
+    `images` (dicts with pdfplumber's keys), `to_image(resolution=...).original`
+    (a PIL image), `crop(bbox)` (a view with its own `to_image`) and `close()`.
+    """
+    name = ""
+
+    @abc.abstractmethod
+    def open(self, source: Union[Path, BinaryIO]):
+        """Opens `source` (a path or binary stream) as a document with `pages`."""
+
+class PdfplumberBackend(PDFBackend):
+    """pdfplumber/pdfminer: pure Python, the reference output."""
+    name = "pdfplumber"
+
+    def open(self, source: Union[Path, BinaryIO]):
+        return pdfplumber.open(source)
+
+class PdfiumBackend(PDFBackend):
+    """PDFium through pypdfium2: native text extraction, several times faster."""
+    name = "pdfium"
+
+    def open(self, source: Union[Path, BinaryIO]) -> "PdfiumDocument":
+        return PdfiumDocument(source)
+
+class PdfiumDocument:
+    def __init__(self, source: Union[Path, BinaryIO]):
+        if isinstance(source, io.IOBase):
+            # Leave the stream where it was; another reader may be sharing it.
+            position = source.tell()
+            source.seek(0)
+            self._doc = pdfium.PdfDocument(source.read())
+            source.seek(position)
+        else:
+            self._doc = pdfium.PdfDocument(str(source))
+        self.pages = _PdfiumPages(self._doc)
+
+    def outline(self, max_depth: int = 15) -> List[Dict]:
+        """
+        Bookmarks in document order as {"title", "level", "page_index"}, read
+        from the outline tree without loading any page. `page_index` is
+        zero-based, or None when a bookmark has no page destination.
+        """
+        items = []
+        for bookmark in self._doc.get_toc(max_depth=max_depth):
+            dest = bookmark.get_dest()
+            if dest is None:
+                # Many producers link bookmarks through a GoTo action instead of /Dest
+                action = pdfium_c.FPDFBookmark_GetAction(bookmark)
+                raw_dest = pdfium_c.FPDFAction_GetDest(self._doc, action) if action else None
+                dest = pdfium.PdfDest(raw_dest, pdf=self._doc) if raw_dest else None
+            items.append({
+                "title": bookmark.get_title().strip(),
+                "level": bookmark.level,
+                "page_index": dest.get_index() if dest is not None else None,
+            })
+        return items
+
+    def page_label(self, index: int) -> str:
+        """The page's label from the document's page-label tree ("" if it has none)."""
+        return self._doc.get_page_label(index)
+
+    def close(self):
+        self._doc.close()
+
+    def __enter__(self) -> "PdfiumDocument":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class _PdfiumPages:
+    """Lazy page sequence. Doctops come from page sizes, without loading pages."""
+    def __init__(self, doc: pdfium.PdfDocument):
+        self._doc = doc
+        self._doctops = [0.0]
+        for i in range(len(doc)):
+            self._doctops.append(self._doctops[-1] + doc.get_page_size(i)[1])
+
+    def __len__(self) -> int:
+        return len(self._doc)
+
+    def __getitem__(self, i: int) -> "PdfiumPage":
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return PdfiumPage(self._doc, i, self._doctops[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+class PdfiumPage:
+    def __init__(self, doc: pdfium.PdfDocument, index: int, doctop: float):
+        self._page = doc[index]
+        self._textpage = None
+        self._chars = None
+        self.page_number = index + 1
+        self.initial_doctop = doctop
+        self.width, self.height = self._page.get_size()
+
+    @property
+    def textpage(self) -> pdfium.PdfTextPage:
+        if self._textpage is None:
+            self._textpage = self._page.get_textpage()
+        return self._textpage
+
+    def extract_text(self) -> str:
+        return self.textpage.get_text_range().replace("\r\n", "\n").replace("\r", "\n")
+
+    @property
+    def chars(self) -> List[Dict]:
+        """Chars in pdfplumber's schema. Line breaks PDFium inserts itself are left out."""
+        if self._chars is None:
+            self._chars = self._extract_chars()
+        return self._chars
+
+    def _extract_chars(self) -> List[Dict]:
+        textpage = self.textpage
+        raw = textpage.raw
+        fonts = {}  # Font handle -> (name, descent per point)
+        origin_x, origin_y = ctypes.c_double(), ctypes.c_double()
+        chars = []
+        for i in range(textpage.count_chars()):
+            if pdfium_c.FPDFText_IsGenerated(raw, i) == 1:
+                continue
+            text = chr(pdfium_c.FPDFText_GetUnicode(raw, i))
+            if text in "\r\n":
+                continue
+            size = pdfium_c.FPDFText_GetFontSize(raw, i)
+            x0, _, x1, _ = textpage.get_charbox(i, loose=True)
+            pdfium_c.FPDFText_GetCharOrigin(raw, i, ctypes.byref(origin_x), ctypes.byref(origin_y))
+            fontname, descent = self._font(fonts, i)
+            # Same vertical extent as pdfminer: from the descender up by the font size
+            y0 = origin_y.value + descent * size
+            y1 = y0 + size
+            top = float(self.height) - y1
+            chars.append({
+                "fontname": fontname,
+                "adv": x1 - x0,
+                "upright": abs(pdfium_c.FPDFText_GetCharAngle(raw, i)) < 1e-6,
+                "x0": x0,
+                "y0": y0,
+                "x1": x1,
+                "y1": y1,
+                "width": x1 - x0,
+                "height": size,
+                "size": size,
+                "object_type": "char",
+                "page_number": self.page_number,
+                "text": text,
+                "top": top,
+                "bottom": top + size,
+                "doctop": self.initial_doctop + top,
+            })
+        return chars
+
+    def _font(self, fonts: Dict, i: int):
+        font = pdfium_c.FPDFTextObj_GetFont(pdfium_c.FPDFText_GetTextObject(self.textpage.raw, i))
+        key = ctypes.cast(font, ctypes.c_void_p).value
+        if key not in fonts:
+            name = ""
+            length = pdfium_c.FPDFFont_GetBaseFontName(font, None, 0)
+            if length:
+                buffer = ctypes.create_string_buffer(length)
+                pdfium_c.FPDFFont_GetBaseFontName(font, buffer, length)
+                name = buffer.value.decode("utf-8", "replace")
+            descent = ctypes.c_float()
+            if not pdfium_c.FPDFFont_GetDescent(font, ctypes.c_float(1.0), ctypes.byref(descent)):
+                descent.value = 0.0
+            fonts[key] = (name, descent.value)
+        return fonts[key]
+
+    @property
+    def images(self) -> List[Dict]:
+        """Image objects as pdfplumber-style dicts with x0, top, x1 and bottom."""
+        images = []
+        for obj in self._page.get_objects(filter=[pdfium_c.FPDF_PAGEOBJ_IMAGE], max_depth=2):
+            left, bottom, right, top = obj.get_bounds()
+            images.append({"x0": left, "top": float(self.height) - top, "x1": right,
+                           "bottom": float(self.height) - bottom, "object_type": "image"})
+        return images
+
+    def crop(self, bbox) -> "_PdfiumCrop":
+        """A region (x0, top, x1, bottom) that renders without rasterising the rest of the page."""
+        return _PdfiumCrop(self, bbox)
+
+    def signals(self) -> Dict:
+        """
+        Cheap signals read without building a layout: char count, share of
+        the page covered by images and whether any text objects (and so
+        fonts) are present.
+        """
+        area = float(self.width) * float(self.height)
+        covered = 0.0
+        has_fonts = False
+        kinds = [pdfium_c.FPDF_PAGEOBJ_IMAGE, pdfium_c.FPDF_PAGEOBJ_TEXT]
+        for obj in self._page.get_objects(filter=kinds, max_depth=2):
+            if obj.type == pdfium_c.FPDF_PAGEOBJ_TEXT:
+                has_fonts = True
+                continue
+            left, bottom, right, top = obj.get_bounds()
+            covered += (max(0.0, min(right, self.width) - max(left, 0.0))
+                        * max(0.0, min(top, self.height) - max(bottom, 0.0)))
+        return {
+            "char_count": self.textpage.count_chars() if has_fonts else 0,
+            "image_coverage": min(1.0, covered / area) if area else 0.0,
+            "has_fonts": has_fonts,
+        }
+
+    def to_image(self, resolution: int = 72) -> PageImage:
+        return PageImage(self._page.render(scale=resolution / 72).to_pil())
+
+    def close(self):
+        self._chars = None
+        if self._textpage is not None:
+            self._textpage.close()
+            self._textpage = None
+        self._page.close()
+
+class _PdfiumCrop:
+    def __init__(self, page: PdfiumPage, bbox):
+        self.page = page
+        self.bbox = bbox
+
+    def to_image(self, resolution: int = 72) -> PageImage:
+        x0, top, x1, bottom = self.bbox
+        width, height = float(self.page.width), float(self.page.height)
+        # pypdfium2 crops by the amount taken off each side, in PDF units
+        crop = (x0, height - bottom, width - x1, top)
+        return PageImage(self.page._page.render(scale=resolution / 72, crop=crop).to_pil())
+
+BACKENDS = {backend.name: backend for backend in (PdfplumberBackend(), PdfiumBackend())}
+
+def get_backend(name: str) -> PDFBackend:
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown PDF backend {name!r}, expected one of {sorted(BACKENDS)}")
@@ -0,0 +1,129 @@
+import json
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+PAGE_INDEX_FILENAME = "page_index.json"
+FOLIO_EDGE_LINES = 2  # Lines checked at the top and at the bottom of each page
+FOLIO_MAX_LINE = 40  # Longest header/footer line a folio is taken from ("12 Mathematics")
+FOLIO_MIN_RUN = 2  # Consecutive folios that must agree on an offset before it is trusted
+
+# A line that is only a page number, optionally decorated: "12", "- 12 -", "Page 12", "[12]"
+_BARE_FOLIO = re.compile(r"^(?:page[^\S\n]*)?[-–—|(\[]?[^\S\n]*(\d{1,4})[^\S\n]*[-–—|)\]]?$", re.IGNORECASE)
+# A running header or footer with the number at one end: "12 Mathematics", "Real Numbers 13"
+_EDGE_FOLIO = re.compile(r"^(\d{1,4})[^\S\n]+\D.*$|^.*\D[^\S\n]+(\d{1,4})$")
+# Headings that start with a number word, not folios
+_NOT_FOLIO = re.compile(r"^(?:chapter|unit|lesson|exercise|figure|fig\.|table|activity)\b", re.IGNORECASE)
+
+def detect_folio(text: str) -> Optional[int]:
+    """
+    The printed page number of a page from the first and last
+    FOLIO_EDGE_LINES lines of its text, or None. Lines holding only a number
+    win over numbers at either end of a short running header or footer.
+    """
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    if not lines:
+        return None
+    edges = lines[-FOLIO_EDGE_LINES:][::-1] + lines[:FOLIO_EDGE_LINES]
+    for line in edges:
+        match = _BARE_FOLIO.match(line)
+        if match:
+            return int(match.group(1))
+    for line in edges:
+        if len(line) > FOLIO_MAX_LINE or _NOT_FOLIO.match(line):
+            continue
+        match = _EDGE_FOLIO.match(line)
+        if match:
+            return int(match.group(1) or match.group(2))
+    return None
+
+class PageNumberIndex:
+    """
+    Maps printed page numbers (folios) to 1-based PDF pages and back.
+
+    `fit` turns per-page folios into piecewise-constant offsets
+    (pdf page - printed page): runs of at least FOLIO_MIN_RUN detected folios
+    that agree on an offset start a segment, which lasts until the next one,
+    so stray numbers (a "1" in a heading) are ignored and unnumbered pages
+    inherit the offset before them, unless that would repeat a number the
+    next segment prints. Lookups are O(1) either way.
+
+    Usage:
+        index = PageNumberIndex.fit([(p["page_num"], p["folio"]) for p in pages], len(pages))
+        pdf_page = index.to_pdf(12)
+    """
+    def __init__(self, segments: List[Dict], total_pages: int):
+        self.segments = segments
+        self.total_pages = total_pages
+        self._printed: List[Optional[int]] = [None] * (total_pages + 1)
+        self._pdf: Dict[int, int] = {}
+        for segment in segments:
+            for pdf_page in range(segment["first_pdf_page"], segment["last_pdf_page"] + 1):
+                printed = pdf_page - segment["offset"]
+                if printed >= 1:
+                    self._printed[pdf_page] = printed
+                    self._pdf.setdefault(printed, pdf_page)
+
+    @classmethod
+    def fit(cls, folios: Sequence[Tuple[int, Optional[int]]], total_pages: int) -> "PageNumberIndex":
+        """Builds the index from (pdf page, detected folio or None) pairs."""
+        runs: List[List[int]] = []  # [offset, first pdf page, count]
+        for pdf_page, folio in sorted(folios):
+            if folio is None:
+                continue
+            offset = pdf_page - folio
+            if runs and runs[-1][0] == offset:
+                runs[-1][2] += 1
+            else:
+                runs.append([offset, pdf_page, 1])
+        trusted = [run for run in runs if run[2] >= FOLIO_MIN_RUN]
+        segments = []
+        for offset, first, _ in trusted:
+            if segments and segments[-1]["offset"] == offset:
+                continue  # The same offset again after an outlier
+            segments.append({"first_pdf_page": first, "last_pdf_page": total_pages, "offset": offset})
+        for segment, following in zip(segments, segments[1:]):
+            # Unnumbered pages at the boundary stay unmapped rather than repeat the next segment's numbers
+            next_printed = following["first_pdf_page"] - following["offset"]
+            segment["last_pdf_page"] = min(following["first_pdf_page"] - 1, next_printed - 1 + segment["offset"])
+        index = cls(segments, total_pages)
+        logger.info(f"Page index: {len(segments)} offset segments from "
+                    f"{sum(1 for _, folio in folios if folio is not None)} detected folios")
+        return index
+
+    def __len__(self) -> int:
+        """Offset segments in the index; an index without any maps no page."""
+        return len(self.segments)
+
+    def to_pdf(self, printed: int) -> Optional[int]:
+        """The PDF page printed with `printed`, or None if it is outside the index."""
+        return self._pdf.get(printed)
+
+    def to_printed(self, pdf_page: int) -> Optional[int]:
+        """The number printed on a PDF page, or None (front matter, unnumbered pages before any folio)."""
+        if 1 <= pdf_page <= self.total_pages:
+            return self._printed[pdf_page]
+        return None
+
+    def to_dict(self) -> Dict:
+        return {"total_pages": self.total_pages, "segments": self.segments}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "PageNumberIndex":
+        return cls(data["segments"], data["total_pages"])
+
+    def save(self, path: Path):
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+        os.replace(tmp_path, path)
+        logger.info(f"Saved {path}")
+
+    @classmethod
+    def load(cls, path: Path) -> "PageNumberIndex":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,240 @@
+import array
+import json
+import logging
+import mmap
+import os
+import struct
+import sys
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+LAYOUT_FILENAME = "layout.bin"
+NUMERIC_FIELDS = ("x0", "x1", "top", "bottom", "doctop", "size")  # Stored as float64 columns
+CHAR_FIELDS = NUMERIC_FIELDS + ("text", "fontname", "upright")  # Every field a layout char keeps
+
+_MAGIC = b"TBLAYOUT"
+_VERSION = 1
+_HEADER = struct.Struct("<8sHH4x")  # magic, version, little-endian flag
+_TRAILER = struct.Struct("<QQII8s")  # index offset, tables offset, page count, tables length, magic
+_INDEX_ENTRY = struct.Struct("<iIQ")  # page_num, char count, block offset
+
+def layout_char(char: Dict) -> Dict[str, Any]:
+    """
+    A backend char dict reduced to CHAR_FIELDS, with the defaults the store
+    uses for missing fields, so fresh and stored layouts hold the same data.
+    """
+    record = {field: float(char.get(field, 0.0)) for field in NUMERIC_FIELDS}
+    record["text"] = char.get("text", "")
+    record["fontname"] = char.get("fontname", "")
+    record["upright"] = bool(char.get("upright", True))
+    return record
+
+def _block_size(count: int) -> int:
+    """Bytes used by one page's columns, padded so the next block stays 8-byte aligned."""
+    size = count * (8 * len(NUMERIC_FIELDS) + 4 + 4 + 1)
+    return size + (-size % 8)
+
+class LayoutWriter:
+    """
+    Writes per-page character layout in a columnar binary format.
+
+    Each page is one block: a float64 column per NUMERIC_FIELDS entry, then
+    uint32 ids into interned text and font name tables, then a uint8
+    `upright` column. A trailer holds the page index and the tables, so pages
+    can be appended as they are parsed without buffering the whole book.
+    Output goes to a temporary file that replaces `path` only if the block
+    exits cleanly.
+
+    Usage:
+        with LayoutWriter(output_dir / LAYOUT_FILENAME) as writer:
+            writer.write(page_num, page.chars)
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self._file = None
+        self._index: List[tuple] = []
+        self._tables: Dict[str, Dict[str, int]] = {"text": {}, "fontname": {}}
+
+    def __enter__(self) -> "LayoutWriter":
+        self._file = open(self.tmp_path, "wb")
+        self._file.write(_HEADER.pack(_MAGIC, _VERSION, sys.byteorder == "little"))
+        return self
+
+    def write(self, page_num: int, chars: List[Dict]):
+        """Appends one page. `chars` are pdfplumber char dicts (or their serialized copies)."""
+        offset = self._file.tell()
+        columns = [array.array("d", (float(c.get(field, 0.0)) for c in chars)) for field in NUMERIC_FIELDS]
+        columns.append(array.array("I", (self._intern("text", c.get("text", "")) for c in chars)))
+        columns.append(array.array("I", (self._intern("fontname", c.get("fontname", "")) for c in chars)))
+        columns.append(array.array("B", (bool(c.get("upright", True)) for c in chars)))
+        for column in columns:
+            column.tofile(self._file)
+        self._file.write(b"\0" * (_block_size(len(chars)) - self._file.tell() + offset))
+        self._index.append((page_num, len(chars), offset))
+
+    def _intern(self, table: str, value: str) -> int:
+        ids = self._tables[table]
+        if value not in ids:
+            ids[value] = len(ids)
+        return ids[value]
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            index_offset = self._file.tell()
+            for entry in self._index:
+                self._file.write(_INDEX_ENTRY.pack(*entry))
+            tables_offset = self._file.tell()
+            tables = json.dumps({name: list(ids) for name, ids in self._tables.items()}, ensure_ascii=False)
+            tables = tables.encode("utf-8")
+            self._file.write(tables)
+            self._file.write(_TRAILER.pack(index_offset, tables_offset, len(self._index), len(tables), _MAGIC))
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+            logger.info(f"Saved {self.path}")
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+class StoredPage(Mapping):
+    """
+    One page read from a LayoutStore, as a read-only {"page_num", "chars"}
+    mapping like a layout.json entry. It holds the page's columns (see
+    LayoutStore.columns), which stay valid after the store is closed; the
+    char dicts are only built when "chars" is read.
+    """
+    def __init__(self, page_num: int, columns: Dict[str, array.array], texts: List[str], fontnames: List[str]):
+        self.page_num = page_num
+        self.columns = columns
+        self.texts = texts
+        self.fontnames = fontnames
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "page_num":
+            return self.page_num
+        if key == "chars":
+            return self.chars()
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(("page_num", "chars"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def chars(self) -> List[Dict[str, Any]]:
+        columns = self.columns
+        numeric = [columns[f] for f in NUMERIC_FIELDS]
+        chars = []
+        for j, (text_id, font_id, upright) in enumerate(zip(columns["text_id"], columns["font_id"], columns["upright"])):
+            char = {field: column[j] for field, column in zip(NUMERIC_FIELDS, numeric)}
+            char["text"] = self.texts[text_id]
+            char["fontname"] = self.fontnames[font_id]
+            char["upright"] = bool(upright)
+            chars.append(char)
+        return chars
+
+class LayoutStore:
+    """
+    Read side of the columnar layout format, memory-mapped.
+
+    Opening a store only reads the page index and the interned tables; a
+    page's columns are copied out of the map when that page is requested.
+    Iterating yields StoredPage mappings, which read like layout.json
+    entries, so it can be handed to HeadingExtractor in place of the JSON
+    list. Chars keep CHAR_FIELDS only.
+
+    Usage:
+        with LayoutStore(parsed_dir / LAYOUT_FILENAME) as layout:
+            chars = layout.page(3)["chars"]
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # Empty file
+            self._file.close()
+            raise ValueError(f"{path} is not a layout store")
+        try:
+            self._read_directory()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_directory(self):
+        magic, version, little_endian = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or len(self._map) < _HEADER.size + _TRAILER.size:
+            raise ValueError(f"{self.path} is not a layout store")
+        if version != _VERSION:
+            raise ValueError(f"{self.path} has layout store version {version}, expected {_VERSION}")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError(f"{self.path} was written on a machine with a different byte order")
+        index_offset, tables_offset, page_count, tables_length, magic = _TRAILER.unpack_from(
+            self._map, len(self._map) - _TRAILER.size)
+        if magic != _MAGIC:
+            raise ValueError(f"{self.path} is truncated")
+        self._index = [_INDEX_ENTRY.unpack_from(self._map, index_offset + i * _INDEX_ENTRY.size)
+                       for i in range(page_count)]
+        tables = json.loads(self._map[tables_offset:tables_offset + tables_length].decode("utf-8"))
+        self.texts: List[str] = tables["text"]
+        self.fontnames: List[str] = tables["fontname"]
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def page_nums(self) -> List[int]:
+        return [page_num for page_num, _, _ in self._index]
+
+    def columns(self, i: int) -> Dict[str, array.array]:
+        """
+        Raw columns for the i-th stored page: one array per NUMERIC_FIELDS
+        entry plus `text_id`, `font_id` (indexes into `texts`/`fontnames`)
+        and `upright`.
+        """
+        _, count, offset = self._index[i]
+        result = {}
+        for name, typecode in [(f, "d") for f in NUMERIC_FIELDS] + [("text_id", "I"), ("font_id", "I"), ("upright", "B")]:
+            column = array.array(typecode)
+            end = offset + count * column.itemsize
+            column.frombytes(self._map[offset:end])
+            result[name] = column
+            offset = end
+        return result
+
+    def page(self, i: int) -> Dict[str, Any]:
+        """The i-th stored page as {"page_num", "chars"} with one dict per char."""
+        return dict(self.stored_page(i))
+
+    def stored_page(self, i: int) -> StoredPage:
+        """The i-th stored page with its columns read but no char dicts built yet."""
+        return StoredPage(self._index[i][0], self.columns(i), self.texts, self.fontnames)
+
+    def __iter__(self) -> Iterator[StoredPage]:
+        for i in range(len(self)):
+            yield self.stored_page(i)
+
+    def to_json(self, path: Path):
+        """Writes the layout as indented JSON, for debugging."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([self.page(i) for i in range(len(self))], f, indent=2, ensure_ascii=False)
+        logger.info(f"Saved {path}")
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "LayoutStore":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+if __name__ == "__main__":
+    # Debug export: python -m src.parser.layout_store data/parsed/<book>/layout.bin layout.json
+    logging.basicConfig(level=logging.INFO)
+    with LayoutStore(Path(sys.argv[1])) as store:
+        store.to_json(Path(sys.argv[2]))
@@ -1,32 +1,37 @@
 import logging
+import os
+import tempfile
+import threading
+from functools import lru_cache
 import pytesseract
+from concurrent.futures import Future, ProcessPoolExecutor
 from PIL import Image
-from typing import Tuple, Dict
+from typing import Tuple, Dict, List
 
 logger = logging.getLogger(__name__)
 
 def extract_text_from_image(image: Image.Image, lang: str = 'eng') -> Tuple[str, Dict]:
     """
     Extracts text from a PIL Image using Tesseract OCR.
-    
+
+    Runs Tesseract once (`image_to_data`) and rebuilds the plain text from the
+    word boxes, instead of a second `image_to_string` pass over the same image.
+
     Args:
         image: PIL Image object.
         lang: Language code (default 'eng').
-        
+
     Returns:
         Tuple containing:
         - Extracted text string.
         - Dictionary with detailed data (conf, left, top, width, height, text).
     """
     try:
-        # Get raw text
-        text = pytesseract.image_to_string(image, lang=lang)
-        
         # Get detailed data (bounding boxes, confidence)
         data = pytesseract.image_to_data(image, lang=lang, output_type=pytesseract.Output.DICT)
-        
-        return text, data
-        
+
+        return text_from_data(data), data
+
     except pytesseract.TesseractNotFoundError:
         logger.error("Tesseract not found. Please install Tesseract OCR.")
         return "", {}
@@ -34,6 +39,108 @@ def extract_text_from_image(image: Image.Image, lang: str = 'eng') -> Tuple[str,
         logger.error(f"OCR failed: {e}")
         return "", {}
 
+def extract_text_from_images(images: List[Image.Image], lang: str = 'eng') -> List[Tuple[str, Dict]]:
+    """
+    OCRs several images with a single Tesseract process.
+
+    The images are written to a temporary directory and Tesseract reads them
+    through a list file, so its startup and model loading are paid once per
+    batch instead of once per image. The combined `image_to_data` output is
+    split back into one (text, data) pair per image, in order, matching what
+    `extract_text_from_image` returns for each. If the batch fails for any
+    reason other than Tesseract being missing, the images are OCR'd one by one.
+    """
+    if not images:
+        return []
+    try:
+        with tempfile.TemporaryDirectory(prefix="tess_batch_") as tmp:
+            paths = []
+            for i, image in enumerate(images):
+                path = os.path.join(tmp, f"page_{i:05d}.png")
+                if "A" in image.getbands():
+                    # Same as pytesseract: flatten transparency onto white
+                    background = Image.new("RGB", image.size, "white")
+                    background.paste(image, mask=image.getchannel("A"))
+                    image = background
+                image.save(path, format="PNG")
+                paths.append(path)
+            list_file = os.path.join(tmp, "pages.txt")
+            with open(list_file, "w", encoding="utf-8") as f:
+                f.write("\n".join(paths) + "\n")
+            data = pytesseract.image_to_data(list_file, lang=lang, output_type=pytesseract.Output.DICT)
+        return [(text_from_data(page_data), page_data) for page_data in split_data_by_page(data, len(images))]
+
+    except pytesseract.TesseractNotFoundError:
+        logger.error("Tesseract not found. Please install Tesseract OCR.")
+        return [("", {})] * len(images)
+    except Exception as e:
+        logger.warning(f"Batch OCR of {len(images)} images failed, falling back to one call per image: {e}")
+        return [extract_text_from_image(image, lang) for image in images]
+
+def split_data_by_page(data: Dict, pages: int) -> List[Dict]:
+    """
+    Splits multi-page `image_to_data` output into one dict per page (Tesseract
+    numbers pages from 1 in input order). Each keeps every column, with
+    `page_num` reset to 1 as if the page had been OCR'd on its own.
+    """
+    rows: List[List[int]] = [[] for _ in range(pages)]
+    for i, page_num in enumerate(data.get('page_num', [])):
+        if 1 <= int(page_num) <= pages:
+            rows[int(page_num) - 1].append(i)
+    split = []
+    for indexes in rows:
+        page_data = {key: [values[i] for i in indexes] for key, values in data.items()}
+        if 'page_num' in page_data:
+            page_data['page_num'] = [1] * len(indexes)
+        split.append(page_data)
+    return split
+
+def text_from_data(data: Dict) -> str:
+    """
+    Rebuilds plain text from Tesseract's `image_to_data` output.
+    Words keep their reading order; lines are joined with newlines and
+    paragraphs/blocks are separated by a blank line, like `image_to_string`.
+    """
+    paragraphs: List[List[str]] = []
+    current_para = None
+    current_line = None
+    for i, word in enumerate(data.get('text', [])):
+        if data['level'][i] != 5 or not str(word).strip():
+            continue
+        para_key = (data['page_num'][i], data['block_num'][i], data['par_num'][i])
+        line_key = para_key + (data['line_num'][i],)
+        if para_key != current_para:
+            paragraphs.append([])
+            current_para = para_key
+            current_line = None
+        if line_key != current_line:
+            paragraphs[-1].append(str(word))
+            current_line = line_key
+        else:
+            paragraphs[-1][-1] += " " + str(word)
+    return "\n\n".join("\n".join(lines) for lines in paragraphs)
+
+def ocr_words(data: Dict) -> List[Dict]:
+    """
+    Recognised words from `image_to_data` output with their pixel boxes:
+    text, left, top, width, height, conf and `line`, a key shared by words
+    on the same line.
+    """
+    words = []
+    for i, word in enumerate(data.get('text', [])):
+        if data['level'][i] != 5 or not str(word).strip():
+            continue
+        words.append({
+            "text": str(word),
+            "left": int(data['left'][i]),
+            "top": int(data['top'][i]),
+            "width": int(data['width'][i]),
+            "height": int(data['height'][i]),
+            "conf": float(data['conf'][i]),
+            "line": (data['page_num'][i], data['block_num'][i], data['par_num'][i], data['line_num'][i]),
+        })
+    return words
+
 def is_tesseract_available() -> bool:
     """Checks if Tesseract is available."""
     try:
@@ -41,3 +148,99 @@ def is_tesseract_available() -> bool:
         return True
     except pytesseract.TesseractNotFoundError:
         return False
+
+@lru_cache(maxsize=1)
+def tesseract_version() -> str:
+    """Installed Tesseract version, part of OCR cache keys so upgrades invalidate them."""
+    try:
+        return str(pytesseract.get_tesseract_version())
+    except pytesseract.TesseractNotFoundError:
+        return "unavailable"
+
+class OCRPool:
+    """
+    Runs OCR in a bounded pool of worker processes.
+
+    `submit` returns a Future so the caller can keep extracting text from later
+    pages while earlier ones are recognised. At most `max_pending` images are
+    queued at once; beyond that `submit` blocks, which keeps rendered page
+    images from piling up in memory.
+    """
+    def __init__(self, workers: int, max_pending: int = 0, lang: str = 'eng'):
+        self.lang = lang
+        self._executor = ProcessPoolExecutor(max_workers=workers)
+        self._slots = threading.BoundedSemaphore(max_pending or workers * 2)
+
+    def submit(self, image: Image.Image) -> Future:
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(extract_text_from_image, image, self.lang)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> "OCRPool":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class OCRBatcher:
+    """
+    Collects rendered pages and OCRs them `batch_size` at a time with
+    `extract_text_from_images`, i.e. one Tesseract process per batch.
+
+    Has the same `submit` interface as OCRPool. A batch runs in the calling
+    thread when it is full, or as soon as the result of any queued image is
+    requested, so a caller waiting on a page never waits on pages that have
+    not been submitted yet.
+    """
+    def __init__(self, batch_size: int, lang: str = 'eng'):
+        self.batch_size = batch_size
+        self.lang = lang
+        self.batches = 0
+        self.images = 0
+        self._queue: List[Tuple[Image.Image, Future]] = []
+
+    def submit(self, image: Image.Image) -> Future:
+        future = _BatchFuture(self)
+        self._queue.append((image, future))
+        if len(self._queue) >= self.batch_size:
+            self.flush()
+        return future
+
+    def flush(self):
+        """OCRs every queued image now."""
+        queue, self._queue = self._queue, []
+        if not queue:
+            return
+        results = extract_text_from_images([image for image, _ in queue], self.lang)
+        self.batches += 1
+        self.images += len(queue)
+        for (_, future), result in zip(queue, results):
+            future.set_result(result)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self) -> "OCRBatcher":
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class _BatchFuture(Future):
+    """A Future that runs its batcher's pending batch when its result is needed."""
+    def __init__(self, batcher: OCRBatcher):
+        super().__init__()
+        self._batcher = batcher
+
+    def result(self, timeout=None):
+        if not self.done():
+            self._batcher.flush()
+        return super().result(timeout)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+from ..scraper.config import OCR_CACHE_PATH, OCR_CACHE_MAX_BYTES, OCR_CACHE_LOW_WATER
+
+logger = logging.getLogger(__name__)
+
+_shared_cache = None
+_cache_lock = threading.Lock()
+
+class OCRCache:
+    """
+    On-disk cache of OCR results, keyed by page content and OCR settings.
+
+    Entries hold the text, average confidence and Tesseract word boxes for one
+    rendered page. The store is a SQLite file capped at `max_bytes`; once it
+    grows past that, the least recently used entries are evicted in one batch
+    down to `low_water` of the cap. Hit/miss counters are kept per instance
+    so a run can report its hit rate; `add_counts` folds in the counters of
+    instances opened by worker processes.
+    """
+    def __init__(self, path: Path = OCR_CACHE_PATH, max_bytes: int = OCR_CACHE_MAX_BYTES,
+                 low_water: float = OCR_CACHE_LOW_WATER):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.low_water = low_water
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(path), timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr ("
+            " key TEXT PRIMARY KEY, payload BLOB NOT NULL, confidence REAL,"
+            " size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ocr_last_access ON ocr (last_access)")
+        self._conn.commit()
+        # Running estimate of the stored bytes, so `put` does not sum the table each time.
+        # Other processes may write too; it is recounted before evicting.
+        self._bytes = self._total_bytes()
+
+    @staticmethod
+    def make_key(pdf_checksum: str, page_index: int, dpi: int, lang: str, tesseract_version: str,
+                 region: Optional[Tuple[float, float, float, float]] = None) -> str:
+        """Cache key for a whole page, or for one `region` (x0, top, x1, bottom in points) of it."""
+        raw = f"{pdf_checksum}:{page_index}:{dpi}:{lang}:{tesseract_version}"
+        if region is not None:
+            raw += ":" + ",".join(f"{v:.2f}" for v in region)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Tuple[str, Dict]]:
+        """Returns (text, ocr_data) for a key, or None on a miss."""
+        with self._lock:
+            row = self._conn.execute("SELECT payload FROM ocr WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._conn.execute("UPDATE ocr SET last_access = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+        entry = json.loads(zlib.decompress(row[0]))
+        return entry["text"], entry["data"]
+
+    def put(self, key: str, text: str, data: Dict, confidence: float = 0.0):
+        """Stores a result and evicts least recently used entries beyond the size cap."""
+        payload = zlib.compress(json.dumps({"text": text, "data": data}, ensure_ascii=False).encode("utf-8"))
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM ocr WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO ocr (key, payload, confidence, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, confidence, len(payload), time.time()),
+            )
+            self._bytes += len(payload) - (replaced[0] if replaced else 0)
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _total_bytes(self) -> int:
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM ocr").fetchone()[0]
+
+    def _evict(self):
+        self._bytes = self._total_bytes()
+        if self._bytes <= self.max_bytes:
+            return
+        target = self.max_bytes * self.low_water
+        doomed = []
+        # Oldest first through the last_access index, stopping as soon as enough is freed
+        for key, size in self._conn.execute("SELECT key, size FROM ocr ORDER BY last_access"):
+            if self._bytes <= target:
+                break
+            doomed.append((key,))
+            self._bytes -= size
+        self._conn.executemany("DELETE FROM ocr WHERE key = ?", doomed)
+        logger.info(f"OCR cache evicted {len(doomed)} entries to stay under {self.max_bytes} bytes")
+
+    def add_counts(self, hits: int, misses: int):
+        """Adds lookups made through another instance (e.g. in a worker process) to this one's counters."""
+        with self._lock:
+            self.hits += hits
+            self.misses += misses
+
+    def stats(self) -> Dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM ocr").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+def get_ocr_cache() -> OCRCache:
+    """Returns the process-wide OCR cache under data/cache."""
+    global _shared_cache
+    with _cache_lock:
+        if _shared_cache is None:
+            _shared_cache = OCRCache()
+        return _shared_cache
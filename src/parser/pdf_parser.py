@@ -1,110 +1,798 @@
-import pdfplumber
 import logging
 import json
+import hashlib
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import islice
 from pathlib import Path
-from typing import Dict, List, Any
-from .ocr import extract_text_from_image, is_tesseract_available
+from typing import Dict, Iterator, List, Any, BinaryIO, Optional, Tuple
+from .ocr import extract_text_from_image, is_tesseract_available, ocr_words, tesseract_version, OCRBatcher, OCRPool
+from .ocr_cache import OCRCache, get_ocr_cache
+from .backends import get_backend
+from .triage import PageTriage, TRIAGE_MIXED_COVERAGE, new_triage_stats, triage_time_saved
+from .layout_store import LayoutStore, LayoutWriter, LAYOUT_FILENAME, layout_char
+from .folios import PageNumberIndex, PAGE_INDEX_FILENAME, detect_folio
 from ..scraper.config import PARSED_DIR
+from ..scraper.fetch_pdfs import calculate_checksum
 
 logger = logging.getLogger(__name__)
 
+PARSER_VERSION = "5"  # Bump whenever a change alters pages.json or the layout store
+PARSE_MANIFEST = "parse_manifest.json"
 SCANNED_TEXT_THRESHOLD = 50  # Characters per page to consider it "text-based"
+PARSE_WORKERS = 1  # Processes used by parse(); 1 keeps everything in-process
+PARSE_CHUNK_SIZE = 16  # Pages handed to a worker at a time
+OCR_WORKERS = 0  # Processes in the serial parser's OCR pool; 0 runs OCR inline
+OCR_BATCH_SIZE = 0  # Scanned pages per Tesseract process in the serial parser without a pool; 0 = one per page
+OCR_DPI = 300  # Render resolution for scanned pages (the ceiling in adaptive mode)
+OCR_ADAPTIVE_DPIS = (150, 300)  # Resolutions tried in order by adaptive OCR
+OCR_MIN_CONFIDENCE = 75.0  # Average word confidence below which adaptive OCR re-renders
+OCR_MIN_WORD_DENSITY = 1.0  # Recognised words per square inch below which adaptive OCR re-renders
+OCR_LANG = 'eng'
+REGION_OCR_MIN_AREA = 72 * 72  # Square points; smaller images are treated as icons or rules
+REGION_OCR_MAX_CHARS = 3  # Text-layer chars an image may overlap and still count as having no text
+PARSE_BACKEND = "pdfplumber"  # See backends.BACKENDS; "pdfium" is much faster on text PDFs
 
 class PDFParser:
-    def __init__(self, pdf_path: Path, book_id: str):
+    def __init__(self, pdf_path: Path, book_id: str, stream: Optional[BinaryIO] = None,
+                 workers: int = PARSE_WORKERS, chunk_size: int = PARSE_CHUNK_SIZE,
+                 ocr_workers: int = OCR_WORKERS, use_ocr_cache: bool = True,
+                 adaptive_ocr: bool = False, layout_json: bool = False, use_parse_cache: bool = True,
+                 backend: str = PARSE_BACKEND, region_ocr: bool = False,
+                 ocr_batch_size: int = OCR_BATCH_SIZE):
+        """
+        Args:
+            pdf_path: Path of the PDF (used for logging when `stream` is given).
+            book_id: Output folder name under PARSED_DIR.
+            stream: Optional seekable file object to read the PDF from instead
+                of `pdf_path`, e.g. a member of a book ZIP.
+            workers: Worker processes for page-parallel parsing (1 = serial).
+            chunk_size: Consecutive pages parsed per worker task.
+            ocr_workers: Size of the OCR process pool used by the serial path,
+                so text extraction continues while scanned pages are recognised.
+            use_ocr_cache: Reuse OCR results from the on-disk cache for pages
+                of an unchanged PDF rendered with the same settings.
+            adaptive_ocr: OCR scanned pages at a low DPI first and re-render
+                at a higher one only if confidence or word density is poor.
+            layout_json: Also write the char dicts to layout.json for
+                debugging, next to the columnar layout.bin.
+            use_parse_cache: Load the previous output instead of re-parsing
+                when its manifest matches this PDF, PARSER_VERSION and options.
+            backend: Name of the PDF backend used to read text and chars.
+            region_ocr: On pages with a text layer, OCR only the image regions
+                that carry no text (figures, scanned diagrams) and merge the
+                words into the page text and layout by position.
+            ocr_batch_size: When parsing serially without an OCR pool, OCR up
+                to this many scanned pages per Tesseract process instead of
+                starting one per page (see OCRBatcher).
+        """
         self.pdf_path = pdf_path
+        self.stream = stream
         self.book_id = book_id
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.ocr_workers = ocr_workers
+        self.use_ocr_cache = use_ocr_cache
+        self.adaptive_ocr = adaptive_ocr
+        self.layout_json = layout_json
+        self.use_parse_cache = use_parse_cache
+        self.backend = get_backend(backend)
+        self.region_ocr = region_ocr
+        self.ocr_batch_size = ocr_batch_size
         self.output_dir = PARSED_DIR / book_id
         self.output_dir.mkdir(parents=True, exist_ok=True)
         self.ocr_available = is_tesseract_available()
+        self.stats: Dict[str, Any] = {}
+        self.page_index: Optional[PageNumberIndex] = None
+        self._checksum: Optional[str] = None
 
     def parse(self) -> Dict[str, Any]:
         """
         Parses the PDF, extracting text and layout.
         Applies OCR if the page appears to be scanned.
         Saves results to JSON files.
+
+        Collects every page in memory; use `iter_pages` to stream instead.
         """
-        logger.info(f"Parsing PDF: {self.pdf_path}")
-        
-        pages_data = []
-        layout_data = []
-        
         try:
-            with pdfplumber.open(self.pdf_path) as pdf:
-                for i, page in enumerate(pdf.pages):
-                    page_num = i + 1
-                    logger.info(f"Processing page {page_num}")
-                    
-                    # Extract text and layout
-                    text = page.extract_text() or ""
-                    chars = page.chars
-                    
-                    is_scanned = len(text.strip()) < SCANNED_TEXT_THRESHOLD
-                    ocr_applied = False
-                    ocr_conf = 0.0
-                    
-                    if is_scanned and self.ocr_available:
-                        logger.info(f"Page {page_num} appears scanned. Applying OCR...")
-                        # Render page to image
-                        # resolution=300 is good for OCR
-                        im = page.to_image(resolution=300).original
-                        text, ocr_data = extract_text_from_image(im)
-                        ocr_applied = True
-                        # Calculate average confidence
-                        confs = [float(c) for c in ocr_data.get('conf', []) if c != '-1']
-                        ocr_conf = sum(confs) / len(confs) if confs else 0.0
-                    
-                    page_info = {
-                        "page_num": page_num,
-                        "text": text,
-                        "width": float(page.width),
-                        "height": float(page.height),
-                        "is_scanned": is_scanned,
-                        "ocr_applied": ocr_applied,
-                        "ocr_confidence": ocr_conf
-                    }
-                    
-                    pages_data.append(page_info)
-                    
-                    # Store detailed layout info (chars) separately to avoid massive JSONs if not needed
-                    # But requirements say "Store parsed pages... layout.json"
-                    # We'll store chars for layout analysis
-                    layout_data.append({
-                        "page_num": page_num,
-                        "chars": self._serialize_chars(chars)
-                    })
-            
-            # Save results
-            self._save_json(pages_data, "pages.json")
-            self._save_json(layout_data, "layout.json")
-            
+            pages_data = []
+            layout_data = []
+            for page_info, page_layout in self.iter_pages():
+                pages_data.append(page_info)
+                layout_data.append(page_layout)
             return {"pages": pages_data, "layout": layout_data}
-            
+
         except Exception as e:
             logger.error(f"Failed to parse PDF {self.pdf_path}: {e}")
             return {}
 
-    def _serialize_chars(self, chars: List[Dict]) -> List[Dict]:
-        """Helper to make chars JSON serializable (decimal to float)."""
-        serializable = []
-        for char in chars:
-            c = char.copy()
-            # Convert Decimals to float
-            for k, v in c.items():
-                if hasattr(v, 'real'): # Check if number
-                    c[k] = float(v)
-            # Remove object refs
-            c.pop('font', None)
-            c.pop('matrix', None)
-            serializable.append(c)
-        return serializable
-
-    def _save_json(self, data: Any, filename: str):
-        path = self.output_dir / filename
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
-        logger.info(f"Saved {path}")
-
-def parse_pdf_wrapper(pdf_path: Path, book_id: str):
-    parser = PDFParser(pdf_path, book_id)
+    def iter_pages(self, save: bool = True) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Parses the PDF one page at a time, yielding (page record, layout entry)
+        in page order. Layout chars hold the CHAR_FIELDS of the layout store,
+        whether they were just parsed or come from the cache.
+
+        Each page record gets its printed page number (`folio`, see
+        detect_folio), and once every page has been seen they are fitted into
+        `self.page_index` (a PageNumberIndex).
+
+        With `save`, pages.json and the columnar layout.bin (see LayoutStore)
+        are written as pages are yielded, plus layout.json if `layout_json`
+        is set. The page index is saved to page_index.json. The backend's cached objects are released after each page,
+        so memory stays flat however long the book is. The files only replace
+        earlier output once the generator has been exhausted, and a parse
+        manifest is written last. If that manifest still matches, the saved
+        output is yielded instead of opening the PDF.
+        """
+        if save and self.use_parse_cache and self._cached_manifest():
+            yield from self._iter_cached()
+            return
+
+        logger.info(f"Parsing PDF: {self.pdf_path}")
+        start = time.perf_counter()
+        ocr_stats = new_ocr_stats()
+        triage_stats = new_triage_stats()
+        count = 0
+        folios = []
+        manifest_path = self.output_dir / PARSE_MANIFEST
+        if save:
+            # Whatever happens below, the old manifest no longer describes the files.
+            manifest_path.unlink(missing_ok=True)
+
+        with ExitStack() as stack:
+            if save:
+                pages_out = stack.enter_context(_JSONArrayWriter(self.output_dir / "pages.json"))
+                layout_out = stack.enter_context(LayoutWriter(self.output_dir / LAYOUT_FILENAME))
+                if self.layout_json:
+                    layout_json_out = stack.enter_context(_JSONArrayWriter(self.output_dir / "layout.json"))
+            if self.workers > 1 and self.stream is None:
+                source = self._iter_parallel(ocr_stats, triage_stats)
+            else:
+                source = self._iter_serial(ocr_stats, triage_stats)
+            for page_info, page_layout in source:
+                page_info["folio"] = detect_folio(page_info["text"])
+                folios.append((page_info["page_num"], page_info["folio"]))
+                if save:
+                    pages_out.write(page_info)
+                    layout_out.write(page_layout["page_num"], page_layout["chars"])
+                    if self.layout_json:
+                        layout_json_out.write(page_layout)
+                count += 1
+                yield page_info, page_layout
+
+        self.page_index = PageNumberIndex.fit(folios, count)
+        if save:
+            self.page_index.save(self.output_dir / PAGE_INDEX_FILENAME)
+            self._write_manifest(count)
+        elapsed = time.perf_counter() - start
+        self.stats = {"pages": count, "workers": self.workers, "elapsed": elapsed}
+        logger.info(f"Parsed {count} pages in {elapsed:.2f}s with {self.workers} worker(s)")
+        if triage_stats["text"] + triage_stats["scanned"] + triage_stats["mixed"]:
+            self.stats["triage"] = triage_stats
+            logger.info(f"Triage: {triage_stats['text']} text, {triage_stats['scanned']} scanned, "
+                        f"{triage_stats['mixed']} mixed pages in {triage_stats['seconds']:.2f}s; "
+                        f"{triage_stats['skipped']} extractions skipped, ~{triage_time_saved(triage_stats):.2f}s saved")
+        if ocr_stats["pages"] or ocr_stats["regions"]:
+            self.stats["ocr"] = ocr_stats
+        if ocr_stats["pages"]:
+            logger.info(f"OCR: {ocr_stats['pages']} pages, {ocr_stats['escalated']} re-rendered, "
+                        f"pages per DPI {ocr_stats['by_dpi']}, ~{ocr_time_saved(ocr_stats):.1f}s saved")
+        if ocr_stats["regions"]:
+            logger.info(f"Region OCR: {ocr_stats['regions']} regions on {ocr_stats['region_pages']} pages, "
+                        f"{ocr_stats['region_megapixels']:.1f} of {ocr_stats['region_page_megapixels']:.1f} "
+                        f"full-page megapixels")
+        if self.ocr_available and self.use_ocr_cache:
+            self.stats["ocr_cache"] = get_ocr_cache().stats()
+            logger.info(f"OCR cache: {self.stats['ocr_cache']['hit_rate']:.0%} hit rate")
+
+    def _options(self) -> Dict[str, Any]:
+        """Settings that change the parsed output; part of the parse manifest."""
+        return {
+            "backend": self.backend.name,
+            "scanned_text_threshold": SCANNED_TEXT_THRESHOLD,
+            "mixed_image_coverage": TRIAGE_MIXED_COVERAGE,
+            "ocr": tesseract_version() if self.ocr_available else None,
+            "ocr_lang": OCR_LANG,
+            "ocr_dpi": OCR_DPI,
+            "adaptive_ocr": [list(OCR_ADAPTIVE_DPIS), OCR_MIN_CONFIDENCE, OCR_MIN_WORD_DENSITY]
+                            if self.adaptive_ocr else False,
+            "layout_json": self.layout_json,
+            "region_ocr": [REGION_OCR_MIN_AREA, REGION_OCR_MAX_CHARS] if self.region_ocr else False,
+        }
+
+    def _source_info(self, trusted: Optional[Dict] = None) -> Dict[str, Any]:
+        """
+        Size, mtime and SHA-256 of the source PDF. If `trusted` (a previous
+        manifest's source entry) has the same size and mtime, its checksum is
+        reused instead of re-hashing the file.
+        """
+        if self.stream is not None:
+            return {"sha256": self._source_checksum()}
+        stat = self.pdf_path.stat()
+        info = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        if trusted and all(trusted.get(k) == v for k, v in info.items()) and self._checksum is None:
+            self._checksum = trusted.get("sha256")
+        info["sha256"] = self._source_checksum()
+        return info
+
+    def _cached_manifest(self) -> Optional[Dict]:
+        """The parse manifest if the saved output is still valid for this PDF and these options."""
+        path = self.output_dir / PARSE_MANIFEST
+        if not path.exists():
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except json.JSONDecodeError:
+            logger.warning(f"Could not decode {path}, re-parsing.")
+            return None
+        outputs = ["pages.json", LAYOUT_FILENAME, PAGE_INDEX_FILENAME] + (["layout.json"] if self.layout_json else [])
+        if (manifest.get("parser_version") != PARSER_VERSION or manifest.get("options") != self._options()
+                or not all((self.output_dir / name).exists() for name in outputs)):
+            return None
+        try:
+            source = self._source_info(trusted=manifest.get("source"))
+        except OSError:
+            return None
+        if not source["sha256"] or source["sha256"] != manifest.get("source", {}).get("sha256"):
+            return None
+        return manifest
+
+    def _write_manifest(self, page_count: int):
+        try:
+            source = self._source_info()
+        except OSError as e:
+            logger.warning(f"Could not stat {self.pdf_path}, parse output will not be reused: {e}")
+            return
+        if not source["sha256"]:
+            return
+        manifest = {
+            "source": source,
+            "parser_version": PARSER_VERSION,
+            "options": self._options(),
+            "pages": page_count,
+            "parsed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        temp_path = self.output_dir / (PARSE_MANIFEST + ".tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2, ensure_ascii=False)
+        temp_path.replace(self.output_dir / PARSE_MANIFEST)
+
+    def _iter_cached(self) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Yields the saved output of an earlier parse of the same PDF. Layout
+        entries are StoredPage mappings: their chars are only turned into
+        dicts if a caller reads them.
+        """
+        logger.info(f"Using cached parse of {self.pdf_path} from {self.output_dir}")
+        start = time.perf_counter()
+        with open(self.output_dir / "pages.json", "r", encoding="utf-8") as f:
+            pages_data = json.load(f)
+        self.page_index = PageNumberIndex.load(self.output_dir / PAGE_INDEX_FILENAME)
+        with LayoutStore(self.output_dir / LAYOUT_FILENAME) as layout:
+            for page_info, page_layout in zip(pages_data, layout):
+                yield page_info, page_layout
+        self.stats = {"pages": len(pages_data), "workers": 0, "elapsed": time.perf_counter() - start,
+                      "cached": True}
+
+    def _page_ocr(self, pool=None) -> Optional["PageOCR"]:
+        """OCR settings for this run, or None if Tesseract is unavailable."""
+        if not self.ocr_available:
+            return None
+        return PageOCR(lang=OCR_LANG, pool=pool, cache=get_ocr_cache() if self.use_ocr_cache else None,
+                       checksum_fn=self._source_checksum, adaptive=self.adaptive_ocr, regions=self.region_ocr)
+
+    def _source_checksum(self) -> Optional[str]:
+        """SHA-256 of the PDF bytes, used to key cached OCR and parse results."""
+        if self._checksum is None:
+            self._checksum = self._hash_source()
+        return self._checksum
+
+    def _hash_source(self) -> Optional[str]:
+        try:
+            if self.stream is None:
+                return calculate_checksum(self.pdf_path)
+            sha256_hash = hashlib.sha256()
+            position = self.stream.tell()
+            self.stream.seek(0)
+            for byte_block in iter(lambda: self.stream.read(65536), b""):
+                sha256_hash.update(byte_block)
+            self.stream.seek(position)
+            return sha256_hash.hexdigest()
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not checksum {self.pdf_path}, OCR results will not be cached: {e}")
+            return None
+
+    def _iter_serial(self, ocr_stats: Dict, triage_stats: Dict) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Parses pages in this process. With an OCR pool, up to twice its size in
+        pages are held back while their OCR runs, then released in order. With
+        batched OCR, pages are held back until a batch's worth is queued.
+        """
+        ocr_pool = None
+        lookahead = 0
+        if self.ocr_available and self.ocr_workers:
+            ocr_pool = OCRPool(self.ocr_workers, lang=OCR_LANG)
+            lookahead = self.ocr_workers * 2
+        elif self.ocr_available and self.ocr_batch_size > 1:
+            ocr_pool = OCRBatcher(self.ocr_batch_size, lang=OCR_LANG)
+            lookahead = self.ocr_batch_size
+        ocr = self._page_ocr(ocr_pool)
+        triage = PageTriage(self.stream or self.pdf_path, SCANNED_TEXT_THRESHOLD)
+        held = deque()
+        try:
+            with self.backend.open(self.stream or self.pdf_path) as pdf:
+                for i, page in enumerate(pdf.pages):
+                    page_info, page_layout, ocr_pending = _parse_page(page, i + 1, ocr, triage)
+                    held.append((page, page_info, page_layout, ocr_pending))
+                    while held and (held[0][3] is None or len(held) > lookahead):
+                        yield _release_page(ocr, *held.popleft())
+                # The PDF must stay open until then: adaptive OCR may re-render a page.
+                while held:
+                    yield _release_page(ocr, *held.popleft())
+        finally:
+            triage.close()
+            merge_stats(triage_stats, triage.stats)
+            if ocr_pool:
+                ocr_pool.close()
+                if isinstance(ocr_pool, OCRBatcher) and ocr_pool.batches:
+                    logger.info(f"Batched OCR: {ocr_pool.images} pages in {ocr_pool.batches} Tesseract runs")
+            if ocr:
+                merge_stats(ocr_stats, ocr.stats)
+
+    def _iter_parallel(self, ocr_stats: Dict, triage_stats: Dict) -> Iterator[Tuple[Dict, Dict]]:
+        """
+        Splits the page range into chunks parsed by separate processes.
+        Each worker opens the PDF itself; results come back in page order.
+        Only twice as many chunks as workers are in flight at once.
+        """
+        with self.backend.open(self.pdf_path) as pdf:
+            page_count = len(pdf.pages)
+        ocr = self._page_ocr()
+        ocr_settings = ocr.settings() if ocr else None
+        chunks = iter([(str(self.pdf_path), start, min(start + self.chunk_size, page_count), ocr_settings,
+                        self.backend.name)
+                       for start in range(0, page_count, self.chunk_size)])
+
+        workers = max(1, min(self.workers, -(-page_count // self.chunk_size)))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = deque(pool.submit(_parse_page_range, *chunk) for chunk in islice(chunks, workers * 2))
+            while in_flight:
+                chunk_pages, chunk_ocr_stats, chunk_triage_stats, cache_counts = in_flight.popleft().result()
+                for chunk in islice(chunks, 1):
+                    in_flight.append(pool.submit(_parse_page_range, *chunk))
+                merge_stats(ocr_stats, chunk_ocr_stats)
+                merge_stats(triage_stats, chunk_triage_stats)
+                if ocr and ocr.cache:
+                    ocr.cache.add_counts(cache_counts["hits"], cache_counts["misses"])
+                for page_info, page_layout, _ in chunk_pages:
+                    yield page_info, page_layout
+
+class _JSONArrayWriter:
+    """
+    Writes a JSON array one element at a time, formatted exactly like
+    `json.dump(items, f, indent=2)`. Output goes to a temporary file that
+    replaces `path` only if the block exits cleanly.
+    """
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self._file = None
+        self._count = 0
+
+    def __enter__(self) -> "_JSONArrayWriter":
+        self._file = open(self.tmp_path, "w", encoding="utf-8")
+        self._file.write("[")
+        return self
+
+    def write(self, item: Any):
+        text = json.dumps(item, indent=2, ensure_ascii=False)
+        self._file.write(",\n  " if self._count else "\n  ")
+        self._file.write(text.replace("\n", "\n  "))
+        self._count += 1
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self._file.write("\n]" if self._count else "]")
+        self._file.close()
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+            logger.info(f"Saved {self.path}")
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+class PageOCR:
+    """
+    OCR settings for one parse run: language, render DPI, an optional OCRPool
+    or OCRBatcher and an optional OCRCache keyed by the PDF's checksum.
+
+    In adaptive mode a page is rendered at the lowest of OCR_ADAPTIVE_DPIS
+    first and only re-rendered at the next one when the result's average
+    confidence or word density is below OCR_MIN_CONFIDENCE /
+    OCR_MIN_WORD_DENSITY. `stats` counts pages per DPI and escalations.
+
+    With `regions`, pages that have a text layer get their textless image
+    regions OCR'd at the top DPI via `run_regions`; those crops always run
+    inline since they are small.
+    """
+    def __init__(self, lang: str = OCR_LANG, dpi: int = OCR_DPI, pool: Optional[OCRPool] = None,
+                 cache: Optional[OCRCache] = None, checksum_fn=None, pdf_checksum: Optional[str] = None,
+                 adaptive: bool = False, regions: bool = False):
+        self.lang = lang
+        self.regions = regions
+        self.dpi = dpi
+        self.adaptive = adaptive
+        self.dpis = tuple(d for d in OCR_ADAPTIVE_DPIS if d < dpi) + (dpi,) if adaptive else (dpi,)
+        self.pool = pool
+        self.cache = cache
+        self.stats = new_ocr_stats()
+        self._checksum_fn = checksum_fn
+        self._checksum = pdf_checksum
+
+    @property
+    def pdf_checksum(self) -> Optional[str]:
+        # Computed on the first scanned page, so text-only PDFs are never hashed.
+        if self._checksum is None and self._checksum_fn is not None:
+            self._checksum = self._checksum_fn()
+            self._checksum_fn = None
+        return self._checksum
+
+    def settings(self) -> Dict:
+        """Picklable settings for rebuilding this object in a worker process."""
+        return {
+            "lang": self.lang,
+            "dpi": self.dpi,
+            "adaptive": self.adaptive,
+            "regions": self.regions,
+            "cache_path": str(self.cache.path) if self.cache else None,
+            "pdf_checksum": self.pdf_checksum if self.cache else None,
+        }
+
+    @classmethod
+    def from_settings(cls, settings: Dict) -> "PageOCR":
+        cache = OCRCache(Path(settings["cache_path"])) if settings.get("cache_path") else None
+        return cls(lang=settings["lang"], dpi=settings["dpi"], cache=cache,
+                   pdf_checksum=settings.get("pdf_checksum"), adaptive=settings.get("adaptive", False),
+                   regions=settings.get("regions", False))
+
+    def _cache_key(self, page_num: int, dpi: int, region: Optional[Tuple] = None) -> Optional[str]:
+        if not self.cache or not self.pdf_checksum:
+            return None
+        return OCRCache.make_key(self.pdf_checksum, page_num - 1, dpi, self.lang, tesseract_version(), region)
+
+    def run(self, page, page_num: int, page_info: Dict) -> Optional[Tuple]:
+        """
+        OCRs a page into `page_info`. Returns pending OCR when the work was
+        queued on the pool; pass it to `finish` while the PDF is still open.
+        """
+        self.stats["pages"] += 1
+        self.stats["fixed_megapixels"] += _megapixels(page, self.dpis[-1])
+        return self._attempt(page, page_num, page_info, 0)
+
+    def finish(self, page_info: Dict, pending: Tuple):
+        while pending is not None:
+            future, page, step, key = pending
+            pending = self._settle(page, page_info, step, key, *future.result())
+
+    def _attempt(self, page, page_num: int, page_info: Dict, step: int) -> Optional[Tuple]:
+        dpi = self.dpis[step]
+        megapixels = _megapixels(page, dpi)
+        self.stats["megapixels"] += megapixels
+        key = self._cache_key(page_num, dpi)
+        if key:
+            cached = self.cache.get(key)
+            if cached:
+                logger.info(f"Page {page_num}: {dpi} dpi OCR result served from cache")
+                return self._settle(page, page_info, step, None, *cached)
+
+        start = time.perf_counter()
+        im = page.to_image(resolution=dpi).original
+        if self.pool is not None:
+            return self.pool.submit(im), page, step, key
+        text, ocr_data = extract_text_from_image(im, self.lang)
+        self.stats["seconds"] += time.perf_counter() - start
+        self.stats["timed_megapixels"] += megapixels
+        return self._settle(page, page_info, step, key, text, ocr_data)
+
+    def run_regions(self, page, page_num: int, page_info: Dict, chars: List[Dict]) -> List[Dict]:
+        """
+        OCRs the image regions of a text page that have no text layer, merges
+        their text into `page_info` by vertical position and returns the
+        recognised words as char dicts (fontname "OCR") for the layout.
+        """
+        regions = _textless_image_regions(page, chars)
+        if not regions:
+            return []
+        dpi = self.dpis[-1]
+        doctop = float(getattr(page, "initial_doctop", 0.0))
+        region_chars = []
+        blocks = []
+        for bbox in regions:
+            key = self._cache_key(page_num, dpi, bbox)
+            result = self.cache.get(key) if key else None
+            if result is None:
+                start = time.perf_counter()
+                result = extract_text_from_image(page.crop(bbox).to_image(resolution=dpi).original, self.lang)
+                self.stats["seconds"] += time.perf_counter() - start
+                self.stats["timed_megapixels"] += _region_megapixels(bbox, dpi)
+                if key and result[1]:
+                    confs = _word_confidences(result[1])
+                    self.cache.put(key, result[0], result[1], sum(confs) / len(confs) if confs else 0.0)
+            text, ocr_data = result
+            self.stats["regions"] += 1
+            self.stats["region_megapixels"] += _region_megapixels(bbox, dpi)
+            words = ocr_words(ocr_data)
+            if not words:
+                continue
+            blocks.append((bbox[1], text))
+            region_chars.extend(_words_to_chars(words, bbox, dpi, doctop))
+            confs = [w["conf"] for w in words if w["conf"] >= 0]
+            page_info["ocr_regions"].append({
+                "bbox": [round(v, 2) for v in bbox],
+                "confidence": sum(confs) / len(confs) if confs else 0.0,
+                "words": len(words),
+            })
+        self.stats["region_pages"] += 1
+        self.stats["region_page_megapixels"] += _megapixels(page, dpi)
+        if blocks:
+            logger.info(f"Page {page_num}: OCR'd {len(blocks)} image region(s) without a text layer")
+            page_info["text"] = _merge_region_text(page_info["text"], chars, blocks)
+        return region_chars
+
+    def _settle(self, page, page_info: Dict, step: int, key: Optional[str],
+                text: str, ocr_data: Dict) -> Optional[Tuple]:
+        """Applies an OCR result, or re-renders at the next DPI if it looks unreliable."""
+        dpi = self.dpis[step]
+        _apply_ocr(page_info, text, ocr_data)
+        page_info["ocr_dpi"] = dpi
+        # Failed OCR comes back empty; don't pin that in the cache.
+        if key and ocr_data:
+            self.cache.put(key, text, ocr_data, page_info["ocr_confidence"])
+
+        if step + 1 < len(self.dpis) and not _ocr_is_reliable(page, page_info, ocr_data):
+            logger.info(f"Page {page_info['page_num']}: weak OCR at {dpi} dpi "
+                        f"(confidence {page_info['ocr_confidence']:.0f}), retrying at {self.dpis[step + 1]} dpi")
+            self.stats["escalated"] += 1
+            return self._attempt(page, page_info["page_num"], page_info, step + 1)
+        self.stats["by_dpi"][dpi] = self.stats["by_dpi"].get(dpi, 0) + 1
+        return None
+
+def _parse_page(page, page_num: int, ocr: Optional[PageOCR] = None,
+                triage: Optional[PageTriage] = None) -> Tuple[Dict, Dict, Optional[Tuple]]:
+    """
+    Extracts text and layout from one backend page, applying OCR if it
+    appears to be scanned. `ocr` is None when Tesseract is unavailable.
+
+    With `triage`, the page is classified as text, scanned or mixed from
+    cheap signals first. Scanned pages that will be OCR'd skip text and char
+    extraction entirely; mixed pages keep their text layer and are flagged
+    via `page_type` for OCR of their image regions. Without triage (or if
+    it fails) a page counts as scanned when its extracted text is shorter
+    than SCANNED_TEXT_THRESHOLD.
+
+    Returns:
+        (page_info, layout entry, pending OCR). Pending OCR is only set when
+        the page was queued on an OCRPool and must go through `PageOCR.finish`.
+    """
+    logger.info(f"Processing page {page_num}")
+
+    signals = triage.classify(page, page_num - 1) if triage else None
+    page_type = signals["page_type"] if signals else None
+
+    if page_type == "scanned" and ocr is not None:
+        # OCR replaces the text and there is no useful char layer to keep
+        text, chars = "", []
+        triage.record_skip(page_num)
+    else:
+        # Extract text and layout
+        start = time.perf_counter()
+        text = page.extract_text() or ""
+        chars = page.chars
+        if triage:
+            triage.record_extraction(time.perf_counter() - start)
+        if page_type is None:
+            page_type = "scanned" if len(text.strip()) < SCANNED_TEXT_THRESHOLD else "text"
+
+    is_scanned = page_type == "scanned"
+    ocr_pending = None
+
+    page_info = {
+        "page_num": page_num,
+        "text": text,
+        "width": float(page.width),
+        "height": float(page.height),
+        "page_type": page_type,
+        "is_scanned": is_scanned,
+        "ocr_applied": False,
+        "ocr_confidence": 0.0,
+        "ocr_dpi": None,
+        "ocr_regions": []
+    }
+
+    if is_scanned and ocr is not None:
+        logger.info(f"Page {page_num} appears scanned. Applying OCR...")
+        ocr_pending = ocr.run(page, page_num, page_info)
+    elif ocr is not None and ocr.regions:
+        chars = list(chars) + ocr.run_regions(page, page_num, page_info, chars)
+
+    # Store detailed layout info (chars) separately to avoid massive JSONs if not needed
+    # But requirements say "Store parsed pages... layout.json"
+    # We'll store chars for layout analysis
+    page_layout = {
+        "page_num": page_num,
+        "chars": _serialize_chars(chars)
+    }
+    return page_info, page_layout, ocr_pending
+
+def _release_page(ocr: Optional[PageOCR], page, page_info: Dict, page_layout: Dict,
+                  ocr_pending: Optional[Tuple]) -> Tuple[Dict, Dict]:
+    """Waits for a page's queued OCR, then frees the backend's cached objects for it."""
+    if ocr_pending is not None:
+        ocr.finish(page_info, ocr_pending)
+    page.close()
+    return page_info, page_layout
+
+def _apply_ocr(page_info: Dict, text: str, ocr_data: Dict):
+    """Stores OCR text and its average word confidence on a page record."""
+    page_info["text"] = text
+    page_info["ocr_applied"] = True
+    # Calculate average confidence
+    confs = _word_confidences(ocr_data)
+    page_info["ocr_confidence"] = sum(confs) / len(confs) if confs else 0.0
+
+def _word_confidences(ocr_data: Dict) -> List[float]:
+    # Tesseract reports -1 for the block/paragraph/line rows
+    return [float(c) for c in ocr_data.get('conf', []) if float(c) >= 0]
+
+def _ocr_is_reliable(page, page_info: Dict, ocr_data: Dict) -> bool:
+    """True if a page's OCR clears both the confidence and word density thresholds."""
+    area = float(page.width) * float(page.height) / 72 ** 2  # Square inches
+    density = len(_word_confidences(ocr_data)) / area if area else 0.0
+    return page_info["ocr_confidence"] >= OCR_MIN_CONFIDENCE and density >= OCR_MIN_WORD_DENSITY
+
+def _megapixels(page, dpi: int) -> float:
+    return float(page.width) * float(page.height) * (dpi / 72) ** 2 / 1e6
+
+def _region_megapixels(bbox: Tuple, dpi: int) -> float:
+    x0, top, x1, bottom = bbox
+    return (x1 - x0) * (bottom - top) * (dpi / 72) ** 2 / 1e6
+
+def _textless_image_regions(page, chars: List[Dict]) -> List[Tuple[float, float, float, float]]:
+    """
+    Image boxes (x0, top, x1, bottom), clipped to the page, that are at least
+    REGION_OCR_MIN_AREA and overlap at most REGION_OCR_MAX_CHARS text chars.
+    """
+    width, height = float(page.width), float(page.height)
+    regions = []
+    for image in page.images:
+        bbox = (max(0.0, float(image["x0"])), max(0.0, float(image["top"])),
+                min(width, float(image["x1"])), min(height, float(image["bottom"])))
+        x0, top, x1, bottom = bbox
+        if (x1 - x0) * (bottom - top) < REGION_OCR_MIN_AREA or bbox in regions:
+            continue
+        inside = sum(1 for c in chars
+                     if x0 <= (c["x0"] + c["x1"]) / 2 <= x1 and top <= (c["top"] + c["bottom"]) / 2 <= bottom)
+        if inside <= REGION_OCR_MAX_CHARS:
+            regions.append(bbox)
+    return sorted(regions, key=lambda b: (b[1], b[0]))
+
+def _words_to_chars(words: List[Dict], bbox: Tuple, dpi: int, doctop: float) -> List[Dict]:
+    """
+    Maps OCR words from crop pixels to page coordinates as char dicts, one
+    per letter (each word's box split evenly) plus a space between words on
+    the same line, so line grouping in the extractors works unchanged.
+    """
+    scale = 72 / dpi
+    chars = []
+    previous_line = None
+    for word in words:
+        x0 = bbox[0] + word["left"] * scale
+        top = bbox[1] + word["top"] * scale
+        height = word["height"] * scale
+        step = word["width"] * scale / len(word["text"])
+        letters = list(word["text"])
+        if word["line"] == previous_line:
+            letters.insert(0, " ")
+            x0 -= step
+        previous_line = word["line"]
+        for i, letter in enumerate(letters):
+            chars.append({
+                "text": letter, "fontname": "OCR", "size": height, "upright": True,
+                "x0": x0 + i * step, "x1": x0 + (i + 1) * step,
+                "top": top, "bottom": top + height, "doctop": doctop + top,
+            })
+    return chars
+
+def _line_tops(chars: List[Dict], tolerance: float = 3) -> List[float]:
+    """Tops of the text lines formed by `chars`, clustered like pdfplumber's extract_text."""
+    tops = []
+    for top in sorted(c["top"] for c in chars):
+        if not tops or top - tops[-1][-1] > tolerance:
+            tops.append([top])
+        else:
+            tops[-1].append(top)
+    return [cluster[0] for cluster in tops]
+
+def _merge_region_text(text: str, chars: List[Dict], blocks: List[Tuple[float, str]]) -> str:
+    """
+    Inserts OCR'd region text (top, text) between the page's text lines by
+    vertical position. If the lines can't be matched to char positions the
+    region text is appended in reading order.
+    """
+    lines = text.split("\n") if text else []
+    tops = _line_tops(chars)
+    if len(tops) != len(lines):
+        return "\n".join(lines + [block for _, block in blocks])
+    merged = sorted([(top, 0, line) for top, line in zip(tops, lines)] +
+                    [(top, 1, block) for top, block in blocks], key=lambda item: (item[0], item[1]))
+    return "\n".join(item[2] for item in merged)
+
+def new_ocr_stats() -> Dict:
+    """Empty OCR counters, as kept by PageOCR and returned in PDFParser.stats['ocr']."""
+    return {"pages": 0, "escalated": 0, "by_dpi": {}, "seconds": 0.0, "timed_megapixels": 0.0,
+            "megapixels": 0.0, "fixed_megapixels": 0.0,
+            "regions": 0, "region_pages": 0, "region_megapixels": 0.0, "region_page_megapixels": 0.0}
+
+def merge_stats(total: Dict, stats: Dict) -> Dict:
+    """Adds one run's counters into `total`, e.g. to report on a whole corpus. Nested dicts are summed per key."""
+    for k, v in stats.items():
+        if isinstance(v, dict):
+            for key, count in v.items():
+                total[k][key] = total[k].get(key, 0) + count
+        else:
+            total[k] += v
+    return total
+
+
+def ocr_time_saved(stats: Dict) -> float:
+    """
+    Estimated OCR seconds saved compared with rendering every page at the top
+    DPI. Tesseract's cost is roughly linear in pixels, so the measured seconds
+    per megapixel are applied to the megapixels that were never rendered.
+    Negative if escalations cost more than the low-DPI passes saved.
+    """
+    if not stats["timed_megapixels"]:
+        return 0.0
+    seconds_per_megapixel = stats["seconds"] / stats["timed_megapixels"]
+    return (stats["fixed_megapixels"] - stats["megapixels"]) * seconds_per_megapixel
+
+def _parse_page_range(pdf_path: str, start: int, end: int, ocr_settings: Optional[Dict],
+                      backend: str = PARSE_BACKEND) -> Tuple[List[Tuple], Dict, Dict, Dict]:
+    """
+    Worker entry point: opens the PDF and parses pages [start, end).
+    Returns the parsed pages with their OCR and triage counters, and the
+    worker's OCR cache hits and misses for the parent's cache stats.
+    """
+    results = []
+    ocr = PageOCR.from_settings(ocr_settings) if ocr_settings else None
+    triage = PageTriage(Path(pdf_path), SCANNED_TEXT_THRESHOLD)
+    # Open the whole document (not pages=...) so doctop offsets match the serial run
+    with get_backend(backend).open(pdf_path) as pdf:
+        for i in range(start, end):
+            page = pdf.pages[i]
+            results.append(_parse_page(page, i + 1, ocr, triage))
+            page.close()
+    triage.close()
+    cache_counts = {"hits": 0, "misses": 0}
+    if ocr and ocr.cache:
+        cache_counts = {"hits": ocr.cache.hits, "misses": ocr.cache.misses}
+        ocr.cache.close()
+    return results, ocr.stats if ocr else new_ocr_stats(), triage.stats, cache_counts
+
+def _serialize_chars(chars: List[Dict]) -> List[Dict]:
+    """
+    Chars reduced to the JSON-serializable CHAR_FIELDS the layout store keeps,
+    so a fresh parse and a cached one yield the same layout.
+    """
+    return [layout_char(char) for char in chars]
+
+def default_workers() -> int:
+    """A sensible worker count for parallel parsing on this machine."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+def parse_pdf_wrapper(pdf_path: Path, book_id: str, stream: Optional[BinaryIO] = None):
+    parser = PDFParser(pdf_path, book_id, stream=stream)
     return parser.parse()
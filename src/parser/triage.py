@@ -0,0 +1,96 @@
+import logging
+import time
+from pathlib import Path
+from typing import BinaryIO, Dict, Optional, Union
+
+from .backends import PdfiumDocument, PdfiumPage
+
+logger = logging.getLogger(__name__)
+
+TRIAGE_MIXED_COVERAGE = 0.25  # Share of a text page covered by images before it counts as mixed
+
+def classify(signals: Dict, text_threshold: int) -> str:
+    """'scanned' if there is too little text to use, 'mixed' if real text shares the page with large images."""
+    if not signals["has_fonts"] or signals["char_count"] < text_threshold:
+        return "scanned"
+    if signals["image_coverage"] >= TRIAGE_MIXED_COVERAGE:
+        return "mixed"
+    return "text"
+
+class PageTriage:
+    """
+    Classifies pages as text, scanned or mixed before any layout extraction.
+
+    Signals come from PDFium: the page itself with the pdfium backend,
+    otherwise a second, PDFium-only handle on the same source. If PDFium
+    cannot open the source, `classify` returns None and the parser falls back
+    to checking extracted text. `stats` counts page types, triage time, and
+    extractions skipped with the time they are estimated to have saved (the
+    average extraction time of the pages that were extracted).
+    """
+    def __init__(self, source: Union[Path, BinaryIO], text_threshold: int):
+        self.source = source
+        self.text_threshold = text_threshold
+        self.stats = new_triage_stats()
+        self._doc = None
+        self._failed = False
+
+    def classify(self, page, page_index: int) -> Optional[Dict]:
+        """Returns the page's signals plus 'page_type', or None if triage is unavailable."""
+        start = time.perf_counter()
+        try:
+            if isinstance(page, PdfiumPage):
+                signals = page.signals()
+            else:
+                signals = self._signals_from_side_document(page_index)
+        except Exception as e:
+            logger.warning(f"Page triage unavailable for page {page_index + 1}: {e}")
+            self._failed = True
+            return None
+        if signals is None:
+            return None
+        signals["page_type"] = classify(signals, self.text_threshold)
+        elapsed = time.perf_counter() - start
+        self.stats[signals["page_type"]] += 1
+        self.stats["seconds"] += elapsed
+        logger.info(f"Page {page_index + 1}: triaged as {signals['page_type']} in {elapsed * 1000:.1f} ms "
+                    f"({signals['char_count']} chars, {signals['image_coverage']:.0%} images, "
+                    f"fonts {'present' if signals['has_fonts'] else 'absent'})")
+        return signals
+
+    def _signals_from_side_document(self, page_index: int) -> Optional[Dict]:
+        if self._failed:
+            return None
+        if self._doc is None:
+            self._doc = PdfiumDocument(self.source)
+        pdfium_page = self._doc.pages[page_index]
+        try:
+            return pdfium_page.signals()
+        finally:
+            pdfium_page.close()
+
+    def record_extraction(self, seconds: float):
+        self.stats["extracted"] += 1
+        self.stats["extract_seconds"] += seconds
+
+    def record_skip(self, page_num: int):
+        """Logs a skipped extraction and the time it is estimated to have saved."""
+        self.stats["skipped"] += 1
+        saved = triage_time_saved(self.stats, skipped=1)
+        logger.info(f"Page {page_num}: layout extraction skipped, ~{saved * 1000:.1f} ms saved")
+
+    def close(self):
+        if self._doc is not None:
+            self._doc.close()
+            self._doc = None
+
+def new_triage_stats() -> Dict:
+    return {"text": 0, "scanned": 0, "mixed": 0, "seconds": 0.0,
+            "extracted": 0, "extract_seconds": 0.0, "skipped": 0}
+
+def triage_time_saved(stats: Dict, skipped: Optional[int] = None) -> float:
+    """Estimated extraction seconds avoided for `skipped` pages (default: all skipped pages so far)."""
+    if not stats["extracted"]:
+        return 0.0
+    skipped = stats["skipped"] if skipped is None else skipped
+    return skipped * stats["extract_seconds"] / stats["extracted"]
@@ -1,33 +1,77 @@
 import logging
+import zipfile
+import zlib
 from pathlib import Path
-from typing import Optional, Dict
+from typing import Optional, Dict, BinaryIO, List, Sequence
 
 from .scraper.discover import NCERTScraper, CISCEScraper
-from .scraper.fetch_pdfs import download_pdf
-from .scraper.config import PDF_DIR
-from .parser.pdf_parser import PDFParser
-from .extractor.headings import HeadingExtractor
-from .extractor.toc import ToCExtractor
-from .extractor.merger import ChapterMerger
+from .scraper.fetch_pdfs import download_pdf, download_in_ranges
+from .scraper.archive import BookArchive
+from .scraper.async_fetch import fetch_all
+from .scraper.config import PDF_DIR, PARSED_DIR
+from .parser.pdf_parser import PDFParser, new_ocr_stats, merge_stats, ocr_time_saved
+from .parser.folios import PageNumberIndex, PAGE_INDEX_FILENAME
+from .extractor.cascade import ChapterCascade, new_cascade_stats
+from .extractor.document import DocumentModel
 from .extractor.metadata import MetadataExtractor
 from .exporter import DataExporter
 
 logger = logging.getLogger(__name__)
 
+# What reading a damaged ZIP can raise: bad headers/CRCs, broken deflate streams, truncation
+ARCHIVE_ERRORS = (zipfile.BadZipFile, zlib.error, EOFError)
+
 class TextbookPipeline:
-    def __init__(self):
+    def __init__(self, parse_workers: int = 1, ocr_workers: int = 0, adaptive_ocr: bool = False,
+                 reparse: bool = False, backend: str = "pdfplumber", region_ocr: bool = False,
+                 ocr_batch_size: int = 0, in_memory: bool = False):
+        """
+        Args:
+            parse_workers: Processes used to parse each PDF's pages in parallel.
+            ocr_workers: Processes in the OCR pool used when parsing serially.
+            adaptive_ocr: OCR scanned pages at a low DPI first, escalating only
+                when the result looks unreliable.
+            reparse: Parse every PDF again even if its saved output is
+                still valid for the same file and parser settings.
+            backend: PDF backend used for text and chars ("pdfplumber" or "pdfium").
+            region_ocr: OCR figures without a text layer on otherwise digital pages.
+            ocr_batch_size: Scanned pages sent to each Tesseract process when
+                there is no OCR pool (0 starts one process per page).
+            in_memory: Hold every page's chars in memory (PDFParser.parse)
+                instead of streaming them to the layout store and reading
+                lines back from it.
+        """
         self.ncert_scraper = NCERTScraper()
         self.cisce_scraper = CISCEScraper()
+        self.parse_workers = parse_workers
+        self.ocr_workers = ocr_workers
+        self.adaptive_ocr = adaptive_ocr
+        self.reparse = reparse
+        self.backend = backend
+        self.region_ocr = region_ocr
+        self.ocr_batch_size = ocr_batch_size
+        self.in_memory = in_memory
+        # OCR counters summed over every PDF this pipeline has parsed
+        self.ocr_stats = new_ocr_stats()
+        # Chapter-detection strategies run, accepted and their time, over every segment
+        self.detection_stats = new_cascade_stats()
 
-    def run_for_book(self, book_code: str, board: str = "CBSE", class_name: str = "Unknown", subject: str = "Unknown"):
+    def run_for_book(self, book_code: str, board: str = "CBSE", class_name: str = "Unknown", subject: str = "Unknown",
+                     concurrent_downloads: bool = True, refresh: bool = False, probe_chapters: bool = False):
         """
         Runs the full pipeline for a single book.
+        With `refresh`, already downloaded PDFs are re-validated against the
+        server and only fetched again if they were republished.
+        With `probe_chapters`, the real chapter count of an NCERT book is probed
+        up front instead of using the demo limit.
         """
         logger.info(f"Starting pipeline for book: {book_code} ({board})")
         
         # 1. Generate URLs (Discovery)
         if board.upper() == "ICSE":
             urls = self.cisce_scraper.generate_chapter_urls(book_code)
+        elif probe_chapters:
+            urls = self.ncert_scraper.generate_chapter_urls(book_code, probe=True)
         else:
             # Limit to 2 chapters for demo purposes
             urls = self.ncert_scraper.generate_chapter_urls(book_code, num_chapters=2)
@@ -64,58 +108,164 @@ class TextbookPipeline:
         # If I run "Chapter Detection" on it, I might find "Chapter 1: Real Numbers".
         # That satisfies the requirement.
         
-        for url in urls:
-            filename = url.split("/")[-1]
-            save_path = PDF_DIR / board / class_name / subject / filename
-            
-            # 2. Download
-            pdf_path = download_pdf(url, save_path)
+        jobs = [(url, PDF_DIR / board / class_name / subject / url.split("/")[-1]) for url in urls]
+        
+        # 2. Download
+        # Chapters are fetched concurrently and handed over as each one finishes,
+        # so parsing starts while the rest of the book is still downloading.
+        if concurrent_downloads:
+            downloaded = (r["path"] for r in fetch_all(jobs, refresh=refresh))
+        else:
+            downloaded = (download_pdf(url, save_path, refresh=refresh) for url, save_path in jobs)
+        
+        for pdf_path in downloaded:
             if not pdf_path:
                 continue
-                
-            # 3. Parse
-            # We use the filename (minus ext) as book_id for this segment
-            segment_id = Path(filename).stem
-            parser = PDFParser(pdf_path, segment_id)
+            self._process_pdf(pdf_path, board, class_name, subject)
+
+    def run_for_book_zip(self, book_code: str, board: str = "CBSE", class_name: str = "Unknown",
+                         subject: str = "Unknown", refresh: bool = False):
+        """
+        Runs the pipeline from NCERT's full-book ZIP instead of per-chapter PDFs.
+        One download per book; chapters are parsed straight out of the archive.
+        """
+        logger.info(f"Starting ZIP pipeline for book: {book_code} ({board})")
+        url = self.ncert_scraper.book_zip_url(book_code)
+        save_path = PDF_DIR / board / class_name / subject / url.split("/")[-1]
+        
+        if save_path.exists():
+            zip_path = download_pdf(url, save_path, refresh=refresh)
+        else:
+            zip_path = download_in_ranges(url, save_path)
+        if zip_path and not self._verify_archive(zip_path):
+            logger.warning(f"Downloading {url} again after a failed archive check")
+            zip_path = download_in_ranges(url, save_path)
+            if zip_path and not self._verify_archive(zip_path):
+                logger.error(f"Book archive {zip_path} is still corrupt; skipping {book_code}")
+                return
+        if not zip_path:
+            return
+        
+        with BookArchive(zip_path) as archive:
+            for info in archive.pdf_members():
+                name = Path(info.filename).name
+                try:
+                    stream = archive.open_member(info)
+                except ARCHIVE_ERRORS as e:
+                    logger.error(f"Skipping corrupt member {name} of {zip_path}: {e}")
+                    continue
+                # The member path keeps board/class/subject visible to MetadataExtractor
+                self._process_pdf(zip_path / name, board, class_name, subject, stream=stream)
+
+    @staticmethod
+    def _verify_archive(zip_path: Path) -> bool:
+        """Opens the archive and checks every member's CRC."""
+        try:
+            with BookArchive(zip_path) as archive:
+                return archive.verify()
+        except ARCHIVE_ERRORS as e:
+            logger.error(f"Corrupt book archive {zip_path}: {e}")
+            return False
+
+    def _process_pdf(self, pdf_path: Path, board: str, class_name: str, subject: str,
+                     stream: Optional[BinaryIO] = None):
+        """
+        Parses, extracts and exports a single downloaded PDF.
+        `stream` lets the PDF be read from memory (e.g. a ZIP member) instead of `pdf_path`.
+        """
+        filename = pdf_path.name
+        
+        # 3. Parse
+        # We use the filename (minus ext) as book_id for this segment
+        segment_id = Path(filename).stem
+        parser = PDFParser(pdf_path, segment_id, stream=stream, workers=self.parse_workers,
+                           ocr_workers=self.ocr_workers, adaptive_ocr=self.adaptive_ocr,
+                           use_parse_cache=not self.reparse, backend=self.backend,
+                           region_ocr=self.region_ocr, ocr_batch_size=self.ocr_batch_size)
+        if self.in_memory:
             parse_result = parser.parse()
-            
-            if not parse_result:
-                continue
-                
             pages = parse_result.get("pages", [])
             layout = parse_result.get("layout", [])
-            
-            # 4. Extract Metadata
-            meta_extractor = MetadataExtractor(pdf_path, pages)
-            metadata = meta_extractor.extract()
-            # Override with provided known info
-            metadata["board"] = board
-            metadata["class"] = class_name
-            metadata["subject"] = subject
-            
-            # 5. Detect Chapters
-            # Strategy A & B
-            heading_extractor = HeadingExtractor(pages, layout)
-            headings_A = heading_extractor.detect_by_fontsize()
-            headings_B = heading_extractor.detect_by_regex()
-            
-            # Strategy C
-            toc_extractor = ToCExtractor(pages)
-            toc_chapters = toc_extractor.extract()
-            
-            # Merge
-            merger = ChapterMerger(toc_chapters, headings_A + headings_B, len(pages))
-            final_chapters = merger.merge()
-            
-            # 6. Export
-            exporter = DataExporter(segment_id)
-            exporter.export_json(metadata, final_chapters)
-            exporter.export_csv(metadata, final_chapters)
-            exporter.append_to_master_csv(metadata, final_chapters)
-            exporter.append_to_master_json(metadata, final_chapters)
-            exporter.update_metadata_index(metadata)
-            
-            logger.info(f"Completed processing for {filename}")
+        else:
+            # Chars go straight to the layout store; only the page records are kept
+            layout = None
+            try:
+                pages = [page_info for page_info, _ in parser.iter_pages()]
+            except Exception as e:
+                logger.error(f"Failed to parse PDF {pdf_path}: {e}")
+                pages = []
+        if "ocr" in parser.stats:
+            merge_stats(self.ocr_stats, parser.stats["ocr"])
+            logger.info(f"Corpus OCR so far: {self.ocr_stats['pages']} pages, "
+                        f"~{ocr_time_saved(self.ocr_stats):.1f}s saved by adaptive DPI")
+        
+        if not pages:
+            return
+        
+        # Lines and text are derived once and shared by every extractor. Without
+        # `layout` they are read from the saved layout store. The line index is
+        # only built (and saved) if the font size pass runs; otherwise the first
+        # `redetect` of this segment builds it from the layout store.
+        document = DocumentModel(pages, layout, cache_dir=parser.output_dir)
+        
+        # 4. Extract Metadata
+        meta_extractor = MetadataExtractor(pdf_path, pages, document=document)
+        metadata = meta_extractor.extract()
+        # Override with provided known info
+        metadata["board"] = board
+        metadata["class"] = class_name
+        metadata["subject"] = subject
+        
+        # 5. Detect Chapters
+        # Outline, ToC, regex, then font size headings, stopping at the first consistent result
+        cascade = ChapterCascade(pages, layout, document=document, pdf_source=stream or pdf_path, board=board,
+                                 page_index=parser.page_index)
+        final_chapters = cascade.run()
+        merge_stats(self.detection_stats, cascade.stats)
+        logger.info(f"Chapter strategies so far: ran {self.detection_stats['ran']}, "
+                    f"accepted {self.detection_stats['accepted']}")
+        
+        # 6. Export
+        exporter = DataExporter(segment_id)
+        exporter.export_json(metadata, final_chapters)
+        exporter.export_csv(metadata, final_chapters)
+        exporter.append_to_master_csv(metadata, final_chapters)
+        exporter.append_to_master_json(metadata, final_chapters)
+        exporter.update_metadata_index(metadata)
+        
+        logger.info(f"Completed processing for {filename}")
+
+    def redetect(self, segment_ids: Optional[Sequence[str]] = None, board: Optional[str] = None) -> Dict[str, List[Dict]]:
+        """
+        Re-runs chapter detection over parsed segments without parsing their
+        PDFs again, e.g. after tuning the heading filters.
+
+        Each segment is read from its pages.json and saved line index (the
+        layout is only read if the index is missing or stale). The PDF outline
+        is not available here, so the cascade starts at the ToC pages.
+
+        Args:
+            segment_ids: Folders under PARSED_DIR to process (None: every parsed segment).
+            board: Selects the heading patterns, as in `run_for_book`.
+
+        Returns:
+            Chapters (see ChapterMerger.merge) by segment id.
+        """
+        if segment_ids is None:
+            segment_ids = sorted(p.parent.name for p in PARSED_DIR.glob("*/pages.json"))
+        results = {}
+        for segment_id in segment_ids:
+            parsed_dir = PARSED_DIR / segment_id
+            document = DocumentModel.from_parsed(parsed_dir)
+            page_index = None
+            if (parsed_dir / PAGE_INDEX_FILENAME).exists():
+                page_index = PageNumberIndex.load(parsed_dir / PAGE_INDEX_FILENAME)
+            cascade = ChapterCascade(document.pages, document.layout, document=document, board=board,
+                                     page_index=page_index)
+            results[segment_id] = cascade.run()
+            merge_stats(self.detection_stats, cascade.stats)
+        logger.info(f"Re-detected chapters in {len(results)} segments: accepted {self.detection_stats['accepted']}")
+        return results
 
     def run_demo(self):
         """
@@ -0,0 +1,125 @@
+import io
+import logging
+import mmap
+import struct
+import zipfile
+import zlib
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")  # Fixed part of a ZIP local file header
+_LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+
+class _MappedSlice(io.RawIOBase):
+    """Read-only, seekable window onto a memory map. Nothing is copied until read."""
+    def __init__(self, buffer: mmap.mmap, start: int, size: int):
+        self._buffer = buffer
+        self._start = start
+        self._size = size
+        self._pos = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, min(offset, self._size))
+        return self._pos
+
+    def readinto(self, b) -> int:
+        n = min(len(b), self._size - self._pos)
+        if n <= 0:
+            return 0
+        start = self._start + self._pos
+        b[:n] = self._buffer[start:start + n]
+        self._pos += n
+        return n
+
+class BookArchive:
+    """
+    Reads chapter PDFs straight out of a full-book ZIP without extracting it.
+
+    The archive is memory-mapped. Stored (uncompressed) members are served as
+    zero-copy windows onto the map; deflated members are inflated into memory.
+    Each member's CRC is checked before it is handed out.
+
+    Usage:
+        with BookArchive(zip_path) as archive:
+            for name, stream in archive.iter_pdfs():
+                PDFParser(zip_path / name, Path(name).stem, stream=stream).parse()
+    """
+    def __init__(self, zip_path: Path):
+        self.zip_path = zip_path
+        self._file = None
+        self._map = None
+        self._zip = None
+
+    def __enter__(self) -> "BookArchive":
+        self._file = open(self.zip_path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._zip = zipfile.ZipFile(io.BufferedReader(_MappedSlice(self._map, 0, len(self._map))))
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._zip:
+            self._zip.close()
+        if self._map:
+            self._map.close()
+        if self._file:
+            self._file.close()
+        self._zip = self._map = self._file = None
+
+    def pdf_members(self) -> List[zipfile.ZipInfo]:
+        """Chapter PDFs in the archive, in name order."""
+        members = [i for i in self._zip.infolist() if not i.is_dir() and i.filename.lower().endswith(".pdf")]
+        return sorted(members, key=lambda i: i.filename)
+
+    def verify(self) -> bool:
+        """Checks the CRC of every member. Cheap for stored members, inflates deflated ones."""
+        bad = self._zip.testzip()
+        if bad:
+            logger.error(f"Corrupt member in {self.zip_path}: {bad}")
+            return False
+        return True
+
+    def open_member(self, info: zipfile.ZipInfo) -> BinaryIO:
+        """Returns a seekable stream over one member's bytes."""
+        if info.compress_type == zipfile.ZIP_STORED:
+            start = self._data_offset(info)
+            view = memoryview(self._map)[start:start + info.file_size]
+            try:
+                crc = zlib.crc32(view)
+            finally:
+                view.release()
+            if crc != info.CRC:
+                raise zipfile.BadZipFile(f"Bad CRC for {info.filename} in {self.zip_path}")
+            return io.BufferedReader(_MappedSlice(self._map, start, info.file_size))
+        # ZipExtFile checks the CRC once the member has been read to the end.
+        with self._zip.open(info) as member:
+            return io.BytesIO(member.read())
+
+    def iter_pdfs(self) -> Iterator[Tuple[str, BinaryIO]]:
+        """Yields (file name, stream) for each chapter PDF."""
+        for info in self.pdf_members():
+            yield Path(info.filename).name, self.open_member(info)
+
+    def _data_offset(self, info: zipfile.ZipInfo) -> int:
+        header = _LOCAL_HEADER.unpack_from(self._map, info.header_offset)
+        if header[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"Bad local header for {info.filename} in {self.zip_path}")
+        name_length, extra_length = header[-2], header[-1]
+        return info.header_offset + _LOCAL_HEADER.size + name_length + extra_length
@@ -0,0 +1,218 @@
+import asyncio
+import logging
+import queue
+import threading
+import time
+import requests
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterable, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+from .config import (
+    MAX_RETRIES,
+    ASYNC_MAX_CONCURRENT, ASYNC_MAX_PER_HOST, ASYNC_MAX_INFLIGHT_BYTES, ASYNC_UNKNOWN_SIZE_ESTIMATE,
+)
+from .fetch_pdfs import _transfer, is_final_error
+from .manifest import DownloadManifest, get_manifest
+from .ratelimit import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+DownloadJob = Tuple[str, Path]
+
+class _ByteBudget:
+    """
+    Caps the number of bytes being transferred at once.
+    Used from the worker threads, so it is guarded by a threading.Condition.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int) -> int:
+        # A file larger than the whole budget still gets through, on its own.
+        size = min(size, self.limit)
+        with self._cond:
+            while self.in_flight and self.in_flight + size > self.limit:
+                self._cond.wait()
+            self.in_flight += size
+        return size
+
+    def release(self, size: int):
+        with self._cond:
+            self.in_flight -= size
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, size: int):
+        reserved = self.acquire(size or ASYNC_UNKNOWN_SIZE_ESTIMATE)
+        try:
+            yield
+        finally:
+            self.release(reserved)
+
+class AsyncDownloader:
+    """
+    Downloads many PDFs concurrently.
+
+    Transfers run on a thread pool driven by asyncio. Concurrency is capped
+    globally and per host, and the bytes in flight are capped by a shared
+    budget. Files are written to a `.tmp` path and renamed on success, like
+    `download_pdf`.
+    """
+    def __init__(self, max_concurrent: int = ASYNC_MAX_CONCURRENT, max_per_host: int = ASYNC_MAX_PER_HOST,
+                 max_inflight_bytes: int = ASYNC_MAX_INFLIGHT_BYTES, manifest: Optional[DownloadManifest] = None):
+        self.max_concurrent = max_concurrent
+        self.max_per_host = max_per_host
+        self.budget = _ByteBudget(max_inflight_bytes)
+        self.manifest = manifest or get_manifest()
+        self.limiter = get_rate_limiter()
+        self.executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="pdf-download")
+        self.stats = {"files": 0, "skipped": 0, "not_modified": 0, "failed": 0, "bytes": 0, "elapsed": 0.0}
+        self._loop = None
+        self._global_limit = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._stats_lock = threading.Lock()
+
+    def _bind_loop(self):
+        # Semaphores belong to one event loop; rebuild them if we are reused on another.
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._global_limit = asyncio.Semaphore(self.max_concurrent)
+            self._host_limits = {}
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def download(self, url: str, save_path: Path, overwrite: bool = False, refresh: bool = False) -> Dict:
+        """
+        Downloads a single URL. With `refresh`, an existing file is re-validated
+        with a conditional request instead of being skipped.
+
+        Returns:
+            Dict with url, path (None on failure), bytes, elapsed and error.
+            Errors never propagate, so one bad job cannot stop a batch.
+        """
+        result = {"url": url, "path": None, "bytes": 0, "elapsed": 0.0, "error": None}
+        if save_path.exists() and not overwrite and not refresh:
+            logger.info(f"File already exists: {save_path}")
+            result["path"] = save_path
+            self._count("skipped")
+            return result
+
+        self._bind_loop()
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+
+        async with self._global_limit, self._host_limit(url):
+            for attempt in range(MAX_RETRIES):
+                try:
+                    logger.info(f"Downloading {url} (Attempt {attempt + 1}/{MAX_RETRIES})")
+                    save_path.parent.mkdir(parents=True, exist_ok=True)
+                    await self.limiter.acquire_async(url)
+                    written = await loop.run_in_executor(
+                        self.executor, _transfer, url, save_path, self.manifest,
+                        refresh and not overwrite, self.budget.reserve, None, False,
+                    )
+                    result.update(path=save_path, bytes=written or 0, elapsed=time.perf_counter() - start)
+                    if written is None:
+                        self._count("not_modified")
+                    else:
+                        logger.info(f"Successfully downloaded: {save_path}")
+                        self._count("files", written, result["elapsed"])
+                    return result
+                except requests.RequestException as e:
+                    logger.error(f"Error downloading {url}: {e}")
+                    result["error"] = str(e)
+                    if is_final_error(e):
+                        break
+                except Exception as e:
+                    # Disk errors, corrupt resume state and the like: retrying will not help
+                    logger.error(f"Error downloading {url}: {e!r}")
+                    result["error"] = repr(e)
+                    break
+
+        logger.error(f"Failed to download {url}")
+        result["elapsed"] = time.perf_counter() - start
+        self._count("failed")
+        return result
+
+    async def download_many(self, jobs: Iterable[DownloadJob], overwrite: bool = False,
+                            refresh: bool = False) -> AsyncIterator[Dict]:
+        """Downloads all jobs concurrently, yielding each result as soon as it finishes."""
+        tasks = [asyncio.ensure_future(self.download(url, path, overwrite, refresh)) for url, path in jobs]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def _count(self, key: str, nbytes: int = 0, elapsed: float = 0.0):
+        with self._stats_lock:
+            self.stats[key] += 1
+            self.stats["bytes"] += nbytes
+            self.stats["elapsed"] += elapsed
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+
+def fetch_all(jobs: Iterable[DownloadJob], overwrite: bool = False, refresh: bool = False,
+              downloader: Optional[AsyncDownloader] = None) -> Iterator[Dict]:
+    """
+    Synchronous front-end to AsyncDownloader for non-async callers.
+
+    The event loop runs on a background thread; results are yielded in
+    completion order so the caller can start parsing while the rest download.
+    The manifest is saved once, when the generator finishes or is closed.
+    Closing it early cancels the downloads that have not finished yet.
+    """
+    jobs = list(jobs)
+    owns_downloader = downloader is None
+    downloader = downloader or AsyncDownloader()
+    results: "queue.Queue" = queue.Queue()
+    done = object()
+    stopped = threading.Event()
+    running: Dict = {}
+
+    async def consume():
+        running["loop"], running["task"] = asyncio.get_running_loop(), asyncio.current_task()
+        if stopped.is_set():
+            return
+        async for result in downloader.download_many(jobs, overwrite, refresh):
+            results.put(result)
+
+    def run_loop():
+        try:
+            asyncio.run(consume())
+        except asyncio.CancelledError:
+            logger.info("Download engine stopped before the batch finished")
+        except Exception as e:
+            logger.error(f"Download engine failed: {e}")
+        finally:
+            results.put(done)
+
+    worker = threading.Thread(target=run_loop, name="pdf-download-loop", daemon=True)
+    # The manifest is written once for the whole batch rather than after every file
+    with downloader.manifest.deferred():
+        worker.start()
+        try:
+            while True:
+                item = results.get()
+                if item is done:
+                    break
+                yield item
+        finally:
+            # Either consume() sees `stopped` or its task is cancelled here
+            stopped.set()
+            if worker.is_alive() and "task" in running:
+                running["loop"].call_soon_threadsafe(running["task"].cancel)
+            worker.join()
+            if owns_downloader:
+                downloader.close()
@@ -8,23 +8,69 @@ PDF_DIR = DATA_DIR / "pdfs"
 PARSED_DIR = DATA_DIR / "parsed"
 OUTPUT_DIR = DATA_DIR / "outputs"
 METADATA_DIR = DATA_DIR / "metadata"
+CACHE_DIR = DATA_DIR / "cache"
+DOWNLOAD_MANIFEST_PATH = DATA_DIR / "download_manifest.json"  # Sits next to PDF_DIR
+CHAPTER_COUNT_CACHE = METADATA_DIR / "chapter_counts.json"
 
 # Ensure directories exist
-for d in [DATA_DIR, PDF_DIR, PARSED_DIR, OUTPUT_DIR, METADATA_DIR]:
+for d in [DATA_DIR, PDF_DIR, PARSED_DIR, OUTPUT_DIR, METADATA_DIR, CACHE_DIR]:
     d.mkdir(parents=True, exist_ok=True)
 
 # Scraper Settings
 NCERT_BASE_URL = "https://ncert.nic.in/"
 NCERT_TEXTBOOK_URL = "https://ncert.nic.in/textbook.php"
+NCERT_PDF_BASE_URL = "https://ncert.nic.in/textbook/pdf/"
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 
 REQUEST_DELAY = 2.0  # Seconds
 MAX_RETRIES = 3
 TIMEOUT = 30
 
+# Per-host rate limiting (token bucket, adapted to server latency and 429/503)
+RATE_LIMIT_INITIAL = 1 / REQUEST_DELAY  # Requests per second before any feedback
+RATE_LIMIT_MIN = 0.1
+RATE_LIMIT_MAX = 4.0
+RATE_LIMIT_BURST = 4
+RATE_LIMIT_TARGET_LATENCY = 1.0  # Seconds; faster responses let the rate grow
+RATE_LIMIT_INCREASE = 0.25  # Requests per second added after each healthy response
+RATE_LIMIT_DECREASE = 0.5  # Rate multiplier after throttling, errors or slow responses
+
+# Concurrent download engine
+ASYNC_MAX_CONCURRENT = 16  # Downloads in flight across all hosts
+ASYNC_MAX_PER_HOST = 4  # Downloads in flight against a single host
+ASYNC_MAX_INFLIGHT_BYTES = 256 * 1024 * 1024  # Budget for bytes being transferred
+ASYNC_UNKNOWN_SIZE_ESTIMATE = 8 * 1024 * 1024  # Reserved when no Content-Length is sent
+
+# OCR result cache
+OCR_CACHE_PATH = CACHE_DIR / "ocr.sqlite"
+OCR_CACHE_MAX_BYTES = 2 * 1024 * 1024 * 1024  # LRU eviction beyond this
+OCR_CACHE_LOW_WATER = 0.9  # Share of OCR_CACHE_MAX_BYTES eviction frees down to, so it runs rarely
+
+# Chapter probing
+MAX_PROBE_CHAPTERS = 64  # Upper bound for the galloping search
+
+# Ranged downloads
+PARALLEL_RANGE_THRESHOLD = 32 * 1024 * 1024  # Files at least this large are split into ranges
+PARALLEL_RANGE_PARTS = 4
+
+# Connection pooling and retries (shared session)
+POOL_CONNECTIONS = 10  # Distinct hosts kept in the pool manager
+POOL_MAXSIZE = 16  # Keep-alive connections per host
+HOST_POOL_SIZES = {"ncert.nic.in": 8}  # Per-host pool size overrides
+RETRY_TOTAL = 2  # Retries polite_request makes itself, each waiting for the rate limiter
+RETRY_STATUS_FORCELIST = (500, 502, 503, 504)
+
 # Headers
 HEADERS = {
     "User-Agent": USER_AGENT,
     "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
     "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "gzip, deflate",
+}
+
+# PDFs are already compressed; ask for the raw bytes so sizes and byte offsets match the file.
+DOWNLOAD_HEADERS = {
+    **HEADERS,
+    "Accept": "application/pdf,application/zip,*/*;q=0.8",
+    "Accept-Encoding": "identity",
 }
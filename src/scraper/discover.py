@@ -1,23 +1,32 @@
 import requests
 import logging
+import json
 import re
 import time
 from bs4 import BeautifulSoup
+from pathlib import Path
 from typing import List, Dict, Optional
 from urllib.parse import urljoin
-from .config import NCERT_TEXTBOOK_URL, NCERT_BASE_URL, HEADERS, REQUEST_DELAY
+from .config import (
+    NCERT_TEXTBOOK_URL, NCERT_BASE_URL, NCERT_PDF_BASE_URL, HEADERS, DOWNLOAD_HEADERS,
+    TIMEOUT, CHAPTER_COUNT_CACHE, MAX_PROBE_CHAPTERS,
+)
+from .session import polite_request
 
 logger = logging.getLogger(__name__)
 
 class NCERTScraper:
-    def __init__(self):
+    def __init__(self, probe_cache_path: Path = CHAPTER_COUNT_CACHE):
         self.base_url = NCERT_TEXTBOOK_URL
+        self.pdf_base_url = NCERT_PDF_BASE_URL
+        self.probe_cache_path = probe_cache_path
         self.books = []
+        self._probe_cache: Optional[Dict[str, Dict]] = None
+        self.probe_requests = 0
 
     def fetch_page(self, url: str) -> Optional[str]:
         try:
-            time.sleep(REQUEST_DELAY)
-            response = requests.get(url, headers=HEADERS)
+            response = polite_request("GET", url, headers=HEADERS, timeout=TIMEOUT)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
@@ -88,24 +97,116 @@ class NCERTScraper:
             {"title": "Physics Part-I", "book_code": "leph1", "class": "12", "subject": "Physics", "board": "CBSE"},
         ]
 
-    def generate_chapter_urls(self, book_code: str, num_chapters: int = 20) -> List[str]:
+    def generate_chapter_urls(self, book_code: str, num_chapters: int = 20, probe: bool = False) -> List[str]:
         """
         Generates PDF URLs for a given book code.
         NCERT format: https://ncert.nic.in/textbook/pdf/{book_code}{chapter}.pdf
+
+        With `probe`, the real chapter count is found with cheap HEAD requests
+        (see probe_chapter_count) instead of assuming `num_chapters`, which is
+        still used if the probe cannot reach the server.
         """
+        if probe:
+            probed = self.probe_chapter_count(book_code)
+            if probed is not None:
+                num_chapters = probed
+
         urls = []
         # Try chapters 1 to N. We don't know N, so we can try until 404 or use a fixed limit.
         # For the pipeline, we'll generate a list and the fetcher will handle 404s.
         for i in range(1, num_chapters + 1):
-            chap_num = f"{i:02d}" # 01, 02, ...
-            url = f"https://ncert.nic.in/textbook/pdf/{book_code}{chap_num}.pdf"
-            urls.append(url)
+            urls.append(self._chapter_url(book_code, f"{i:02d}")) # 01, 02, ...
         
         # Also add "ps" (prelims) and "an" (answers) sometimes?
         # Usually prelims is {book_code}ps.pdf
-        urls.append(f"https://ncert.nic.in/textbook/pdf/{book_code}ps.pdf")
+        urls.append(self._chapter_url(book_code, "ps"))
         return urls
 
+    def book_zip_url(self, book_code: str) -> str:
+        """URL of the full-book ZIP NCERT publishes alongside the chapter PDFs."""
+        return f"{self.pdf_base_url}{book_code}dd.zip"
+
+    def _chapter_url(self, book_code: str, suffix: str) -> str:
+        return f"{self.pdf_base_url}{book_code}{suffix}.pdf"
+
+    def probe_chapter_count(self, book_code: str, refresh: bool = False) -> Optional[int]:
+        """
+        Finds how many chapter PDFs a book has without downloading any of them.
+
+        Gallops through chapters 1, 2, 4, 8, ... until one is missing, then
+        binary-searches the gap, so a 14-chapter book costs ~8 HEAD requests
+        instead of 20 GETs with retries. Assumes chapters are numbered
+        contiguously from 01. Results are cached per book code.
+
+        Returns None, and caches nothing, if a probe still fails after
+        polite_request's retries: the count is unknown, not zero.
+        """
+        cache = self._load_probe_cache()
+        if not refresh and book_code in cache:
+            return cache[book_code]["chapters"]
+
+        try:
+            count = self._probe(book_code)
+        except requests.RequestException as e:
+            logger.warning(f"Could not probe chapters of {book_code}: {e}")
+            return None
+
+        logger.info(f"Probed {book_code}: {count} chapters")
+        cache[book_code] = {"chapters": count, "probed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())}
+        self._save_probe_cache()
+        return count
+
+    def _probe(self, book_code: str) -> int:
+        if not self._chapter_exists(book_code, 1):
+            return 0
+        found, missing = 1, 2
+        while missing <= MAX_PROBE_CHAPTERS and self._chapter_exists(book_code, missing):
+            found, missing = missing, missing * 2
+        missing = min(missing, MAX_PROBE_CHAPTERS + 1)
+        # Invariant: chapter `found` exists, chapter `missing` does not.
+        while missing - found > 1:
+            mid = (found + missing) // 2
+            if self._chapter_exists(book_code, mid):
+                found = mid
+            else:
+                missing = mid
+        return found
+
+    def _chapter_exists(self, book_code: str, chapter: int) -> bool:
+        """
+        HEAD request for one chapter PDF. A 404 is a definite answer and is
+        never retried; other failures propagate so a flaky server does not
+        shrink the book.
+        """
+        url = self._chapter_url(book_code, f"{chapter:02d}")
+        self.probe_requests += 1
+        response = polite_request("HEAD", url, headers=DOWNLOAD_HEADERS, timeout=TIMEOUT, allow_redirects=True)
+        if response.status_code in (405, 501):
+            # Server does not do HEAD; ask for a single byte instead.
+            headers = {**DOWNLOAD_HEADERS, "Range": "bytes=0-0"}
+            with polite_request("GET", url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+                pass
+        if response.status_code == 404:
+            return False
+        response.raise_for_status()
+        return True
+
+    def _load_probe_cache(self) -> Dict[str, Dict]:
+        if self._probe_cache is None:
+            self._probe_cache = {}
+            if self.probe_cache_path.exists():
+                try:
+                    with open(self.probe_cache_path, "r", encoding="utf-8") as f:
+                        self._probe_cache = json.load(f)
+                except json.JSONDecodeError:
+                    logger.warning(f"Could not decode {self.probe_cache_path}, starting fresh.")
+        return self._probe_cache
+
+    def _save_probe_cache(self):
+        self.probe_cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.probe_cache_path, "w", encoding="utf-8") as f:
+            json.dump(self._probe_cache, f, indent=2, ensure_ascii=False)
+
 class CISCEScraper:
     def __init__(self):
         self.base_url = "https://cisce.org/publications/"
@@ -1,11 +1,20 @@
 import os
-import time
 import logging
 import requests
 import hashlib
+import json
+import re
 from pathlib import Path
-from typing import Optional
-from .config import HEADERS, REQUEST_DELAY, MAX_RETRIES, TIMEOUT
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from typing import Callable, ContextManager, Dict, Optional, Tuple
+from .config import (
+    DOWNLOAD_HEADERS, MAX_RETRIES, TIMEOUT,
+    PARALLEL_RANGE_THRESHOLD, PARALLEL_RANGE_PARTS,
+)
+from .ratelimit import get_rate_limiter
+from .session import polite_request
+from .manifest import DownloadManifest, get_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -17,7 +26,171 @@ def calculate_checksum(file_path: Path) -> str:
             sha256_hash.update(byte_block)
     return sha256_hash.hexdigest()
 
-def download_pdf(url: str, save_path: Path, overwrite: bool = False) -> Optional[Path]:
+def _stream_to_file(response: requests.Response, path: Path, mode: str = "wb", url: Optional[str] = None) -> int:
+    """
+    Writes a streamed response body to `path` and returns the bytes written.
+    A connection that breaks mid-body is reported to the rate limiter for
+    `url`, like a failed request, before the error propagates.
+    """
+    written = 0
+    with open(path, mode) as f:
+        try:
+            for chunk in response.iter_content(chunk_size=8192):
+                if chunk:
+                    f.write(chunk)
+                    written += len(chunk)
+        except requests.RequestException:
+            get_rate_limiter().record(url or response.url, None)
+            raise
+    return written
+
+class DownloadVerificationError(requests.RequestException):
+    """Raised when a finished or resumed transfer does not match what the server promised."""
+
+def is_final_error(error: requests.RequestException) -> bool:
+    """
+    True for client errors that will not change on retry (404 and friends).
+    Timeouts (408) and throttling (429) are still worth another attempt.
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return False
+    return 400 <= response.status_code < 500 and response.status_code not in (408, 429)
+
+def _parse_content_range(value: Optional[str]) -> Tuple[Optional[int], Optional[int]]:
+    """Parses 'bytes START-END/TOTAL' into (start, total)."""
+    match = re.match(r"bytes\s+(\d+)-\d+/(\d+|\*)", value or "")
+    if not match:
+        return None, None
+    total = match.group(2)
+    return int(match.group(1)), (int(total) if total != "*" else None)
+
+def _load_resume_state(url: str, temp_path: Path, state_path: Path) -> Tuple[int, Dict]:
+    """
+    Returns (offset, state) for a partial download that can safely be resumed.
+    A partial file is only reusable if it came from the same URL and the server
+    gave us a validator to check it against; otherwise we start from zero.
+    """
+    if not temp_path.exists() or not state_path.exists():
+        return 0, {}
+    try:
+        with open(state_path, "r", encoding="utf-8") as f:
+            state = json.load(f)
+    except json.JSONDecodeError:
+        return 0, {}
+    if state.get("url") != url or not (state.get("etag") or state.get("last_modified")):
+        return 0, {}
+    offset = temp_path.stat().st_size
+    if state.get("total") is not None and offset > state["total"]:
+        return 0, {}
+    return offset, state
+
+def _save_resume_state(url: str, state_path: Path, headers: Dict, total: Optional[int]):
+    state = {"url": url, "etag": headers.get("ETag"), "last_modified": headers.get("Last-Modified"), "total": total}
+    if not (state["etag"] or state["last_modified"]):
+        return
+    with open(state_path, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+
+def _discard_partial(temp_path: Path, state_path: Path):
+    for path in (temp_path, state_path):
+        if path.exists():
+            path.unlink()
+
+def _verify_download(temp_path: Path, total: Optional[int], expected_sha256: Optional[str]):
+    size = temp_path.stat().st_size
+    if total is not None and size != total:
+        raise DownloadVerificationError(f"Size mismatch for {temp_path}: got {size}, expected {total}")
+    if expected_sha256 and calculate_checksum(temp_path) != expected_sha256:
+        raise DownloadVerificationError(f"Checksum mismatch for {temp_path}")
+
+def _transfer(url: str, save_path: Path, manifest: DownloadManifest, refresh: bool = False,
+              reserve: Optional[Callable[[int], ContextManager]] = None,
+              expected_sha256: Optional[str] = None, throttle: bool = True) -> Optional[int]:
+    """
+    Performs one download attempt: GET (conditional if refreshing), stream the
+    body to a `.tmp` file, verify it, rename it into place and record it in the manifest.
+
+    A `.tmp` left by an interrupted attempt is resumed with a `Range` request.
+    `If-Range` carries the validator seen when it was started, so a file that
+    changed on the server comes back whole instead of being stitched on.
+
+    Args:
+        reserve: Optional callable taking the expected size and returning a
+            context manager held while the body streams (used for byte budgets).
+        expected_sha256: Checksum the finished file must match, if known.
+        throttle: Wait for the host's rate limiter first (callers that already
+            waited with `acquire_async` pass False).
+
+    Returns:
+        Bytes written, or None if the server reported the file unchanged (304).
+    """
+    temp_path = save_path.with_suffix(".tmp")
+    state_path = save_path.with_suffix(".resume")
+    headers = dict(DOWNLOAD_HEADERS)
+    if refresh:
+        headers.update(manifest.conditional_headers(url, save_path))
+
+    offset, state = _load_resume_state(url, temp_path, state_path)
+    validators = {"ETag": state.get("etag"), "Last-Modified": state.get("last_modified")}
+    if offset and offset == state.get("total"):
+        # A previous attempt got every byte but failed before the rename.
+        logger.info(f"Partial download of {url} is already complete")
+        written = 0
+    else:
+        if offset:
+            headers["Range"] = f"bytes={offset}-"
+            headers["If-Range"] = state.get("etag") or state["last_modified"]
+
+        # Callers retry whole attempts themselves, so polite_request must not retry underneath
+        with polite_request("GET", url, throttle=throttle, retries=0, headers=headers, stream=True,
+                            timeout=TIMEOUT) as response:
+            if response.status_code == 304:
+                logger.info(f"Not modified, keeping {save_path}")
+                manifest.mark_checked(url)
+                return None
+            if response.status_code == 416:
+                _discard_partial(temp_path, state_path)
+                raise DownloadVerificationError(f"Server rejected resume of {url} at byte {offset}")
+            response.raise_for_status()
+
+            if response.status_code == 206:
+                start, total = _parse_content_range(response.headers.get("Content-Range"))
+                if start != offset or (state.get("total") is not None and total != state["total"]):
+                    _discard_partial(temp_path, state_path)
+                    raise DownloadVerificationError(f"Unexpected Content-Range for {url}")
+                logger.info(f"Resuming {url} at byte {offset}")
+                mode = "ab"
+            else:
+                # Full body: either a fresh start or the server says the file changed.
+                if offset:
+                    logger.info(f"Server sent a new copy of {url}, discarding partial file")
+                offset, mode = 0, "wb"
+                _discard_partial(temp_path, state_path)
+                length = response.headers.get("Content-Length")
+                total = int(length) if length else None
+                _save_resume_state(url, state_path, response.headers, total)
+
+            validators = {"ETag": response.headers.get("ETag"), "Last-Modified": response.headers.get("Last-Modified")}
+            with (reserve(total - offset if total else 0) if reserve else nullcontext()):
+                written = _stream_to_file(response, temp_path, mode, url)
+        state["total"] = total
+
+    try:
+        _verify_download(temp_path, state.get("total"), expected_sha256)
+    except DownloadVerificationError:
+        _discard_partial(temp_path, state_path)
+        raise
+
+    # Rename temp file to actual file
+    temp_path.replace(save_path)
+    if state_path.exists():
+        state_path.unlink()
+    manifest.record(url, save_path, {k: v for k, v in validators.items() if v})
+    return written
+
+def download_pdf(url: str, save_path: Path, overwrite: bool = False, refresh: bool = False,
+                 manifest: Optional[DownloadManifest] = None, expected_sha256: Optional[str] = None) -> Optional[Path]:
     """
     Downloads a PDF from a URL to the specified path.
     
@@ -25,42 +198,106 @@ def download_pdf(url: str, save_path: Path, overwrite: bool = False) -> Optional
         url: The URL to download from.
         save_path: The local path to save the file.
         overwrite: Whether to overwrite existing files.
+        refresh: Re-validate an existing file against the server with a
+            conditional request and only download it again if it changed.
+        manifest: Download manifest to consult and update (defaults to the shared one).
+        expected_sha256: Checksum the downloaded file must match, if known.
+        
+    Interrupted transfers leave their `.tmp` file in place and the next
+    attempt (or run) resumes it with a Range request.
         
     Returns:
         Path to the saved file if successful, None otherwise.
     """
-    if save_path.exists() and not overwrite:
+    if save_path.exists() and not overwrite and not refresh:
         logger.info(f"File already exists: {save_path}")
         return save_path
 
     save_path.parent.mkdir(parents=True, exist_ok=True)
-    
-    temp_path = save_path.with_suffix(".tmp")
+    manifest = manifest or get_manifest()
     
     for attempt in range(MAX_RETRIES):
         try:
             logger.info(f"Downloading {url} (Attempt {attempt + 1}/{MAX_RETRIES})")
-            response = requests.get(url, headers=HEADERS, stream=True, timeout=TIMEOUT)
-            response.raise_for_status()
-            
-            with open(temp_path, "wb") as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-            
-            # Rename temp file to actual file
-            temp_path.rename(save_path)
-            logger.info(f"Successfully downloaded: {save_path}")
-            
-            # Polite delay
-            time.sleep(REQUEST_DELAY)
+            written = _transfer(url, save_path, manifest, refresh=refresh and not overwrite,
+                                expected_sha256=expected_sha256)
+            if written is not None:
+                logger.info(f"Successfully downloaded: {save_path}")
             return save_path
             
         except requests.RequestException as e:
+            # No sleep here: the rate limiter has already slowed this host down
+            # (and honours Retry-After) before the next attempt goes out.
             logger.error(f"Error downloading {url}: {e}")
-            if temp_path.exists():
-                temp_path.unlink()
-            time.sleep(REQUEST_DELAY * (attempt + 1))
+            if is_final_error(e):
+                return None
             
     logger.error(f"Failed to download {url} after {MAX_RETRIES} attempts")
     return None
+
+def download_in_ranges(url: str, save_path: Path, parts: int = PARALLEL_RANGE_PARTS,
+                       manifest: Optional[DownloadManifest] = None,
+                       expected_sha256: Optional[str] = None) -> Optional[Path]:
+    """
+    Downloads a large file as several byte ranges in parallel.
+
+    Falls back to `download_pdf` when the file is smaller than
+    PARALLEL_RANGE_THRESHOLD or the server does not advertise range support
+    and a validator to pin the ranges to one version of the file.
+    """
+    manifest = manifest or get_manifest()
+    try:
+        head = polite_request("HEAD", url, headers=DOWNLOAD_HEADERS, timeout=TIMEOUT, allow_redirects=True)
+        head.raise_for_status()
+    except requests.RequestException as e:
+        logger.error(f"Error probing {url}: {e}")
+        return None
+
+    size = int(head.headers.get("Content-Length") or 0)
+    validator = head.headers.get("ETag") or head.headers.get("Last-Modified")
+    if head.headers.get("Accept-Ranges") != "bytes" or not validator or size < PARALLEL_RANGE_THRESHOLD:
+        return download_pdf(url, save_path, overwrite=True, manifest=manifest, expected_sha256=expected_sha256)
+
+    save_path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = save_path.with_suffix(".tmp")
+
+    step = -(-size // parts)
+    ranges = [(start, min(start + step, size) - 1) for start in range(0, size, step)]
+
+    def fetch_range(bounds: Tuple[int, int]):
+        start, end = bounds
+        headers = {**DOWNLOAD_HEADERS, "Range": f"bytes={start}-{end}", "If-Range": validator}
+        with polite_request("GET", url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+            if response.status_code != 206:
+                raise DownloadVerificationError(f"Range {start}-{end} of {url} not served (HTTP {response.status_code})")
+            served_start, _ = _parse_content_range(response.headers.get("Content-Range"))
+            if served_start != start:
+                raise DownloadVerificationError(f"Range {start}-{end} of {url} answered with "
+                                                f"Content-Range {response.headers.get('Content-Range')!r}")
+            with open(temp_path, "r+b") as f:
+                f.seek(start)
+                try:
+                    for chunk in response.iter_content(chunk_size=8192):
+                        f.write(chunk)
+                except requests.RequestException:
+                    get_rate_limiter().record(url, None)
+                    raise
+
+    logger.info(f"Downloading {url} in {len(ranges)} parallel ranges ({size} bytes)")
+    try:
+        with open(temp_path, "wb") as f:
+            f.truncate(size)
+        with ThreadPoolExecutor(max_workers=len(ranges)) as pool:
+            list(pool.map(fetch_range, ranges))
+        _verify_download(temp_path, size, expected_sha256)
+        temp_path.replace(save_path)
+    except requests.RequestException as e:
+        logger.error(f"Error downloading {url}: {e}")
+        return None
+    finally:
+        # Ranges are not resumable, so a failed attempt's file is never reused
+        temp_path.unlink(missing_ok=True)
+
+    manifest.record(url, save_path, head.headers)
+    logger.info(f"Successfully downloaded: {save_path}")
+    return save_path
@@ -0,0 +1,175 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+from .config import DOWNLOAD_MANIFEST_PATH, DOWNLOAD_HEADERS, TIMEOUT
+from .session import polite_request
+
+logger = logging.getLogger(__name__)
+
+_shared_manifest = None
+_manifest_lock = threading.Lock()
+
+class DownloadManifest:
+    """
+    Records what was downloaded from each URL: local path, ETag, Last-Modified,
+    size and SHA-256. Used to send conditional requests on refresh so unchanged
+    files cost a 304 instead of a full transfer.
+
+    Every change is written to disk at once, except inside `deferred()`,
+    where changes are written once when the outermost block exits.
+    """
+    def __init__(self, path: Path = DOWNLOAD_MANIFEST_PATH):
+        self.path = path
+        self._lock = threading.RLock()
+        self._deferred = 0
+        self._dirty = False
+        self.entries: Dict[str, Dict] = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        if not self.path.exists():
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            logger.warning(f"Could not decode {self.path}, starting fresh.")
+            return {}
+
+    def save(self):
+        # Writing and renaming under the lock keeps concurrent saves from sharing
+        # the temp file or replacing a newer manifest with an older one.
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(self.entries, f, indent=2, ensure_ascii=False)
+            temp_path.replace(self.path)
+            self._dirty = False
+
+    @contextmanager
+    def deferred(self):
+        """Batches the saves of `record` and `mark_checked` into one write when the block exits."""
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                if not self._deferred and self._dirty:
+                    self.save()
+
+    def _changed(self):
+        with self._lock:
+            if self._deferred:
+                self._dirty = True
+            else:
+                self.save()
+
+    def get(self, url: str) -> Optional[Dict]:
+        with self._lock:
+            return self.entries.get(url)
+
+    def conditional_headers(self, url: str, save_path: Path) -> Dict[str, str]:
+        """
+        Returns If-None-Match / If-Modified-Since headers for a URL, or {} if
+        there is no usable record (unknown URL, or the local copy is gone or altered).
+        """
+        entry = self.get(url)
+        if not entry or not save_path.exists() or save_path.stat().st_size != entry.get("size"):
+            return {}
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record(self, url: str, save_path: Path, response_headers: Dict) -> Dict:
+        """Records a completed download and persists the manifest."""
+        from .fetch_pdfs import calculate_checksum
+        entry = {
+            "url": url,
+            "path": str(save_path),
+            "etag": response_headers.get("ETag"),
+            "last_modified": response_headers.get("Last-Modified"),
+            "size": save_path.stat().st_size,
+            "sha256": calculate_checksum(save_path),
+            "downloaded_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        }
+        entry["checked_at"] = entry["downloaded_at"]
+        with self._lock:
+            self.entries[url] = entry
+        self._changed()
+        return entry
+
+    def mark_checked(self, url: str):
+        with self._lock:
+            if url in self.entries:
+                self.entries[url]["checked_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        self._changed()
+
+def get_manifest() -> DownloadManifest:
+    """Returns the process-wide manifest stored next to PDF_DIR."""
+    global _shared_manifest
+    with _manifest_lock:
+        if _shared_manifest is None:
+            _shared_manifest = DownloadManifest()
+        return _shared_manifest
+
+def check_for_updates(manifest: Optional[DownloadManifest] = None, urls: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Checks recorded URLs for republished files without downloading them.
+
+    Sends a conditional HEAD per URL. A 304, or a 200 whose validators and size
+    match the manifest, means unchanged. Only headers cross the wire.
+
+    Returns:
+        List of manifest entries whose remote file has changed or disappeared,
+        each with a "status" field.
+    """
+    manifest = manifest or get_manifest()
+    urls = urls if urls is not None else list(manifest.entries.keys())
+    changed = []
+    with manifest.deferred():
+        for url in urls:
+            entry = manifest.get(url)
+            if not entry:
+                continue
+            headers = {**DOWNLOAD_HEADERS, **manifest.conditional_headers(url, Path(entry["path"]))}
+            try:
+                response = polite_request("HEAD", url, headers=headers, timeout=TIMEOUT, allow_redirects=True)
+            except Exception as e:
+                logger.error(f"Failed to check {url}: {e}")
+                continue
+
+            if response.status_code == 304:
+                manifest.mark_checked(url)
+                continue
+            if response.status_code == 200 and _same_validators(entry, response.headers):
+                manifest.mark_checked(url)
+                continue
+
+            logger.info(f"Remote file changed: {url} (HTTP {response.status_code})")
+            changed.append({**entry, "status": response.status_code})
+    return changed
+
+def _same_validators(entry: Dict, headers: Dict) -> bool:
+    """Fallback for servers that ignore conditional HEAD requests."""
+    etag = headers.get("ETag")
+    if etag and entry.get("etag"):
+        return etag == entry["etag"]
+    last_modified = headers.get("Last-Modified")
+    length = headers.get("Content-Length")
+    if last_modified and entry.get("last_modified"):
+        return last_modified == entry["last_modified"] and (length is None or int(length) == entry.get("size"))
+    return False
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    for entry in check_for_updates():
+        print(f"{entry['status']} {entry['url']}")
@@ -0,0 +1,146 @@
+import asyncio
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+from urllib.parse import urlparse
+from .config import (
+    RATE_LIMIT_INITIAL, RATE_LIMIT_MIN, RATE_LIMIT_MAX, RATE_LIMIT_BURST,
+    RATE_LIMIT_TARGET_LATENCY, RATE_LIMIT_INCREASE, RATE_LIMIT_DECREASE,
+)
+
+logger = logging.getLogger(__name__)
+
+_shared_limiter = None
+_limiter_lock = threading.Lock()
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+
+class HostRateLimiter:
+    """
+    Per-host token bucket that adapts its rate to how the server is doing.
+
+    Each host gets `burst` tokens refilled at `rate` per second. The rate grows
+    additively while responses are fast and healthy, and is cut
+    multiplicatively on slow responses, 429, 5xx or connection errors.
+    `Retry-After` pauses the host outright: requests queued behind it keep
+    their spacing and start after the pause instead of all at once.
+
+    Tokens are reserved under a lock and the wait happens outside it, so the
+    same limiter can be shared by threads (`acquire`) and asyncio tasks
+    (`acquire_async`).
+    """
+    def __init__(self, rate: float = RATE_LIMIT_INITIAL, burst: int = RATE_LIMIT_BURST,
+                 min_rate: float = RATE_LIMIT_MIN, max_rate: float = RATE_LIMIT_MAX,
+                 target_latency: float = RATE_LIMIT_TARGET_LATENCY):
+        self.initial_rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.target_latency = target_latency
+        self._buckets: Dict[str, _Bucket] = {}
+        self._lock = threading.Lock()
+
+    def _bucket(self, host: str) -> _Bucket:
+        if host not in self._buckets:
+            self._buckets[host] = _Bucket(self.initial_rate, self.burst)
+        return self._buckets[host]
+
+    def _reserve(self, url: str) -> float:
+        """Takes a token for the host and returns how long the caller must wait before using it."""
+        host = _host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            # No tokens are refilled while the host is paused (`updated` is then in the future)
+            bucket.tokens = min(self.burst, bucket.tokens + max(0.0, now - bucket.updated) * bucket.rate)
+            bucket.updated = max(bucket.updated, now)
+            bucket.tokens -= 1
+            # A negative balance is a queue of reservations waiting for refill, after any pause.
+            wait = -bucket.tokens / bucket.rate if bucket.tokens < 0 else 0.0
+            return wait + max(0.0, bucket.blocked_until - now)
+
+    def acquire(self, url: str):
+        """Blocks the calling thread until a request to the URL's host is allowed."""
+        wait = self._reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self, url: str):
+        """Waits (without blocking the event loop) until a request to the URL's host is allowed."""
+        wait = self._reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def record(self, url: str, status_code: Optional[int] = None, latency: Optional[float] = None,
+               retry_after: Optional[str] = None):
+        """
+        Feeds back the outcome of a request.
+
+        Args:
+            status_code: HTTP status, or None if the request failed to connect
+                or its body could not be read.
+            latency: Seconds until the response headers arrived.
+            retry_after: Raw Retry-After header value, if any.
+        """
+        host = _host(url)
+        with self._lock:
+            bucket = self._bucket(host)
+            now = time.monotonic()
+            if status_code is None or status_code == 429 or status_code >= 500:
+                bucket.rate = max(self.min_rate, bucket.rate * RATE_LIMIT_DECREASE)
+                bucket.tokens = min(bucket.tokens, 0.0)
+                delay = _parse_retry_after(retry_after)
+                if delay:
+                    bucket.blocked_until = max(bucket.blocked_until, now + delay)
+                    bucket.updated = max(bucket.updated, bucket.blocked_until)
+                logger.info(f"Backing off {host}: {bucket.rate:.2f} req/s (HTTP {status_code})")
+            elif latency is not None and latency > 2 * self.target_latency:
+                bucket.rate = max(self.min_rate, bucket.rate * RATE_LIMIT_DECREASE)
+            elif latency is None or latency <= self.target_latency:
+                bucket.rate = min(self.max_rate, bucket.rate + RATE_LIMIT_INCREASE)
+
+    def record_response(self, url: str, response):
+        """Convenience wrapper around `record` for a requests.Response."""
+        self.record(url, response.status_code, response.elapsed.total_seconds(), response.headers.get("Retry-After"))
+
+    def rate(self, url: str) -> float:
+        """Current allowed requests per second for the URL's host."""
+        with self._lock:
+            return self._bucket(_host(url)).rate
+
+def _host(url: str) -> str:
+    return urlparse(url).netloc or url
+
+def _parse_retry_after(value: Optional[str]) -> float:
+    """Retry-After is either delta-seconds or an HTTP date."""
+    if not value:
+        return 0.0
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return 0.0
+
+def get_rate_limiter() -> HostRateLimiter:
+    """Returns the process-wide limiter shared by the scraper and downloaders."""
+    global _shared_limiter
+    with _limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = HostRateLimiter()
+        return _shared_limiter
+
+def set_rate_limiter(limiter: HostRateLimiter):
+    """Replaces the shared limiter, e.g. to loosen it against a local mirror."""
+    global _shared_limiter
+    with _limiter_lock:
+        _shared_limiter = limiter
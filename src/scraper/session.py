@@ -0,0 +1,107 @@
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from typing import Dict, Optional
+from .ratelimit import get_rate_limiter
+from .config import (
+    HEADERS, POOL_CONNECTIONS, POOL_MAXSIZE, HOST_POOL_SIZES,
+    RETRY_TOTAL, RETRY_STATUS_FORCELIST,
+)
+
+logger = logging.getLogger(__name__)
+
+_shared_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+def _make_adapter(pool_maxsize: int) -> HTTPAdapter:
+    # No urllib3 retries: they would go out without waiting for the rate limiter.
+    # polite_request retries instead.
+    return HTTPAdapter(pool_connections=POOL_CONNECTIONS, pool_maxsize=pool_maxsize, max_retries=0)
+
+def create_session(pool_maxsize: int = POOL_MAXSIZE, host_pool_sizes: Optional[Dict[str, int]] = None) -> requests.Session:
+    """
+    Creates a keep-alive session with pooled connections.
+
+    Args:
+        pool_maxsize: Connections kept open per host by the default adapter.
+        host_pool_sizes: Per-host overrides, e.g. {"ncert.nic.in": 8}.
+    """
+    session = requests.Session()
+    session.headers.update(HEADERS)
+
+    default_adapter = _make_adapter(pool_maxsize)
+    session.mount("http://", default_adapter)
+    session.mount("https://", default_adapter)
+
+    host_pool_sizes = HOST_POOL_SIZES if host_pool_sizes is None else host_pool_sizes
+    for host, size in host_pool_sizes.items():
+        adapter = _make_adapter(size)
+        session.mount(f"http://{host}/", adapter)
+        session.mount(f"https://{host}/", adapter)
+    return session
+
+def get_session() -> requests.Session:
+    """Returns the process-wide session shared by the scraper and downloaders."""
+    global _shared_session
+    with _session_lock:
+        if _shared_session is None:
+            _shared_session = create_session()
+        return _shared_session
+
+def polite_request(method: str, url: str, throttle: bool = True, retries: int = RETRY_TOTAL,
+                   **kwargs) -> requests.Response:
+    """
+    Sends a request through the shared session and rate limiter.
+
+    Waits for the host's token bucket (unless the caller already did, e.g.
+    with `acquire_async`), then reports the outcome back so the limiter can
+    adapt. GET and HEAD requests that fail to connect or get a
+    RETRY_STATUS_FORCELIST response are retried up to `retries` times, each
+    retry waiting for the limiter again (which has slowed down and honours
+    Retry-After). Callers with their own retry loop pass `retries=0`.
+    Other keyword arguments go to `Session.request`.
+    """
+    limiter = get_rate_limiter()
+    if method.upper() not in ("GET", "HEAD"):
+        retries = 0
+    for attempt in range(retries + 1):
+        if throttle or attempt:
+            limiter.acquire(url)
+        try:
+            response = get_session().request(method, url, **kwargs)
+        except requests.RequestException as e:
+            limiter.record(url, None)
+            if attempt < retries and isinstance(e, (requests.ConnectionError, requests.Timeout)):
+                logger.info(f"Retrying {method} {url} after {e}")
+                continue
+            raise
+        limiter.record_response(url, response)
+        if attempt < retries and response.status_code in RETRY_STATUS_FORCELIST:
+            logger.info(f"Retrying {method} {url} after HTTP {response.status_code}")
+            response.close()
+            continue
+        return response
+
+def connection_stats(session: Optional[requests.Session] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Reports connection reuse per host from the session's urllib3 pools.
+
+    Returns:
+        Dict of host -> {"connections": opened, "requests": sent, "reused": requests on an existing connection}.
+    """
+    session = session or get_session()
+    stats: Dict[str, Dict[str, int]] = {}
+    adapters = {id(a): a for a in session.adapters.values()}.values()
+    for adapter in adapters:
+        pools = adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            host = f"{pool.host}:{pool.port}" if pool.port else pool.host
+            entry = stats.setdefault(host, {"connections": 0, "requests": 0, "reused": 0})
+            entry["connections"] += pool.num_connections
+            entry["requests"] += pool.num_requests
+            entry["reused"] = max(entry["requests"] - entry["connections"], 0)
+    return stats
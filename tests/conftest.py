@@ -0,0 +1,204 @@
+import re
+import threading
+import time
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class StubServer:
+    """
+    Local HTTP/1.1 server for scraper tests.
+    Serves `files` (path -> bytes), counts requests and tracks peak concurrency.
+    """
+    def __init__(self):
+        self.files = {}
+        self.etags = {}  # path -> ETag; enables conditional and ranged requests for that path
+        self.cut_after = {}  # path -> bytes; the next GET of that path drops the connection mid-body
+        self.statuses = {}  # path -> status codes answered (without a body) before the file is served
+        self.range_shift = {}  # path -> bytes; ranged responses start this far past the requested offset
+        self.latency = 0.0
+        self.requests = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def _make_handler(stub):
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _serve(self, send_body: bool):
+                with stub.lock:
+                    stub.active += 1
+                    stub.peak = max(stub.peak, stub.active)
+                    stub.requests.append((self.command, self.path, dict(self.headers)))
+                try:
+                    if stub.latency:
+                        time.sleep(stub.latency)
+                    body = stub.files.get(self.path)
+                    queued = stub.statuses.get(self.path)
+                    if queued:
+                        self.send_response(queued.pop(0))
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    if body is None:
+                        self.send_response(404)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    etag = stub.etags.get(self.path)
+                    if etag and self.headers.get("If-None-Match") == etag:
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.send_header("Content-Length", "0")
+                        self.end_headers()
+                        return
+                    status, start, end = 200, 0, len(body) - 1
+                    match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+                    if_range = self.headers.get("If-Range")
+                    if match and etag and (if_range is None or if_range == etag):
+                        status, start = 206, int(match.group(1)) + stub.range_shift.get(self.path, 0)
+                        end = int(match.group(2)) if match.group(2) else end
+                    self.send_response(status)
+                    if etag:
+                        self.send_header("ETag", etag)
+                        self.send_header("Accept-Ranges", "bytes")
+                    if status == 206:
+                        self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+                    self.send_header("Content-Length", str(end - start + 1))
+                    self.end_headers()
+                    if send_body:
+                        cut = stub.cut_after.pop(self.path, None)
+                        if cut is not None:
+                            self.wfile.write(body[start:start + cut])
+                            self.close_connection = True
+                            return
+                        self.wfile.write(body[start:end + 1])
+                finally:
+                    with stub.lock:
+                        stub.active -= 1
+
+            def do_GET(self):
+                self._serve(send_body=True)
+
+            def do_HEAD(self):
+                self._serve(send_body=False)
+
+            def log_message(self, *args):
+                pass
+        return Handler
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+@pytest.fixture
+def stub_server():
+    server = StubServer()
+    server.start()
+    yield server
+    server.stop()
+
+@pytest.fixture(autouse=True)
+def isolated_manifest(tmp_path, monkeypatch):
+    """Keeps tests from writing to the real download manifest under data/."""
+    from src.scraper import manifest
+    isolated = manifest.DownloadManifest(tmp_path / "download_manifest.json")
+    monkeypatch.setattr(manifest, "_shared_manifest", isolated)
+    return isolated
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    """Swaps the polite production rate limiter for one that never waits."""
+    from src.scraper import ratelimit
+    monkeypatch.setattr(ratelimit, "_shared_limiter", ratelimit.HostRateLimiter(rate=1000, burst=1000, max_rate=1000))
+
+@pytest.fixture(autouse=True)
+def isolated_ocr_cache(tmp_path, monkeypatch):
+    """Keeps tests from reading or writing the real OCR cache under data/cache."""
+    from src.parser import ocr_cache
+    isolated = ocr_cache.OCRCache(tmp_path / "ocr.sqlite")
+    monkeypatch.setattr(ocr_cache, "_shared_cache", isolated)
+    yield isolated
+    isolated.close()
+
+@pytest.fixture(autouse=True)
+def isolated_parsed_dir(tmp_path, monkeypatch):
+    """Keeps parser tests from overwriting the tracked samples under data/parsed."""
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path / "parsed")
+
+def _add_text(pdf, page, text, x, y, size=12):
+    import ctypes
+    import pypdfium2.raw as pdfium_c
+    obj = pdfium_c.FPDFPageObj_NewTextObj(pdf.raw, b"Helvetica", ctypes.c_float(size))
+    encoded = ctypes.create_string_buffer((text + "\0").encode("utf-16-le"))
+    pdfium_c.FPDFText_SetText(obj, ctypes.cast(encoded, ctypes.POINTER(pdfium_c.FPDF_WCHAR)))
+    pdfium_c.FPDFPageObj_Transform(obj, 1, 0, 0, 1, x, y)
+    pdfium_c.FPDFPage_InsertObject(page.raw, obj)
+
+def _add_image(pdf, page, x, y, w, h, image):
+    import pypdfium2 as pdfium
+    obj = pdfium.PdfImage.new(pdf)
+    obj.set_bitmap(pdfium.PdfBitmap.from_pil(image))
+    obj.set_matrix(pdfium.PdfMatrix().scale(w, h).translate(x, y))
+    page.insert_obj(obj)
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """
+    Three US Letter pages: a text page, a full-page scan (an image, no text)
+    and a mixed page with a line of text above a large image.
+    """
+    import pypdfium2 as pdfium
+    from PIL import Image
+    line = "Ordinary body text on a digital page, long enough to count as text."
+    pdf = pdfium.PdfDocument.new()
+    page = pdf.new_page(612, 792)
+    _add_text(pdf, page, line, 72, 700)
+    page.gen_content()
+    page = pdf.new_page(612, 792)
+    _add_image(pdf, page, 0, 0, 612, 792, Image.new("RGB", (120, 160), "white"))
+    page.gen_content()
+    page = pdf.new_page(612, 792)
+    _add_text(pdf, page, line, 72, 700)
+    _add_image(pdf, page, 72, 100, 468, 500, Image.new("RGB", (120, 120), "white"))
+    page.gen_content()
+    path = tmp_path / "mixed.pdf"
+    pdf.save(str(path))
+    return path
+
+def _write_pdf(path, objects):
+    """Writes `objects` (PDF object bodies, numbered from 1; 1 is the catalog) with a valid xref table."""
+    out = bytearray(b"%PDF-1.7\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{body}\nendobj\n".encode("latin-1")
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode("latin-1")
+    out += b"".join(f"{offset:010d} 00000 n \n".encode("latin-1") for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode("latin-1")
+    path.write_bytes(bytes(out))
+    return path
+
+@pytest.fixture
+def outlined_pdf(tmp_path):
+    """
+    Five blank pages labelled i, ii, 1, 2, 3 with an outline: a book-title
+    bookmark holding "Real Numbers" (a /Dest to page 3) and "Polynomials"
+    (a GoTo action to page 5).
+    """
+    pages = [7, 8, 9, 10, 11]
+    return _write_pdf(tmp_path / "outlined.pdf", [
+        "<< /Type /Catalog /Pages 2 0 R /Outlines 3 0 R /PageLabels << /Nums [0 << /S /r >> 2 << /S /D >>] >> >>",
+        f"<< /Type /Pages /Kids [{' '.join(f'{p} 0 R' for p in pages)}] /Count 5 >>",
+        "<< /Type /Outlines /First 4 0 R /Last 4 0 R /Count 3 >>",
+        "<< /Title (Mathematics) /Parent 3 0 R /First 5 0 R /Last 6 0 R /Count 2 /Dest [7 0 R /Fit] >>",
+        "<< /Title (Real Numbers) /Parent 4 0 R /Next 6 0 R /Dest [9 0 R /Fit] >>",
+        "<< /Title (Polynomials) /Parent 4 0 R /Prev 5 0 R /A << /S /GoTo /D [11 0 R /Fit] >> >>",
+    ] + ["<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] >>"] * 5)
@@ -0,0 +1,45 @@
+import zipfile
+import pytest
+from pathlib import Path
+from src.scraper.archive import BookArchive
+from src.parser.pdf_parser import PDFParser
+
+SAMPLE_PDF = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+@pytest.fixture
+def book_zip(tmp_path):
+    zip_path = tmp_path / "abcd1dd.zip"
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.write(SAMPLE_PDF, "abcd1dd/abcd101.pdf", compress_type=zipfile.ZIP_STORED)
+        zf.write(SAMPLE_PDF, "abcd1dd/abcd102.pdf", compress_type=zipfile.ZIP_DEFLATED)
+        zf.writestr("abcd1dd/readme.txt", "not a chapter")
+    return zip_path
+
+def test_iter_pdfs_reads_members_in_place(book_zip):
+    expected = SAMPLE_PDF.read_bytes()
+    with BookArchive(book_zip) as archive:
+        assert archive.verify()
+        members = [(name, stream.read()) for name, stream in archive.iter_pdfs()]
+
+    assert [name for name, _ in members] == ["abcd101.pdf", "abcd102.pdf"]
+    assert all(data == expected for _, data in members)
+    assert not list(book_zip.parent.glob("*.pdf"))
+
+def test_corrupt_stored_member_is_rejected(book_zip):
+    data = bytearray(book_zip.read_bytes())
+    offset = data.find(b"%PDF")
+    data[offset + 100] ^= 0xFF
+    book_zip.write_bytes(bytes(data))
+
+    with BookArchive(book_zip) as archive:
+        with pytest.raises(zipfile.BadZipFile):
+            list(archive.iter_pdfs())
+
+def test_parser_reads_zip_member(book_zip, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path / "parsed")
+    with BookArchive(book_zip) as archive:
+        name, stream = next(archive.iter_pdfs())
+        result = PDFParser(book_zip / name, Path(name).stem, stream=stream).parse()
+
+    assert len(result["pages"]) > 0
+    assert (tmp_path / "parsed" / "abcd101" / "pages.json").exists()
@@ -0,0 +1,67 @@
+import time
+from unittest.mock import patch
+import pytest
+from src.scraper import async_fetch
+from src.scraper.async_fetch import AsyncDownloader, fetch_all
+
+PAYLOAD = b"%PDF-1.4\n" + b"x" * 4096
+
+def test_fetch_all_downloads_concurrently(stub_server, tmp_path):
+    stub_server.latency = 0.05
+    for i in range(8):
+        stub_server.files[f"/book{i:02d}.pdf"] = PAYLOAD
+    jobs = [(f"{stub_server.url}/book{i:02d}.pdf", tmp_path / f"book{i:02d}.pdf") for i in range(8)]
+    downloader = AsyncDownloader(max_concurrent=8, max_per_host=3)
+
+    results = list(fetch_all(jobs, downloader=downloader))
+    downloader.close()
+
+    assert len(results) == 8
+    assert all(r["path"] is not None for r in results)
+    assert all(p.read_bytes() == PAYLOAD for _, p in jobs)
+    assert not list(tmp_path.glob("*.tmp"))
+    assert 1 < stub_server.peak <= 3
+    assert downloader.stats["bytes"] == 8 * len(PAYLOAD)
+
+def test_fetch_all_reports_failures(stub_server, tmp_path):
+    jobs = [(f"{stub_server.url}/missing.pdf", tmp_path / "missing.pdf")]
+
+    results = list(fetch_all(jobs))
+
+    assert results[0]["path"] is None
+    assert results[0]["error"]
+    assert not (tmp_path / "missing.pdf").exists()
+
+def test_unexpected_error_fails_only_its_job(stub_server, tmp_path):
+    for name in ("a", "b"):
+        stub_server.files[f"/{name}.pdf"] = PAYLOAD
+    jobs = [(f"{stub_server.url}/{name}.pdf", tmp_path / f"{name}.pdf") for name in ("a", "b")]
+    real_transfer = async_fetch._transfer
+
+    def transfer(url, *args):
+        if url.endswith("/a.pdf"):
+            raise OSError("disk full")
+        return real_transfer(url, *args)
+
+    with patch.object(async_fetch, "_transfer", side_effect=transfer):
+        results = {r["url"]: r for r in fetch_all(jobs)}
+
+    assert results[jobs[0][0]]["path"] is None
+    assert "disk full" in results[jobs[0][0]]["error"]
+    assert results[jobs[1][0]]["path"] == jobs[1][1]
+
+def test_closing_fetch_all_early_cancels_pending_downloads(stub_server, tmp_path):
+    stub_server.latency = 0.2
+    for i in range(6):
+        stub_server.files[f"/book{i}.pdf"] = PAYLOAD
+    jobs = [(f"{stub_server.url}/book{i}.pdf", tmp_path / f"book{i}.pdf") for i in range(6)]
+    downloader = AsyncDownloader(max_concurrent=1, max_per_host=1)
+
+    results = fetch_all(jobs, downloader=downloader)
+    next(results)
+    started = time.perf_counter()
+    results.close()
+    downloader.close()
+
+    assert time.perf_counter() - started < 0.5
+    assert downloader.stats["files"] < 4
@@ -0,0 +1,38 @@
+import io
+import pytest
+from pathlib import Path
+from src.extractor.headings import HeadingExtractor
+from src.parser.backends import get_backend
+from src.parser.pdf_parser import PDFParser
+
+SAMPLE = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+def test_pdfium_matches_pdfplumber_schema_and_text(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    plumber = PDFParser(SAMPLE, "plumber").parse()
+    pdfium = PDFParser(SAMPLE, "pdfium", backend="pdfium").parse()
+
+    assert [p["text"] for p in pdfium["pages"]] == [p["text"] for p in plumber["pages"]]
+    for plumber_page, pdfium_page in zip(plumber["layout"], pdfium["layout"]):
+        assert len(pdfium_page["chars"]) == len(plumber_page["chars"])
+        for a, b in zip(plumber_page["chars"], pdfium_page["chars"]):
+            assert b["text"] == a["text"]
+            assert b["fontname"] == a["fontname"]
+            assert b["size"] == pytest.approx(a["size"])
+            for key in ("x0", "x1", "top", "bottom", "doctop"):
+                assert b[key] == pytest.approx(a[key], abs=1.0)
+
+    assert (HeadingExtractor(pdfium["pages"], pdfium["layout"]).detect_by_fontsize()
+            == HeadingExtractor(plumber["pages"], plumber["layout"]).detect_by_fontsize())
+
+def test_pdfium_reads_streams():
+    with get_backend("pdfium").open(io.BytesIO(SAMPLE.read_bytes())) as pdf:
+        assert len(pdf.pages) == 5
+        page = pdf.pages[-1]
+        assert page.extract_text() == "Chapter 2\nPolynomials"
+        assert page.to_image(resolution=36).original.size == (306, 396)
+        page.close()
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError):
+        get_backend("poppler")
@@ -0,0 +1,98 @@
+from unittest.mock import patch
+from src.extractor.cascade import ChapterCascade, is_consistent
+from src.extractor.headings import HeadingExtractor
+from src.parser.folios import PageNumberIndex
+
+def _pages(texts):
+    return [{"page_num": i, "text": text} for i, text in enumerate(texts, start=1)]
+
+def test_consistent_outline_skips_every_text_strategy(outlined_pdf):
+    pages = _pages(["", "", "Chapter 1 Real Numbers", "text", "Chapter 2 Polynomials"])
+    with patch.object(HeadingExtractor, "detect_by_fontsize") as fontsize, \
+            patch.object(HeadingExtractor, "detect_by_regex") as regex:
+        cascade = ChapterCascade(pages, [], pdf_source=outlined_pdf)
+        chapters = cascade.run()
+
+    assert [(ch["chapter_name"], ch["start_page"], ch["end_page"]) for ch in chapters] == [
+        ("Real Numbers", 3, 4), ("Polynomials", 5, 5)]
+    assert list(cascade.stats["ran"]) == ["outline"]
+    assert cascade.stats["accepted"] == {"outline": 1}
+    fontsize.assert_not_called()
+    regex.assert_not_called()
+
+def test_regex_headings_stop_before_font_pass():
+    # The printed ToC points past the end of this 4-page segment, so it is rejected
+    pages = _pages(["Contents\nReal Numbers ..... 12\nPolynomials ..... 30", "Chapter 1 Real Numbers",
+                    "text", "Chapter 2 Polynomials"])
+    with patch.object(HeadingExtractor, "detect_by_fontsize") as fontsize:
+        cascade = ChapterCascade(pages, [])
+        chapters = cascade.run()
+
+    assert [ch["start_page"] for ch in chapters] == [2, 4]
+    assert list(cascade.stats["ran"]) == ["toc", "regex"]
+    assert cascade.stats["accepted"] == {"regex": 1}
+    assert all(seconds >= 0 for seconds in cascade.stats["seconds"].values())
+    fontsize.assert_not_called()
+
+def test_inconsistent_results_fall_back_to_merging_everything():
+    pages = _pages(["Contents\nReal Numbers ..... 12"] + ["text"] * 3)
+    cascade = ChapterCascade(pages, [])
+    chapters = cascade.run()
+
+    assert list(cascade.stats["ran"]) == ["toc", "regex", "headings"]
+    assert cascade.stats["accepted"] == {}
+    assert chapters[0]["chapter_name"] == "Real Numbers"
+
+def test_is_consistent():
+    assert is_consistent([1, 5, 9], 20)
+    assert not is_consistent([], 20)
+    assert not is_consistent([1, 9, 5], 20)
+    assert not is_consistent([1, 25], 20)
+    assert not is_consistent([12, 15], 20)
+    assert is_consistent([2, 4], 5)
+    assert not is_consistent([2], 3)
+    assert not is_consistent([2, 3, 4, 5], 20)
+
+def test_single_stray_heading_does_not_stop_the_cascade():
+    pages = _pages(["Title", "Chapter 1 Real Numbers"] + ["text"] * 8)
+    with patch.object(HeadingExtractor, "detect_by_fontsize", return_value=[]) as fontsize:
+        cascade = ChapterCascade(pages, [])
+        cascade.run()
+
+    assert list(cascade.stats["ran"]) == ["toc", "regex", "headings"]
+    fontsize.assert_called_once()
+
+def test_toc_printed_pages_are_mapped_to_pdf_pages():
+    # A segment printed as pages 41-46: unmapped, its ToC entries lie past the end
+    pages = _pages(["Contents\nReal Numbers ..... 42\nPolynomials ..... 45"] + ["text"] * 5)
+    index = PageNumberIndex.fit([(p["page_num"], p["page_num"] + 40) for p in pages], len(pages))
+    cascade = ChapterCascade(pages, [], page_index=index)
+    chapters = cascade.run()
+
+    assert cascade.stats["accepted"] == {"toc": 1}
+    assert [(ch["chapter_name"], ch["pdf_start_page"]) for ch in chapters] == [("Real Numbers", 2), ("Polynomials", 5)]
+
+def test_empty_page_index_takes_toc_pages_as_pdf_pages():
+    # No folio run long enough to trust: the index has no segments
+    pages = _pages(["Contents\nReal Numbers ..... 2\nPolynomials ..... 5"] + ["text"] * 5)
+    index = PageNumberIndex.fit([(1, 10)], len(pages))
+    cascade = ChapterCascade(pages, [], page_index=index)
+    cascade.run()
+
+    assert not len(index)
+    assert cascade.stats["accepted"] == {"toc": 1}
+
+def test_partly_mapped_toc_is_checked_on_the_entries_the_index_covers():
+    # Printed 41-45 on pages 1-5; the appendix at 60 is past the numbered pages
+    contents = "Contents\nReal Numbers ..... 42\nPolynomials ..... 44\nAppendix ..... 60"
+    pages = _pages([contents] + ["text"] * 5)
+    index = PageNumberIndex.fit([(p, p + 40) for p in range(1, 6)], len(pages))
+    cascade = ChapterCascade(pages, [], page_index=index)
+    cascade.run()
+    assert cascade.stats["accepted"] == {"toc": 1}
+
+    # Most entries outside the index: the ToC does not follow this numbering
+    contents = "Contents\nReal Numbers ..... 42\nPolynomials ..... 70\nAppendix ..... 90"
+    cascade = ChapterCascade(_pages([contents] + ["text"] * 5), [], page_index=index)
+    cascade.run()
+    assert "toc" not in cascade.stats["accepted"]
@@ -0,0 +1,110 @@
+import json
+from pathlib import Path
+from unittest.mock import patch
+from src.extractor import document as document_module
+from src.extractor.document import DocumentModel, LINES_FILENAME
+from src.extractor.headings import HeadingExtractor
+from src.extractor.metadata import MetadataExtractor
+from src.extractor.toc import ToCExtractor
+from src.parser.layout_store import LayoutStore, LayoutWriter
+from src.pipeline import TextbookPipeline
+
+def _line(text, size, top, fontname="Body"):
+    return [{"text": ch, "size": size, "top": top, "x0": 10.0 + 6 * i, "fontname": fontname}
+            for i, ch in enumerate(text)]
+
+PAGES = [
+    {"page_num": 1, "text": "Mathematics\nClass 10"},
+    {"page_num": 2, "text": "Contents\nReal Numbers ..... 3"},
+    {"page_num": 3, "text": "Chapter 1 Real Numbers\nbody text"},
+]
+LAYOUT = [
+    {"page_num": 1, "chars": _line("Mathematics", 12, 50)},
+    {"page_num": 2, "chars": _line("Contents", 10, 50)},
+    {"page_num": 3, "chars": _line("body text", 10, 120) + _line("Chapter 1", 24, 50, "Bold")},
+]
+
+def _save(tmp_path, layout=LAYOUT):
+    with open(tmp_path / "pages.json", "w", encoding="utf-8") as f:
+        json.dump(PAGES, f)
+    with LayoutWriter(tmp_path / "layout.bin") as writer:
+        for page in layout:
+            writer.write(page["page_num"], page["chars"])
+
+def test_lines_hold_geometry_and_font_per_page():
+    document = DocumentModel(PAGES, LAYOUT)
+
+    lines = document.page_lines(3)
+    assert lines["text"] == ["Chapter 1", "body text"]
+    assert lines["fontname"] == ["Bold", "Body"]
+    assert lines["size"].tolist() == [24, 10]
+    assert lines["top"].tolist() == [50, 120]
+    assert lines["x0"].tolist() == [10, 10]
+    assert document.page_nums() == [1, 2, 3]
+    assert document.text_lines[1] == ["Contents", "Real Numbers ..... 3"]
+
+def test_extractors_share_one_pass_over_the_layout():
+    document = DocumentModel(PAGES, LAYOUT)
+    with patch.object(document_module, "build_lines", wraps=document_module.build_lines) as build:
+        headings = HeadingExtractor(PAGES, LAYOUT, document=document)
+        headings.detect_by_fontsize()
+        headings.detect_by_regex()
+        toc = ToCExtractor(PAGES, document=document).extract()
+        metadata = MetadataExtractor(Path("book.pdf"), PAGES, document=document).extract()
+
+    assert build.call_count == len(LAYOUT)
+    assert toc[0]["chapter_name"] == "Real Numbers"
+    assert metadata["title"] == "Mathematics"
+
+def test_lines_are_cached_until_layout_changes(tmp_path):
+    _save(tmp_path)
+    with LayoutStore(tmp_path / "layout.bin") as store:
+        built = DocumentModel(PAGES, store, cache_dir=tmp_path).ensure_line_index()
+    assert (tmp_path / LINES_FILENAME).exists()
+
+    with patch.object(document_module, "build_lines", side_effect=AssertionError("rebuilt")):
+        loaded = DocumentModel(PAGES, LAYOUT, cache_dir=tmp_path).lines
+    assert loaded["text"] == built["text"] and loaded["fontname"] == built["fontname"]
+    assert loaded["size"].tolist() == built["size"].tolist()
+
+    changed = LAYOUT[:2] + [{"page_num": 3, "chars": LAYOUT[2]["chars"] + _line("more", 10, 200)}]
+    _save(tmp_path, changed)
+    assert DocumentModel(PAGES, changed, cache_dir=tmp_path).page_lines(3)["text"][-1] == "more"
+
+def test_line_index_holds_dominant_font_and_size_histograms():
+    mixed = _line("Ch", 24, 50, "Body") + [dict(c, x0=c["x0"] + 20) for c in _line("apter", 24, 50, "XYZ+Times-Bold")]
+    document = DocumentModel(PAGES, LAYOUT[:2] + [{"page_num": 3, "chars": _line("body text", 10, 120) + mixed}])
+
+    lines = document.page_lines(3)
+    assert lines["fontname"] == ["XYZ+Times-Bold", "Body"]
+    assert lines["bold"].tolist() == [True, False]
+    assert lines["chars"].tolist() == [7, 9]
+    assert document.histograms["size"].tolist() == [10, 12, 24]
+    assert document.histograms["lines"].tolist() == [2, 1, 1]
+    assert document.histograms["chars"].tolist() == [17, 11, 7]
+    assert document.body_size == 10
+
+def test_redetection_reads_the_line_index_not_the_layout(tmp_path, monkeypatch):
+    segment_dir = tmp_path / "parsed" / "book"
+    segment_dir.mkdir(parents=True)
+    _save(segment_dir)
+    with LayoutStore(segment_dir / "layout.bin") as store:
+        document = DocumentModel(PAGES, store, cache_dir=segment_dir)
+        expected = HeadingExtractor(PAGES, store, document=document).detect_by_fontsize()
+    assert expected[0]["text"] == "Chapter 1" and expected[0]["bold"]
+
+    monkeypatch.setattr("src.pipeline.PARSED_DIR", tmp_path / "parsed")
+    with patch.object(document_module, "LayoutStore", side_effect=AssertionError("layout read")):
+        reloaded = DocumentModel.from_parsed(segment_dir)
+        assert HeadingExtractor(reloaded.pages, None, document=reloaded).detect_by_fontsize() == expected
+        assert reloaded.histograms["chars"].tolist() == document.histograms["chars"].tolist()
+        chapters = TextbookPipeline().redetect()
+    assert [ch["chapter_name"] for ch in chapters["book"]] == ["Real Numbers"]
+
+def test_stale_line_index_is_rebuilt_from_the_saved_layout(tmp_path):
+    _save(tmp_path)
+    DocumentModel(PAGES, LAYOUT, cache_dir=tmp_path).lines
+    changed = LAYOUT[:2] + [{"page_num": 3, "chars": LAYOUT[2]["chars"] + _line("more", 10, 200)}]
+    _save(tmp_path, changed)
+
+    assert DocumentModel.from_parsed(tmp_path).page_lines(3)["text"][-1] == "more"
@@ -0,0 +1,35 @@
+import csv
+from src.exporter import DataExporter, CSV_FIELDS
+
+METADATA = {"board": "CBSE", "class": "10", "subject": "Mathematics"}
+CHAPTERS = [
+    {"chapter_no": 1, "chapter_name": "Real Numbers", "start_page": 1, "end_page": 14,
+     "printed_start_page": 1, "printed_end_page": 14, "pdf_start_page": 9, "pdf_end_page": 22},
+    {"chapter_no": 2, "chapter_name": "Appendix", "start_page": 15, "end_page": 15,
+     "printed_start_page": 15, "printed_end_page": None, "pdf_start_page": None, "pdf_end_page": None},
+]
+
+def _read(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.DictReader(f))
+
+def test_csv_carries_printed_and_pdf_page_ranges(tmp_path):
+    exporter = DataExporter("book1", output_dir=tmp_path)
+    exporter.export_csv(METADATA, CHAPTERS)
+    exporter.append_to_master_csv(METADATA, CHAPTERS)
+
+    for path in (tmp_path / "book1.csv", tmp_path / "all_books.csv"):
+        rows = _read(path)
+        assert list(rows[0]) == CSV_FIELDS
+        assert [(r["printed_start_page"], r["pdf_start_page"], r["pdf_end_page"]) for r in rows] == \
+            [("1", "9", "22"), ("15", "", "")]
+
+def test_master_csv_with_old_columns_is_upgraded(tmp_path):
+    with open(tmp_path / "all_books.csv", "w", newline="", encoding="utf-8") as f:
+        f.write("book_id,board,class,subject,chapter_no,chapter_name,start_page,end_page\n"
+                "old,CBSE,9,Science,1,Matter,1,12\n")
+
+    DataExporter("book1", output_dir=tmp_path).append_to_master_csv(METADATA, CHAPTERS[:1])
+
+    rows = _read(tmp_path / "all_books.csv")
+    assert [(r["book_id"], r["end_page"], r["pdf_start_page"]) for r in rows] == [("old", "12", ""), ("book1", "14", "9")]
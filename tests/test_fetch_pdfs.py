@@ -0,0 +1,83 @@
+import pytest
+from src.scraper import fetch_pdfs
+from src.scraper.fetch_pdfs import download_pdf, download_in_ranges, calculate_checksum
+
+BODY = b"%PDF-1.4\n" + bytes(range(256)) * 64
+
+def test_interrupted_download_resumes_with_range(stub_server, tmp_path):
+    stub_server.files["/book.pdf"] = BODY
+    stub_server.etags["/book.pdf"] = '"v1"'
+    stub_server.cut_after["/book.pdf"] = 10000
+
+    path = download_pdf(f"{stub_server.url}/book.pdf", tmp_path / "book.pdf")
+
+    assert path.read_bytes() == BODY
+    ranges = [h.get("Range") for _, _, h in stub_server.requests]
+    assert ranges == [None, "bytes=8192-"]  # Resumes after the last full chunk written
+    assert not (tmp_path / "book.tmp").exists()
+    assert not (tmp_path / "book.resume").exists()
+
+def test_changed_file_is_not_stitched_onto_partial(stub_server, tmp_path):
+    stub_server.files["/book.pdf"] = BODY
+    stub_server.etags["/book.pdf"] = '"v1"'
+    stub_server.cut_after["/book.pdf"] = 10000
+    url = f"{stub_server.url}/book.pdf"
+    manifest = fetch_pdfs.get_manifest()
+    with pytest.raises(fetch_pdfs.requests.RequestException):
+        fetch_pdfs._transfer(url, tmp_path / "book.pdf", manifest)
+    assert (tmp_path / "book.tmp").stat().st_size == 8192
+
+    new_body = b"%PDF-1.4\n" + b"republished" * 500
+    stub_server.files["/book.pdf"] = new_body
+    stub_server.etags["/book.pdf"] = '"v2"'
+    path = download_pdf(url, tmp_path / "book.pdf")
+
+    assert path.read_bytes() == new_body
+
+def test_checksum_mismatch_fails(stub_server, tmp_path):
+    stub_server.files["/book.pdf"] = BODY
+    path = download_pdf(f"{stub_server.url}/book.pdf", tmp_path / "book.pdf", expected_sha256="0" * 64)
+    assert path is None
+    assert not (tmp_path / "book.pdf").exists()
+
+def test_download_in_ranges(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_pdfs, "PARALLEL_RANGE_THRESHOLD", 1024)
+    stub_server.files["/book.zip"] = BODY
+    stub_server.etags["/book.zip"] = '"v1"'
+
+    path = download_in_ranges(f"{stub_server.url}/book.zip", tmp_path / "book.zip", parts=4,
+                              expected_sha256=None)
+
+    assert path.read_bytes() == BODY
+    assert calculate_checksum(path) == fetch_pdfs.get_manifest().get(f"{stub_server.url}/book.zip")["sha256"]
+    assert len([h for _, _, h in stub_server.requests if h.get("Range")]) == 4
+
+def test_download_in_ranges_rejects_misplaced_range(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_pdfs, "PARALLEL_RANGE_THRESHOLD", 1024)
+    stub_server.files["/book.zip"] = BODY
+    stub_server.etags["/book.zip"] = '"v1"'
+    stub_server.range_shift["/book.zip"] = 16
+
+    path = download_in_ranges(f"{stub_server.url}/book.zip", tmp_path / "book.zip", parts=4)
+
+    assert path is None
+    assert not list(tmp_path.glob("book.*"))
+
+def test_download_in_ranges_cleans_up_after_unexpected_error(stub_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(fetch_pdfs, "PARALLEL_RANGE_THRESHOLD", 1024)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(fetch_pdfs, "_verify_download", fail)
+    stub_server.files["/book.zip"] = BODY
+    stub_server.etags["/book.zip"] = '"v1"'
+
+    with pytest.raises(OSError):
+        download_in_ranges(f"{stub_server.url}/book.zip", tmp_path / "book.zip", parts=4)
+
+    assert not list(tmp_path.glob("book.*"))
+
+def test_missing_file_is_not_retried(stub_server, tmp_path):
+    assert download_pdf(f"{stub_server.url}/missing.pdf", tmp_path / "missing.pdf") is None
+    assert len(stub_server.requests) == 1
@@ -0,0 +1,60 @@
+import pypdfium2 as pdfium
+from src.extractor.merger import ChapterMerger
+from src.parser.folios import PageNumberIndex, PAGE_INDEX_FILENAME, detect_folio
+from src.parser.pdf_parser import PDFParser
+from tests.conftest import _add_text
+
+def test_detect_folio_from_header_and_footer_lines():
+    assert detect_folio("Body text\nmore text\n12") == 12
+    assert detect_folio("- 7 -\nBody text") == 7
+    assert detect_folio("Real Numbers 13\nBody text\nmore body") == 13
+    assert detect_folio("14 Mathematics\nBody text\nPage 14") == 14
+    assert detect_folio("Chapter 1\nBody text") is None
+    assert detect_folio("Body text only") is None
+    assert detect_folio("") is None
+
+def test_fit_piecewise_offsets_ignoring_outliers():
+    # 4 unnumbered front-matter pages, printed 1-8, an unnumbered plate, then printed 9-12
+    folios = [(p, None) for p in range(1, 5)] + [(p, p - 4) for p in range(5, 13)]
+    folios += [(13, None)] + [(p, p - 5) for p in range(14, 18)]
+    folios[6] = (7, 1)  # A stray "1" from a heading
+    index = PageNumberIndex.fit(folios, 17)
+
+    assert [s["offset"] for s in index.segments] == [4, 5]
+    assert index.to_pdf(1) == 5 and index.to_pdf(9) == 14
+    assert index.to_printed(7) == 3 and index.to_printed(13) is None
+    assert index.to_printed(2) is None and index.to_pdf(40) is None
+    assert PageNumberIndex.from_dict(index.to_dict()).to_pdf(9) == 14
+
+def test_merger_emits_printed_and_pdf_ranges():
+    index = PageNumberIndex([{"first_pdf_page": 5, "last_pdf_page": 20, "offset": 4}], 20)
+    toc = [{"chapter_name": "Real Numbers", "start_page": 1, "type": "toc"},
+           {"chapter_name": "Polynomials", "start_page": 9, "type": "toc"}]
+
+    chapters = ChapterMerger(toc, [], 20, page_index=index).merge()
+
+    assert [(c["printed_start_page"], c["printed_end_page"], c["pdf_start_page"], c["pdf_end_page"])
+            for c in chapters] == [(1, 8, 5, 12), (9, 16, 13, 20)]
+    assert [(c["start_page"], c["end_page"]) for c in chapters] == [(1, 8), (9, 20)]
+
+def test_parser_builds_and_caches_page_index(tmp_path):
+    pdf = pdfium.PdfDocument.new()
+    line = "Ordinary body text on a digital page, long enough to count as text."
+    for pdf_page in range(1, 7):
+        page = pdf.new_page(612, 792)
+        _add_text(pdf, page, line, 72, 700)
+        if pdf_page > 2:
+            _add_text(pdf, page, str(pdf_page - 2), 300, 40)
+        page.gen_content()
+    path = tmp_path / "numbered.pdf"
+    pdf.save(str(path))
+
+    parser = PDFParser(path, "book")
+    result = parser.parse()
+    assert [p["folio"] for p in result["pages"]] == [None, None, 1, 2, 3, 4]
+    assert parser.page_index.to_pdf(1) == 3
+    assert (parser.output_dir / PAGE_INDEX_FILENAME).exists()
+
+    cached = PDFParser(path, "book")
+    cached.parse()
+    assert cached.stats.get("cached") and cached.page_index.to_printed(6) == 4
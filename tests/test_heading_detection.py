@@ -1,5 +1,8 @@
+import random
 import pytest
 from src.extractor.headings import HeadingExtractor
+from src.extractor.patterns import PatternRegistry
+from src.parser.layout_store import LayoutStore, LayoutWriter
 
 def test_detect_by_fontsize():
     # Synthetic layout data
@@ -55,3 +58,68 @@ def test_detect_by_regex():
     assert len(headings) == 2
     assert headings[0]["text"] == "Chapter 1: Real Numbers"
     assert headings[1]["text"] == "Unit 2: Polynomials"
+
+def _reference_lines(chars):
+    """The original dict-walking line grouping, for comparison."""
+    lines, current, anchor = [], [], None
+    for char in sorted(chars, key=lambda c: (c['top'], c['x0'])):
+        if anchor is not None and abs(char['top'] - anchor) > 3:
+            lines.append(current)
+            current = []
+        if not current:
+            anchor = char['top']
+        current.append(char)
+    if current:
+        lines.append(current)
+    return [("".join(c['text'] for c in line), sum(c['size'] for c in line) / len(line), line[0]['top'])
+            for line in lines]
+
+def test_line_builder_matches_reference_without_mutating_input():
+    rng = random.Random(7)
+    chars = [{"text": rng.choice("abc "), "size": rng.choice([9.5, 10, 12, 18]),
+              "top": round(rng.uniform(0, 700), 1), "x0": round(rng.uniform(0, 500), 1)} for _ in range(3000)]
+    original = [dict(c) for c in chars]
+
+    lines = HeadingExtractor([], [])._group_chars_into_lines(chars)
+
+    assert chars == original
+    expected = _reference_lines(chars)
+    assert [(t, top) for t, _, top in lines] == [(t, top) for t, _, top in expected]
+    assert [size for _, size, _ in lines] == pytest.approx([size for _, size, _ in expected])
+
+def test_detect_by_fontsize_reads_layout_store(tmp_path):
+    sizes = [20] * 6 + [10] * 40
+    layout = [{"page_num": 2, "chars": [{"text": "x", "size": size, "top": 20.0 * i, "x0": 10.0}
+                                        for i, size in enumerate(sizes)]}]
+    with LayoutWriter(tmp_path / "layout.bin") as writer:
+        writer.write(2, layout[0]["chars"])
+    with LayoutStore(tmp_path / "layout.bin") as store:
+        from_store = HeadingExtractor([], store).detect_by_fontsize()
+
+    assert from_store == HeadingExtractor([], layout).detect_by_fontsize()
+    assert len(from_store) == 6
+
+def test_regex_reports_pattern_and_skips_toc_lines():
+    pages_data = [
+        {"page_num": 1, "text": "Contents\nChapter 1 .... 5\n  अध्याय 2 संख्याएँ  \nCHAPTER\n3"},
+        {"page_num": 2, "text": "lesson 4 Poems\nnot a Unit 5"},
+    ]
+
+    headings = HeadingExtractor(pages_data, []).detect_by_regex()
+
+    assert [(h["page_num"], h["text"], h["pattern"]) for h in headings] == [
+        (1, "अध्याय 2 संख्याएँ", "adhyay_hi"), (2, "lesson 4 Poems", "lesson")]
+
+def test_pattern_registry_selects_by_board_and_language():
+    registry = PatternRegistry()
+    registry.register("chapter", r"Chapter\s*\d+", languages=("en",))
+    registry.register("adhyay", r"अध्याय\s*\d+", languages=("hi",))
+    registry.register("icse_unit", r"Theme\s*\d+", boards=("ICSE",))
+
+    assert registry.names(board="CBSE", languages=["hi"]) == ["adhyay"]
+    assert registry.names(board="ICSE") == ["chapter", "adhyay", "icse_unit"]
+    matcher = registry.matcher(board="ICSE", languages=["en"])
+    assert list(matcher.scan("Theme 2 Water\nअध्याय 3\nChapter 4")) == [("Theme 2 Water", "icse_unit"),
+                                                                       ("Chapter 4", "chapter")]
+    with pytest.raises(ValueError):
+        registry.register("not-an-identifier", r"x")
@@ -0,0 +1,72 @@
+import json
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from src.extractor.document import DocumentModel
+from src.extractor.headings import HeadingExtractor
+from src.parser.layout_store import LayoutStore, LayoutWriter, StoredPage, CHAR_FIELDS, LAYOUT_FILENAME, NUMERIC_FIELDS
+from src.parser.pdf_parser import PDFParser
+
+SAMPLE = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+def test_round_trip_keeps_char_fields(tmp_path):
+    chars = [
+        {"text": "A", "fontname": "Bold", "x0": 10.5, "x1": 18.25, "top": 30.0, "bottom": 42.0,
+         "doctop": 30.0, "size": 12.0, "upright": True},
+        {"text": "अ", "fontname": "Deva", "x0": 20.0, "x1": 27.0, "top": 30.0, "bottom": 42.0,
+         "doctop": 30.0, "size": 12.0, "upright": False},
+    ]
+    with LayoutWriter(tmp_path / LAYOUT_FILENAME) as writer:
+        writer.write(1, chars)
+        writer.write(2, [])
+        writer.write(3, chars[:1])
+
+    with LayoutStore(tmp_path / LAYOUT_FILENAME) as store:
+        assert len(store) == 3
+        assert store.page_nums() == [1, 2, 3]
+        assert store.page(0) == {"page_num": 1, "chars": chars}
+        assert store.page(1)["chars"] == []
+        assert list(store.columns(2)["x1"]) == [18.25]
+        assert store.fontnames == ["Bold", "Deva"]
+
+def test_failed_write_keeps_previous_store(tmp_path):
+    path = tmp_path / LAYOUT_FILENAME
+    with LayoutWriter(path) as writer:
+        writer.write(1, [])
+    with pytest.raises(RuntimeError):
+        with LayoutWriter(path) as writer:
+            writer.write(7, [])
+            raise RuntimeError("parse failed")
+
+    with LayoutStore(path) as store:
+        assert store.page_nums() == [1]
+    assert not list(tmp_path.glob("*.tmp"))
+
+def test_parser_store_matches_json_layout(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    result = PDFParser(SAMPLE, "book", layout_json=True).parse()
+    layout_json = json.loads((tmp_path / "book" / "layout.json").read_text())
+    assert layout_json == json.loads(json.dumps(result["layout"]))
+    assert (tmp_path / "book" / LAYOUT_FILENAME).stat().st_size < (tmp_path / "book" / "layout.json").stat().st_size / 4
+
+    with LayoutStore(tmp_path / "book" / LAYOUT_FILENAME) as store:
+        assert len(store) == len(layout_json)
+        for stored, page in zip(store, layout_json):
+            assert stored["page_num"] == page["page_num"]
+            assert [{k: c[k] for k in ("text", "fontname", "upright") + NUMERIC_FIELDS} for c in page["chars"]] == stored["chars"]
+
+        from_json = HeadingExtractor(result["pages"], layout_json).detect_by_fontsize()
+        from_store = HeadingExtractor(result["pages"], store).detect_by_fontsize()
+    assert from_store == from_json
+
+def test_cached_parse_yields_the_same_chars_without_building_them(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    fresh = PDFParser(SAMPLE, "book").parse()
+    assert all(set(c) == set(CHAR_FIELDS) for page in fresh["layout"] for c in page["chars"])
+
+    cached = PDFParser(SAMPLE, "book").parse()
+    assert all(isinstance(page, StoredPage) for page in cached["layout"])
+    with patch.object(StoredPage, "chars", side_effect=AssertionError("chars built")):
+        lines = DocumentModel(cached["pages"], cached["layout"]).lines
+    assert lines["text"] == DocumentModel(fresh["pages"], fresh["layout"]).lines["text"]
+    assert cached["layout"] == fresh["layout"]
@@ -0,0 +1,77 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+import pytest
+from src.scraper.fetch_pdfs import download_pdf, calculate_checksum
+from src.scraper.manifest import check_for_updates
+
+def test_download_records_manifest(stub_server, tmp_path, isolated_manifest):
+    stub_server.files["/a.pdf"] = b"%PDF-1.4 first"
+    stub_server.etags["/a.pdf"] = '"v1"'
+    url = f"{stub_server.url}/a.pdf"
+
+    path = download_pdf(url, tmp_path / "a.pdf")
+
+    entry = isolated_manifest.get(url)
+    assert entry["etag"] == '"v1"'
+    assert entry["size"] == len(b"%PDF-1.4 first")
+    assert entry["sha256"] == calculate_checksum(path)
+
+def test_refresh_skips_unchanged_and_fetches_republished(stub_server, tmp_path, isolated_manifest):
+    stub_server.files["/a.pdf"] = b"%PDF-1.4 first"
+    stub_server.etags["/a.pdf"] = '"v1"'
+    url = f"{stub_server.url}/a.pdf"
+    path = download_pdf(url, tmp_path / "a.pdf")
+
+    download_pdf(url, path, refresh=True)
+    method, _, headers = stub_server.requests[-1]
+    assert headers.get("If-None-Match") == '"v1"'
+    assert path.read_bytes() == b"%PDF-1.4 first"
+
+    stub_server.files["/a.pdf"] = b"%PDF-1.4 second edition"
+    stub_server.etags["/a.pdf"] = '"v2"'
+    download_pdf(url, path, refresh=True)
+    assert path.read_bytes() == b"%PDF-1.4 second edition"
+    assert isolated_manifest.get(url)["etag"] == '"v2"'
+
+def test_check_for_updates_uses_head_only(stub_server, tmp_path, isolated_manifest):
+    stub_server.files["/a.pdf"] = b"%PDF-1.4 first"
+    stub_server.etags["/a.pdf"] = '"v1"'
+    url = f"{stub_server.url}/a.pdf"
+    download_pdf(url, tmp_path / "a.pdf")
+
+    assert check_for_updates(isolated_manifest) == []
+
+    stub_server.etags["/a.pdf"] = '"v2"'
+    changed = check_for_updates(isolated_manifest)
+    assert [c["url"] for c in changed] == [url]
+    assert all(method == "HEAD" for method, _, _ in stub_server.requests[1:])
+
+def test_concurrent_records_keep_the_manifest_consistent(tmp_path, isolated_manifest):
+    paths = []
+    for i in range(8):
+        paths.append(tmp_path / f"{i}.pdf")
+        paths[-1].write_bytes(b"%PDF-1.4 " + bytes([65 + i]))
+
+    def record_many(i):
+        for n in range(25):
+            isolated_manifest.record(f"http://example/{i}/{n}.pdf", paths[i], {})
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(record_many, range(8)))
+
+    assert len(json.loads(isolated_manifest.path.read_text())) == 200
+    assert not isolated_manifest.path.with_suffix(".tmp").exists()
+
+def test_deferred_manifest_is_written_once(tmp_path, isolated_manifest):
+    path = tmp_path / "a.pdf"
+    path.write_bytes(b"%PDF-1.4")
+
+    with patch.object(isolated_manifest, "save", wraps=isolated_manifest.save) as save:
+        with isolated_manifest.deferred():
+            for n in range(10):
+                isolated_manifest.record(f"http://example/{n}.pdf", path, {})
+            assert not isolated_manifest.path.exists()
+
+    assert save.call_count == 1
+    assert len(json.loads(isolated_manifest.path.read_text())) == 10
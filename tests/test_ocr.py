@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from src.parser.ocr import extract_text_from_image, extract_text_from_images, text_from_data, OCRBatcher
+
+def _data(words):
+    """Builds image_to_data-style output from (block, par, line, text) tuples."""
+    data = {k: [] for k in ("level", "page_num", "block_num", "par_num", "line_num", "word_num", "text", "conf")}
+    for block, par, line, text in words:
+        data["level"].append(5)
+        data["page_num"].append(1)
+        data["block_num"].append(block)
+        data["par_num"].append(par)
+        data["line_num"].append(line)
+        data["word_num"].append(0)
+        data["text"].append(text)
+        data["conf"].append(90)
+    return data
+
+def test_text_from_data_keeps_line_and_block_order():
+    data = _data([
+        (1, 1, 1, "Chapter"), (1, 1, 1, "1"),
+        (1, 1, 2, "Real"), (1, 1, 2, "Numbers"),
+        (2, 1, 1, "Introduction"), (2, 1, 1, ""),
+    ])
+    assert text_from_data(data) == "Chapter 1\nReal Numbers\n\nIntroduction"
+
+@patch('src.parser.ocr.pytesseract.image_to_string')
+@patch('src.parser.ocr.pytesseract.image_to_data')
+def test_extract_runs_tesseract_once(mock_data, mock_string):
+    mock_data.return_value = _data([(1, 1, 1, "Hello"), (1, 1, 1, "world")])
+
+    text, data = extract_text_from_image(object())
+
+    assert text == "Hello world"
+    assert mock_data.call_count == 1
+    mock_string.assert_not_called()
+
+def _batch_data(list_file, lang, output_type):
+    """image_to_data over a list file: one word per listed image, named after the image."""
+    with open(list_file, encoding="utf-8") as f:
+        paths = f.read().split()
+    data = {k: [] for k in ("level", "page_num", "block_num", "par_num", "line_num", "word_num", "text", "conf")}
+    for page_num, path in enumerate(paths, start=1):
+        for level, text, conf in ((1, "", -1), (5, path.rsplit("_", 1)[-1].split(".")[0], 80 + page_num)):
+            for key, value in (("level", level), ("page_num", page_num), ("block_num", 1), ("par_num", 1),
+                               ("line_num", 1), ("word_num", 1), ("text", text), ("conf", conf)):
+                data[key].append(value)
+    return data
+
+@patch('src.parser.ocr.pytesseract.image_to_data', side_effect=_batch_data)
+def test_batch_splits_results_per_image(mock_data):
+    images = [Image.new("RGB", (20, 20), "white"), Image.new("RGBA", (20, 20)), Image.new("L", (20, 20))]
+
+    results = extract_text_from_images(images)
+
+    assert mock_data.call_count == 1
+    assert [text for text, _ in results] == ["00000", "00001", "00002"]
+    assert [data["conf"] for _, data in results] == [[-1, 81], [-1, 82], [-1, 83]]
+    assert all(data["page_num"] == [1, 1] for _, data in results)
+
+@patch('src.parser.ocr.pytesseract.image_to_data', side_effect=_batch_data)
+def test_batcher_runs_full_batches_and_flushes_on_demand(mock_data):
+    batcher = OCRBatcher(batch_size=2)
+    futures = [batcher.submit(Image.new("RGB", (20, 20))) for _ in range(3)]
+    assert mock_data.call_count == 1
+    assert futures[0].result()[0] == "00000" and not futures[2].done()
+
+    assert futures[2].result()[0] == "00000"
+    assert (batcher.batches, batcher.images) == (2, 3)
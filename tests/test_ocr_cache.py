@@ -0,0 +1,109 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, MagicMock
+from pathlib import Path
+from src.parser.ocr_cache import OCRCache
+from src.parser.pdf_parser import PDFParser
+
+def test_ocr_cache_round_trip(tmp_path):
+    cache = OCRCache(tmp_path / "ocr.sqlite")
+    key = OCRCache.make_key("abc", 0, 300, "eng", "5.3.0")
+
+    assert cache.get(key) is None
+    cache.put(key, "Chapter 1", {"conf": [91, 88]}, 89.5)
+
+    assert cache.get(key) == ("Chapter 1", {"conf": [91, 88]})
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+    assert cache.stats()["hit_rate"] == 0.5
+    assert key != OCRCache.make_key("abc", 0, 400, "eng", "5.3.0")
+    cache.close()
+
+def test_ocr_cache_evicts_least_recently_used(tmp_path):
+    cache = OCRCache(tmp_path / "ocr.sqlite", max_bytes=200)
+    for i in range(3):
+        cache.put(f"k{i}", "x" * 50 + str(i), {"text": [str(i)]})
+    cache.get("k0")
+    for i in range(3, 8):
+        cache.put(f"k{i}", "y" * 50 + str(i), {"text": [str(i)]})
+
+    stats = cache.stats()
+    assert stats["bytes"] <= 200
+    assert cache.get("k1") is None
+    assert cache.get("k7") is not None
+    cache.close()
+
+def test_ocr_cache_evicts_in_batches_to_low_water(tmp_path):
+    cache = OCRCache(tmp_path / "ocr.sqlite")
+    cache.put("k0", "x" * 99, {})
+    entry_size = cache.stats()["bytes"]
+    cache.max_bytes, cache.low_water = 10 * entry_size, 0.5
+    for i in range(1, 10):
+        cache.put(f"k{i}", "x" * 99, {})
+    assert cache.stats()["entries"] == 10
+
+    cache.put("k10", "x" * 99, {})
+
+    # One put over the cap frees down to half of it, not just enough for the new entry
+    assert cache.stats()["entries"] == 5
+    assert cache.get("k10") is not None
+    assert cache.get("k0") is None
+    cache.close()
+
+@patch('src.parser.backends.pdfplumber.open')
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_reparse_serves_ocr_from_cache(mock_ocr, mock_open, tmp_path, monkeypatch, isolated_ocr_cache):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 scanned")
+    mock_page = MagicMock()
+    mock_page.extract_text.return_value = ""
+    mock_page.chars = []
+    mock_page.width = 100
+    mock_page.height = 100
+    mock_open.return_value.__enter__.return_value.pages = [mock_page]
+    mock_ocr.return_value = ("OCR Text", {"conf": [90]})
+
+    for _ in range(2):
+        parser = PDFParser(pdf_path, "book1", use_parse_cache=False)
+        parser.ocr_available = True
+        result = parser.parse()
+
+    assert mock_ocr.call_count == 1
+    assert result["pages"][0]["text"] == "OCR Text"
+    assert result["pages"][0]["ocr_confidence"] == 90
+    assert parser.stats["ocr_cache"]["hits"] == 1
+
+    # Changing the file's bytes changes the key, so the page is OCR'd again.
+    pdf_path.write_bytes(b"%PDF-1.4 rescanned")
+    parser = PDFParser(pdf_path, "book1", use_parse_cache=False)
+    parser.ocr_available = True
+    parser.parse()
+    assert mock_ocr.call_count == 2
+
+@patch('src.parser.pdf_parser.ProcessPoolExecutor', ThreadPoolExecutor)
+@patch('src.parser.backends.pdfplumber.open')
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_parallel_parse_reports_worker_cache_hits(mock_ocr, mock_open, tmp_path, monkeypatch, isolated_ocr_cache):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    pdf_path = tmp_path / "scan.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4 scanned")
+    pages = []
+    for _ in range(4):
+        page = MagicMock()
+        page.extract_text.return_value = ""
+        page.chars = []
+        page.width = 100
+        page.height = 100
+        pages.append(page)
+    mock_open.return_value.__enter__.return_value.pages = pages
+    mock_ocr.return_value = ("OCR Text", {"conf": [90]})
+
+    for _ in range(2):
+        parser = PDFParser(pdf_path, "book1", use_parse_cache=False, workers=2, chunk_size=2)
+        parser.ocr_available = True
+        parser.parse()
+
+    assert mock_ocr.call_count == 4
+    # Workers count lookups in their own cache handles; the parent reports them
+    assert parser.stats["ocr_cache"]["hits"] == 4
@@ -0,0 +1,26 @@
+from unittest.mock import patch
+from src.extractor.outline import OutlineExtractor
+from src.extractor.toc import ToCExtractor
+
+TOC_PAGES = [{"page_num": 1, "text": "Contents\nReal Numbers ..... 1\nPolynomials ..... 2"}]
+
+def test_outline_gives_chapters_with_pdf_pages_and_labels(outlined_pdf):
+    chapters = OutlineExtractor(outlined_pdf).extract()
+
+    assert [(ch["chapter_name"], ch["start_page"], ch["page_label"]) for ch in chapters] == [
+        ("Real Numbers", 3, "1"), ("Polynomials", 5, "3")]
+    assert all(ch["type"] == "outline" for ch in chapters)
+
+def test_outline_reads_streams(outlined_pdf):
+    with open(outlined_pdf, "rb") as f:
+        assert len(OutlineExtractor(f).extract()) == 2
+
+def test_toc_prefers_outline_over_text(outlined_pdf):
+    with patch.object(ToCExtractor, "_find_toc_pages") as find_pages:
+        chapters = ToCExtractor(TOC_PAGES, pdf_source=outlined_pdf).extract()
+    assert chapters[0]["type"] == "outline"
+    find_pages.assert_not_called()
+
+def test_toc_falls_back_to_text_without_outline(mixed_pdf):
+    chapters = ToCExtractor(TOC_PAGES, pdf_source=mixed_pdf).extract()
+    assert [(ch["chapter_name"], ch["type"]) for ch in chapters] == [("Real Numbers", "toc"), ("Polynomials", "toc")]
@@ -3,44 +3,43 @@ from unittest.mock import patch, MagicMock
 from src.parser.pdf_parser import PDFParser
 from pathlib import Path
 
-@patch('src.parser.pdf_parser.pdfplumber.open')
+# Mocked parsers pass use_ocr_cache=False; parsers of real PDFs get conftest's tmp_path cache.
+TEXT_LAYER = "Plenty of real text on this page so it does not count as a scanned one at all."
+
+def _mock_page(text: str = "", chars=None, width: float = 100, height: float = 100) -> MagicMock:
+    """A pdfplumber page stand-in; an empty `text` makes it a scanned page."""
+    page = MagicMock()
+    page.extract_text.return_value = text
+    page.chars = chars or []
+    page.width = width
+    page.height = height
+    return page
+
+def _serve_pages(mock_open, pages):
+    """Makes the patched pdfplumber.open return a document with `pages`."""
+    mock_open.return_value.__enter__.return_value.pages = pages
+    return pages
+
+@patch('src.parser.backends.pdfplumber.open')
 def test_parse_pdf_text(mock_open):
-    # Mock PDF object
-    mock_pdf = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = "Sample text content that is definitely longer than fifty characters to ensure it is not detected as scanned."
-    mock_page.chars = [{"text": "S", "size": 10}]
-    mock_page.width = 100
-    mock_page.height = 100
+    _serve_pages(mock_open, [_mock_page(TEXT_LAYER, chars=[{"text": "S", "size": 10}])])
     
-    mock_pdf.pages = [mock_page]
-    mock_open.return_value.__enter__.return_value = mock_pdf
-    
-    parser = PDFParser(Path("dummy.pdf"), "book1")
+    parser = PDFParser(Path("dummy.pdf"), "book1", use_ocr_cache=False)
     result = parser.parse()
     
     assert len(result["pages"]) == 1
-    assert result["pages"][0]["text"] == "Sample text content that is definitely longer than fifty characters to ensure it is not detected as scanned."
+    assert result["pages"][0]["text"] == TEXT_LAYER
     assert result["pages"][0]["is_scanned"] == False
 
-@patch('src.parser.pdf_parser.pdfplumber.open')
+@patch('src.parser.backends.pdfplumber.open')
 @patch('src.parser.pdf_parser.extract_text_from_image')
 def test_parse_pdf_scanned(mock_ocr, mock_open):
-    # Mock scanned page (empty text)
-    mock_pdf = MagicMock()
-    mock_page = MagicMock()
-    mock_page.extract_text.return_value = ""
-    mock_page.chars = []
-    mock_page.width = 100
-    mock_page.height = 100
-    
-    mock_pdf.pages = [mock_page]
-    mock_open.return_value.__enter__.return_value = mock_pdf
+    _serve_pages(mock_open, [_mock_page()])
     
     # Mock OCR result
     mock_ocr.return_value = ("OCR Text", {"conf": [90]})
     
-    parser = PDFParser(Path("dummy.pdf"), "book1")
+    parser = PDFParser(Path("dummy.pdf"), "book1", use_ocr_cache=False)
     # Force OCR available
     parser.ocr_available = True
     
@@ -50,3 +49,154 @@ def test_parse_pdf_scanned(mock_ocr, mock_open):
     assert result["pages"][0]["is_scanned"] == True
     assert result["pages"][0]["ocr_applied"] == True
     assert result["pages"][0]["text"] == "OCR Text"
+
+def test_parallel_parse_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    sample = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+    serial = PDFParser(sample, "serial").parse()
+    parallel = PDFParser(sample, "parallel", workers=2, chunk_size=2).parse()
+
+    assert len(parallel["pages"]) == len(serial["pages"]) > 2
+    assert parallel == serial
+    assert (tmp_path / "parallel" / "pages.json").read_text() == (tmp_path / "serial" / "pages.json").read_text()
+
+@patch('src.parser.backends.pdfplumber.open')
+@patch('src.parser.pdf_parser.OCRPool')
+def test_parse_pdf_scanned_with_ocr_pool(mock_pool_cls, mock_open, tmp_path, monkeypatch):
+    from concurrent.futures import Future
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    monkeypatch.setattr("src.parser.pdf_parser.OCR_LANG", "hin")
+    pages = _serve_pages(mock_open, [_mock_page(), _mock_page(TEXT_LAYER), _mock_page()])
+
+    def submit(image):
+        future = Future()
+        future.set_result((f"OCR {len(mock_pool_cls.return_value.submit.call_args_list)}", {"conf": [80, -1]}))
+        return future
+    mock_pool_cls.return_value.submit.side_effect = submit
+
+    parser = PDFParser(Path("dummy.pdf"), "book1", ocr_workers=2, use_ocr_cache=False)
+    parser.ocr_available = True
+    result = parser.parse()
+
+    assert [p["text"] for p in result["pages"]] == ["OCR 1", TEXT_LAYER, "OCR 2"]
+    assert result["pages"][0]["ocr_confidence"] == 80
+    assert mock_pool_cls.call_args.kwargs["lang"] == "hin"
+    mock_pool_cls.return_value.close.assert_called_once()
+
+@patch('src.parser.backends.pdfplumber.open')
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_adaptive_ocr_escalates_only_weak_pages(mock_ocr, mock_open, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    clean, faint = _serve_pages(mock_open, [_mock_page(width=72 * 8, height=72 * 10) for _ in range(2)])
+    results = {
+        (id(clean), 150): ("Clean", {"conf": [95] * 200}),
+        (id(faint), 150): ("F4int", {"conf": [40] * 200}),
+        (id(faint), 300): ("Faint", {"conf": [88] * 200}),
+    }
+    renders = []
+    def render(page):
+        def to_image(resolution):
+            renders.append((id(page), resolution))
+            return MagicMock(original=(id(page), resolution))
+        return to_image
+    clean.to_image.side_effect = render(clean)
+    faint.to_image.side_effect = render(faint)
+    mock_ocr.side_effect = lambda im, lang: results[im]
+
+    parser = PDFParser(Path("dummy.pdf"), "book1", adaptive_ocr=True, use_ocr_cache=False)
+    parser.ocr_available = True
+    result = parser.parse()
+
+    assert [(p["text"], p["ocr_dpi"]) for p in result["pages"]] == [("Clean", 150), ("Faint", 300)]
+    assert renders == [(id(clean), 150), (id(faint), 150), (id(faint), 300)]
+    assert parser.stats["ocr"]["escalated"] == 1
+    assert parser.stats["ocr"]["by_dpi"] == {150: 1, 300: 1}
+    # Fixed 300 dpi would render 2 full-size pages; adaptive rendered 1.5 of them.
+    assert parser.stats["ocr"]["megapixels"] == pytest.approx(parser.stats["ocr"]["fixed_megapixels"] * 0.75)
+
+def test_iter_pages_streams_to_disk(tmp_path, monkeypatch):
+    import json
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    sample = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+
+    parser = PDFParser(sample, "streamed")
+    pages = parser.iter_pages()
+    first_info, _ = next(pages)
+    assert first_info["page_num"] == 1
+    assert not (tmp_path / "streamed" / "pages.json").exists()
+    rest = list(pages)
+
+    saved = json.loads((tmp_path / "streamed" / "pages.json").read_text())
+    assert [p["page_num"] for p in saved] == list(range(1, len(rest) + 2))
+    assert saved == [first_info] + [info for info, _ in rest]
+    assert parser.stats["pages"] == len(saved)
+    assert PDFParser(sample, "collected").parse()["pages"] == saved
+
+@patch('src.parser.backends.pdfplumber.open')
+def test_iter_pages_releases_pages_and_discards_partial_output(mock_open, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    pages = _serve_pages(mock_open, [_mock_page(TEXT_LAYER) for _ in range(3)])
+
+    stream = PDFParser(Path("dummy.pdf"), "book1", use_ocr_cache=False).iter_pages()
+    next(stream)
+    next(stream)
+    stream.close()
+
+    assert pages[0].close.called and pages[1].close.called
+    assert not pages[2].extract_text.called
+    assert list((tmp_path / "book1").iterdir()) == []
+
+def test_unchanged_pdf_is_loaded_from_parse_cache(tmp_path, monkeypatch):
+    import shutil
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path / "parsed")
+    sample = tmp_path / "book.pdf"
+    shutil.copy(Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf", sample)
+    first = PDFParser(sample, "book").parse()
+
+    with patch('src.parser.backends.pdfplumber.open') as mock_open:
+        parser = PDFParser(sample, "book")
+        cached = parser.parse()
+    assert not mock_open.called
+    assert parser.stats["cached"]
+    assert cached["pages"] == first["pages"]
+    assert [p["page_num"] for p in cached["layout"]] == [p["page_num"] for p in first["layout"]]
+    assert cached["layout"][0]["chars"][0]["text"] == first["layout"][0]["chars"][0]["text"]
+
+    # Options, parser version and file contents are all part of the key.
+    parser = PDFParser(sample, "book", adaptive_ocr=True)
+    parser.parse()
+    assert not parser.stats.get("cached")
+    monkeypatch.setattr("src.parser.pdf_parser.PARSER_VERSION", "test")
+    parser = PDFParser(sample, "book", adaptive_ocr=True)
+    parser.parse()
+    assert not parser.stats.get("cached")
+    with open(sample, "ab") as f:
+        f.write(b"\n% appended\n")
+    parser = PDFParser(sample, "book", adaptive_ocr=True)
+    parser.parse()
+    assert not parser.stats.get("cached")
+    parser = PDFParser(sample, "book", adaptive_ocr=True)
+    parser.parse()
+    assert parser.stats["cached"]
+
+@patch('src.parser.backends.pdfplumber.open')
+@patch('src.parser.ocr.extract_text_from_images')
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_scanned_pages_are_ocrd_in_batches(mock_ocr, mock_batch, mock_open, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    monkeypatch.setattr("src.parser.pdf_parser.OCR_LANG", "hin")
+    pages = _serve_pages(mock_open, [_mock_page() for _ in range(5)])
+    for i, page in enumerate(pages):
+        page.to_image.return_value.original = f"image {i + 1}"
+    mock_batch.side_effect = lambda images, lang: [(f"OCR of {image}", {"conf": [90]}) for image in images]
+
+    parser = PDFParser(Path("dummy.pdf"), "book1", ocr_batch_size=2, use_ocr_cache=False)
+    parser.ocr_available = True
+    result = parser.parse()
+
+    assert [p["text"] for p in result["pages"]] == [f"OCR of image {i}" for i in range(1, 6)]
+    assert [len(call.args[0]) for call in mock_batch.call_args_list] == [2, 2, 1]
+    assert all(call.args[1] == "hin" for call in mock_batch.call_args_list)
+    assert all(p["ocr_confidence"] == 90 for p in result["pages"])
+    mock_ocr.assert_not_called()
@@ -0,0 +1,102 @@
+import json
+import zipfile
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+from src.parser.pdf_parser import PDFParser
+from src.scraper.archive import BookArchive
+from src.pipeline import TextbookPipeline
+
+SAMPLE = Path(__file__).resolve().parent.parent / "verification_data" / "test_book.pdf"
+EXPECTED = json.loads((SAMPLE.parent / "outputs" / "test_book.json").read_text(encoding="utf-8"))
+
+def _process(pipeline, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path / "parsed")
+    with patch("src.pipeline.DataExporter") as exporter:
+        pipeline._process_pdf(SAMPLE, "CBSE", "10", "Mathematics")
+    metadata, chapters = exporter.return_value.export_json.call_args.args
+    return metadata, chapters
+
+def test_pipeline_streams_pages_and_reads_lines_from_the_store(tmp_path, monkeypatch):
+    in_memory = _process(TextbookPipeline(in_memory=True), tmp_path / "memory", monkeypatch)
+
+    with patch.object(PDFParser, "parse", side_effect=AssertionError("parsed into memory")):
+        streamed = _process(TextbookPipeline(), tmp_path / "stream", monkeypatch)
+
+    assert streamed == in_memory
+    assert streamed[1]
+
+def test_line_index_is_built_only_when_the_font_pass_needs_it(tmp_path, monkeypatch):
+    pipeline = TextbookPipeline()
+    with patch("src.extractor.document.build_lines", side_effect=AssertionError("line index built")):
+        _, chapters = _process(pipeline, tmp_path, monkeypatch)
+    assert chapters[0]["source_strategy"] == "toc"
+    assert not (tmp_path / "parsed" / "test_book" / "lines.npz").exists()
+
+    monkeypatch.setattr("src.pipeline.PARSED_DIR", tmp_path / "parsed")
+    # With no ToC or "Chapter N" lines the cascade reaches the font pass
+    with patch("src.extractor.cascade.ToCExtractor.extract", return_value=[]), \
+            patch("src.extractor.cascade.HeadingExtractor.detect_by_regex", return_value=[]):
+        pipeline.redetect(["test_book"])
+    assert (tmp_path / "parsed" / "test_book" / "lines.npz").exists()
+
+def _expected_fields(chapters):
+    keys = EXPECTED["chapters"][0].keys()
+    return [{key: ch[key] for key in keys} for ch in chapters]
+
+@pytest.mark.parametrize("options", [{}, {"in_memory": True}, {"backend": "pdfium"}, {"parse_workers": 2}],
+                         ids=["default", "in_memory", "pdfium", "parallel"])
+def test_sample_book_matches_verified_output(options, tmp_path, monkeypatch):
+    pipeline = TextbookPipeline(**options)
+    metadata, chapters = _process(pipeline, tmp_path, monkeypatch)
+
+    assert metadata["title"] == EXPECTED["metadata"]["title"]
+    assert _expected_fields(chapters) == EXPECTED["chapters"]
+
+    monkeypatch.setattr("src.pipeline.PARSED_DIR", tmp_path / "parsed")
+    redetected = pipeline.redetect(["test_book"])["test_book"]
+    assert _expected_fields(redetected) == EXPECTED["chapters"]
+
+def _write_book_zip(zip_path: Path, corrupt: bool = False) -> Path:
+    zip_path.parent.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "w") as zf:
+        zf.write(SAMPLE, "abcd1dd/abcd101.pdf", compress_type=zipfile.ZIP_STORED)
+        zf.write(SAMPLE, "abcd1dd/abcd102.pdf", compress_type=zipfile.ZIP_STORED)
+    if corrupt:
+        data = bytearray(zip_path.read_bytes())
+        data[data.find(b"%PDF") + 100] ^= 0xFF
+        zip_path.write_bytes(bytes(data))
+    return zip_path
+
+def _run_for_book_zip(tmp_path, monkeypatch, downloads):
+    monkeypatch.setattr("src.pipeline.PDF_DIR", tmp_path / "pdfs")
+    pipeline = TextbookPipeline()
+    with patch("src.pipeline.download_in_ranges", side_effect=downloads) as download, \
+            patch.object(pipeline, "_process_pdf") as process:
+        pipeline.run_for_book_zip("abcd1dd", class_name="10", subject="Mathematics")
+    return download, [call.args[0].name for call in process.call_args_list]
+
+def test_corrupt_book_zip_is_downloaded_again(tmp_path, monkeypatch):
+    corrupt = iter([True, False])
+
+    def download_once(url, save_path):
+        return _write_book_zip(save_path, corrupt=next(corrupt))
+
+    download, processed = _run_for_book_zip(tmp_path, monkeypatch, download_once)
+
+    assert download.call_count == 2
+    assert processed == ["abcd101.pdf", "abcd102.pdf"]
+
+def test_bad_member_does_not_stop_the_rest_of_the_book(tmp_path, monkeypatch):
+    zip_path = _write_book_zip(tmp_path / "pdfs" / "CBSE" / "10" / "Mathematics" / "abcd1dd.zip")
+    open_member = BookArchive.open_member
+
+    def flaky_open(archive, info):
+        if info.filename.endswith("abcd101.pdf"):
+            raise zipfile.BadZipFile("Bad CRC")
+        return open_member(archive, info)
+
+    with patch.object(BookArchive, "open_member", flaky_open):
+        _, processed = _run_for_book_zip(tmp_path, monkeypatch, [zip_path])
+
+    assert processed == ["abcd102.pdf"]
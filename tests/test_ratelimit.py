@@ -0,0 +1,82 @@
+import asyncio
+import time
+import pytest
+from src.scraper.config import MAX_RETRIES
+from src.scraper.fetch_pdfs import download_pdf
+from src.scraper.ratelimit import HostRateLimiter, get_rate_limiter
+from src.scraper.session import polite_request
+
+URL = "https://ncert.nic.in/textbook/pdf/jemh101.pdf"
+
+def test_burst_then_refill_rate():
+    limiter = HostRateLimiter(rate=20, burst=3, max_rate=20)
+
+    start = time.monotonic()
+    for _ in range(3):
+        limiter.acquire(URL)
+    assert time.monotonic() - start < 0.05
+
+    limiter.acquire(URL)
+    assert time.monotonic() - start >= 0.04
+
+def test_hosts_are_independent():
+    limiter = HostRateLimiter(rate=1, burst=1)
+    limiter.acquire(URL)
+
+    start = time.monotonic()
+    limiter.acquire("https://cisce.org/publications/")
+    assert time.monotonic() - start < 0.05
+
+def test_adapts_to_latency_and_throttling():
+    limiter = HostRateLimiter(rate=1, burst=1, min_rate=0.1, max_rate=2, target_latency=0.5)
+
+    limiter.record(URL, 200, latency=0.1)
+    assert limiter.rate(URL) > 1
+
+    limiter.record(URL, 200, latency=5.0)
+    slowed = limiter.rate(URL)
+    assert slowed < 1.25
+
+    limiter.record(URL, 429)
+    assert limiter.rate(URL) < slowed
+
+def test_retry_after_pauses_host():
+    limiter = HostRateLimiter(rate=100, burst=10, max_rate=100)
+    limiter.record(URL, 503, retry_after="0.2")
+
+    start = time.monotonic()
+    asyncio.run(limiter.acquire_async(URL))
+    assert time.monotonic() - start >= 0.15
+
+def test_requests_queued_behind_retry_after_keep_their_spacing():
+    limiter = HostRateLimiter(rate=10, burst=1, max_rate=10)
+    limiter.record(URL, 503, retry_after="1")
+
+    waits = [limiter._reserve(URL) for _ in range(3)]
+    assert waits[0] >= 0.9
+    assert waits[1] - waits[0] == pytest.approx(0.2, abs=0.02)  # The rate was halved by the 503
+    assert waits[2] - waits[1] == pytest.approx(0.2, abs=0.02)
+
+def test_server_errors_and_broken_bodies_slow_the_host(stub_server, tmp_path):
+    limiter = get_rate_limiter()
+    stub_server.files["/a.pdf"] = b"%PDF-1.4 " + b"x" * 100000
+    stub_server.statuses["/a.pdf"] = [500]
+    url = f"{stub_server.url}/a.pdf"
+
+    response = polite_request("GET", url)
+    assert response.status_code == 200
+    assert [method for method, _, _ in stub_server.requests] == ["GET", "GET"]
+    after_500 = limiter.rate(url)
+    assert after_500 < 1000
+
+    stub_server.cut_after["/a.pdf"] = 1000
+    assert download_pdf(url, tmp_path / "a.pdf") is not None
+    assert limiter.rate(url) < after_500
+
+def test_download_retries_are_not_nested(stub_server, tmp_path):
+    stub_server.files["/a.pdf"] = b"%PDF-1.4"
+    stub_server.statuses["/a.pdf"] = [502] * 10
+    url = f"{stub_server.url}/a.pdf"
+
+    assert download_pdf(url, tmp_path / "a.pdf") is None
+    assert len(stub_server.requests) == MAX_RETRIES
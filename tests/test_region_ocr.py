@@ -0,0 +1,51 @@
+import pytest
+from unittest.mock import patch
+from src.parser.pdf_parser import PDFParser
+
+def _tesseract_data(words):
+    """image_to_data-style dict with one line of `words`, 40 px apart."""
+    n = len(words)
+    return {
+        "level": [5] * n, "text": list(words), "conf": [92] * n,
+        "left": [10 + 40 * i for i in range(n)], "top": [20] * n, "width": [30] * n, "height": [12] * n,
+        "page_num": [1] * n, "block_num": [1] * n, "par_num": [1] * n, "line_num": [1] * n,
+    }
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_region_ocr_fills_textless_figure(mock_ocr, backend, mixed_pdf):
+    mock_ocr.side_effect = lambda image, lang: (
+        "Figure words" if image.width < 2000 else "Scanned words",
+        _tesseract_data(["Figure", "words"] if image.width < 2000 else ["Scanned", "words"]))
+    parser = PDFParser(mixed_pdf, "book", backend=backend, region_ocr=True, use_parse_cache=False)
+    parser.ocr_available = True
+    result = parser.parse()
+
+    text_page, scanned_page, mixed_page = result["pages"]
+    assert text_page["ocr_regions"] == [] and "Figure" not in text_page["text"]
+    assert scanned_page["text"] == "Scanned words"
+    # The figure sits below the text line, so its words follow it
+    assert mixed_page["text"].startswith("Ordinary body text")
+    assert mixed_page["text"].endswith("\nFigure words")
+    assert [r["bbox"] for r in mixed_page["ocr_regions"]] == [[72.0, 192.0, 540.0, 692.0]]
+    assert mixed_page["ocr_regions"][0]["words"] == 2
+
+    ocr_chars = [c for c in result["layout"][2]["chars"] if c["fontname"] == "OCR"]
+    assert "".join(c["text"] for c in ocr_chars) == "Figure words"
+    assert all(72 <= c["x0"] < c["x1"] <= 540 and 192 <= c["top"] < 692 for c in ocr_chars)
+
+    stats = parser.stats["ocr"]
+    assert (stats["pages"], stats["regions"], stats["region_pages"]) == (1, 1, 1)
+    # Only the figure is handed to Tesseract, not the whole page
+    assert stats["region_megapixels"] < stats["region_page_megapixels"] / 2
+
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_region_ocr_is_cached_per_region(mock_ocr, mixed_pdf):
+    mock_ocr.return_value = ("Figure words", _tesseract_data(["Figure", "words"]))
+    for _ in range(2):
+        parser = PDFParser(mixed_pdf, "book", backend="pdfium", region_ocr=True, use_parse_cache=False)
+        parser.ocr_available = True
+        result = parser.parse()
+        assert result["pages"][2]["text"].endswith("Figure words")
+    # Scanned page and figure on the first parse; both come from the cache on the second
+    assert mock_ocr.call_count == 2
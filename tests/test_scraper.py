@@ -1,14 +1,15 @@
 import pytest
 from unittest.mock import patch, MagicMock
 from src.scraper.discover import NCERTScraper
+from src.scraper.session import create_session, connection_stats
 
-@patch('src.scraper.discover.requests.get')
-def test_discover_books_fallback(mock_get):
+@patch('src.scraper.discover.polite_request')
+def test_discover_books_fallback(mock_request):
     # Mock response to return empty HTML so it triggers fallback
     mock_response = MagicMock()
     mock_response.text = "<html></html>"
     mock_response.raise_for_status.return_value = None
-    mock_get.return_value = mock_response
+    mock_request.return_value = mock_response
     
     scraper = NCERTScraper()
     books = scraper.discover_books()
@@ -23,3 +24,54 @@ def test_generate_chapter_urls():
     
     assert len(urls) == 6 # 5 chapters + prelims
     assert "lemh101.pdf" in urls[0]
+
+def test_session_reuses_connections(stub_server):
+    stub_server.files["/page.html"] = b"<html></html>"
+    session = create_session(host_pool_sizes={})
+
+    for _ in range(5):
+        session.get(f"{stub_server.url}/page.html").raise_for_status()
+
+    stats = connection_stats(session)
+    host = stub_server.url.split("//")[1]
+    assert stats[host]["requests"] == 5
+    assert stats[host]["connections"] == 1
+    assert stats[host]["reused"] == 4
+
+def test_probe_chapter_count(stub_server, tmp_path):
+    for i in range(1, 15):
+        stub_server.files[f"/abcd1{i:02d}.pdf"] = b"%PDF"
+    scraper = NCERTScraper(probe_cache_path=tmp_path / "chapter_counts.json")
+    scraper.pdf_base_url = f"{stub_server.url}/"
+
+    urls = scraper.generate_chapter_urls("abcd1", probe=True)
+
+    assert len(urls) == 15 # 14 chapters + prelims
+    assert all(method == "HEAD" for method, _, _ in stub_server.requests)
+    assert scraper.probe_requests <= 9
+
+    # Second lookup is served from the per-book cache
+    fresh = NCERTScraper(probe_cache_path=tmp_path / "chapter_counts.json")
+    fresh.pdf_base_url = f"{stub_server.url}/"
+    assert fresh.probe_chapter_count("abcd1") == 14
+    assert fresh.probe_requests == 0
+
+def test_probe_missing_book(stub_server, tmp_path):
+    scraper = NCERTScraper(probe_cache_path=tmp_path / "chapter_counts.json")
+    scraper.pdf_base_url = f"{stub_server.url}/"
+
+    assert scraper.probe_chapter_count("none1") == 0
+    assert len(stub_server.requests) == 1 # 404 is final, never retried
+
+def test_failed_probe_falls_back_without_caching(stub_server, tmp_path):
+    for i in range(1, 4):
+        stub_server.files[f"/abcd1{i:02d}.pdf"] = b"%PDF"
+    stub_server.statuses["/abcd101.pdf"] = [500] * 3
+    scraper = NCERTScraper(probe_cache_path=tmp_path / "chapter_counts.json")
+    scraper.pdf_base_url = f"{stub_server.url}/"
+
+    urls = scraper.generate_chapter_urls("abcd1", num_chapters=5, probe=True)
+    assert len(urls) == 6  # The default 5 chapters + prelims
+    assert not (tmp_path / "chapter_counts.json").exists()
+
+    assert scraper.probe_chapter_count("abcd1") == 3
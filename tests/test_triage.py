@@ -0,0 +1,33 @@
+import pytest
+from unittest.mock import patch
+from src.parser.pdf_parser import PDFParser
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pdfium"])
+@patch('src.parser.pdf_parser.extract_text_from_image')
+def test_triage_classifies_and_skips_scanned_extraction(mock_ocr, backend, mixed_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    mock_ocr.return_value = ("Scanned words", {"conf": [90]})
+    parser = PDFParser(mixed_pdf, "book", backend=backend)
+    parser.ocr_available = True
+    result = parser.parse()
+
+    assert [p["page_type"] for p in result["pages"]] == ["text", "scanned", "mixed"]
+    assert [p["ocr_applied"] for p in result["pages"]] == [False, True, False]
+    assert result["pages"][1]["text"] == "Scanned words"
+    assert result["pages"][2]["text"].startswith("Ordinary body text")
+    assert [len(p["chars"]) > 0 for p in result["layout"]] == [True, False, True]
+    assert mock_ocr.call_count == 1
+    triage = parser.stats["triage"]
+    assert (triage["text"], triage["scanned"], triage["mixed"]) == (1, 1, 1)
+    assert triage["skipped"] == 1
+    assert triage["extracted"] == 2
+
+def test_scanned_pages_keep_text_layer_without_ocr(mixed_pdf, tmp_path, monkeypatch):
+    monkeypatch.setattr("src.parser.pdf_parser.PARSED_DIR", tmp_path)
+    parser = PDFParser(mixed_pdf, "book")
+    parser.ocr_available = False
+    result = parser.parse()
+
+    assert result["pages"][1]["is_scanned"]
+    assert parser.stats["triage"]["skipped"] == 0
+    assert parser.stats["triage"]["extracted"] == 3